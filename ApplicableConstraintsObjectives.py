@@ -41,10 +41,14 @@ if __name__ == "__main__":
         if not b:
             raise Exception(e)
     
+    objectives  = sorted(common.Requirements.BaseRequirement.Objectives(),  key=lambda o: o.name)
+    constraints = sorted(common.Requirements.BaseRequirement.Constraints(), key=lambda c: c.name)
+    results     = common.Requirements.BaseRequirement.CompileRequirements(objectives + constraints).TestEach(converter.lbInstance)
+    
     applicable = ["The following objective(s) can be applied given the data from the file:"]
     not_applicable = ["The following objective(s) can not be applied given the data from the file:"]
-    for o in sorted(common.Requirements.BaseRequirement.OBJECTIVE_LIST, key=lambda o: o.name):
-        b,e = o.TestDataRequirements(converter.lbInstance)
+    for o in objectives:
+        b,e = results[o]
         if b:
             applicable.append(o.name)
         else:
@@ -55,8 +59,8 @@ if __name__ == "__main__":
         print("\n\t- ".join(not_applicable))
     applicable = ["The following constraint(s) can be applied given the data from the file:"]
     not_applicable = ["The following constraint(s) can not be applied given the data from the file:"]
-    for c in sorted(common.Requirements.BaseRequirement.CONSTRAINT_LIST, key=lambda c: c.name):
-        b,e = o.TestDataRequirements(converter.lbInstance)
+    for c in constraints:
+        b,e = results[c]
         if b:
             applicable.append(c.name)
         else:
@@ -0,0 +1,114 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import json
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from CheckLoadbuildSolution import CheckLoadbuildSolution
+from ApplicableConstraintsObjectives import HidePrint
+from common.InstanceCache import InstanceCache
+
+FILE_TYPES = ['json', 'yaml', 'xml']
+
+def FileType(filename):
+    _, file_extension = os.path.splitext(filename)
+    if file_extension[1:] in FILE_TYPES:
+        return file_extension[1:]
+    return None
+
+# A manifest has one instance/solution pair per line, separated by whitespace; empty lines and lines starting with # are skipped
+def ReadManifest(manifest):
+    pairs = list()
+    base  = os.path.dirname(manifest)
+    with open(manifest, 'r') as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split()
+            if len(fields) != 2:
+                raise Exception("Line " + str(n) + " of " + manifest + " does not contain an instance and a solution file")
+            pairs.append(tuple(os.path.join(base, field) for field in fields))
+    return pairs
+
+# Pairs every solution file with the instance file of the same name, solutions without an instance are checked against themselves
+def PairDirectories(instancedir, solutiondir):
+    instances = dict()
+    if instancedir is not None:
+        for filename in sorted(os.listdir(instancedir)):
+            if FileType(filename) is not None:
+                instances.setdefault(os.path.splitext(filename)[0], os.path.join(instancedir, filename))
+    pairs = list()
+    for filename in sorted(os.listdir(solutiondir)):
+        if FileType(filename) is not None:
+            solution = os.path.join(solutiondir, filename)
+            pairs.append((instances.get(os.path.splitext(filename)[0], solution), solution))
+    return pairs
+
+# The instance cache of a worker process, which is set once when the worker starts
+CACHE = None
+
+def InitWorker(cache):
+    global CACHE
+    CACHE = cache
+
+# Runs in a worker process, so every failure is turned into a record instead of an exception
+def CheckPair(instance, solution, backend, overlap, profile=False):
+    record = {"instance": instance, "solution": solution}
+    try:
+        with HidePrint():
+            checker = CheckLoadbuildSolution(instance, FileType(instance), solution, FileType(solution), None, None, backend, overlap, False, CACHE, profile)
+            record["result"] = checker.lbSolution.GetResults()
+    except Exception as e:
+        record["error"] = str(e) if str(e) else type(e).__name__
+        record["traceback"] = traceback.format_exc()
+    return record
+
+def CheckPairs(pairs, output, jobs=None, backend="python", overlap="ngoi", cachedir=None, cachesize=None, profile=False):
+    failures = 0
+    # The cache is created once, which hashes the sources for its tool version, and a copy is handed to every worker
+    cache = InstanceCache(cachedir, cachesize) if cachedir else None
+    with ProcessPoolExecutor(max_workers=jobs, initializer=InitWorker, initargs=(cache,)) as executor:
+        futures = {executor.submit(CheckPair, instance, solution, backend, overlap, profile): (instance, solution) for instance, solution in pairs}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                instance, solution = futures[future]
+                record = {"instance": instance, "solution": solution, "error": str(e) if str(e) else type(e).__name__}
+            if "error" in record:
+                failures += 1
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Validate many loadbuilding solutions in parallel, writing one JSON result per line')
+    parser.add_argument('--manifest', '-M', metavar='MANIFEST_FILE', help='A file with an instance and a solution file on every line')
+    parser.add_argument('--instances', '-I', metavar='INSTANCE_DIR', help='The directory with the instance files')
+    parser.add_argument('--solutions', '-S', metavar='SOLUTION_DIR', help='The directory with the solution files, paired with instances by file name')
+    parser.add_argument('--output', '-O', metavar='OUTPUT_FILE', help='The JSON Lines output file, standard output if not given')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(), help='The number of worker processes')
+    parser.add_argument('--backend', choices=['python', 'numpy'], default='python', help='The NgoiMatrix backend used for the overlap and support checks')
+    parser.add_argument('--overlap', choices=['ngoi', 'sweep'], default='ngoi', help='The engine used for the overlap check')
+    parser.add_argument('--cache', metavar='CACHE_DIR', help='Directory in which parsed and checked instances are cached')
+    parser.add_argument('--cachesize', type=int, default=1024, help='The maximum size of the instance cache in MB')
+    parser.add_argument('--profile', action='store_true', help='Add the time spent in every phase of a check to its result')
+    args = parser.parse_args()
+
+    if (args.manifest is None) == (args.solutions is None):
+        exit('Give either a manifest or a solution directory')
+    if args.manifest is not None:
+        pairs = ReadManifest(args.manifest)
+    else:
+        pairs = PairDirectories(args.instances, args.solutions)
+
+    if args.output is None:
+        failures = CheckPairs(pairs, sys.stdout, args.jobs, args.backend, args.overlap, args.cache, args.cachesize*1024*1024, args.profile)
+    else:
+        with open(args.output, 'w') as output:
+            failures = CheckPairs(pairs, output, args.jobs, args.backend, args.overlap, args.cache, args.cachesize*1024*1024, args.profile)
+    if failures:
+        exit(str(failures) + " of " + str(len(pairs)) + " solutions could not be checked")
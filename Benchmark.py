@@ -0,0 +1,138 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import itertools
+from ApplicableConstraintsObjectives import HidePrint
+from benchmark.Generator import BenchmarkGenerator
+
+FORMATS = ['json', 'yaml', 'xml']
+
+# The instance writer, solution writer, instance reader, and solution reader of a file format
+def Converters(fileformat):
+    if fileformat == 'json':
+        from instance.write.ThreeDinstanceToJSON import ThreeDinstanceToJSON as InstanceWriter
+        from solution.write.ThreeDsolutionToJSON import ThreeDsolutionToJSON as SolutionWriter
+        from instance.read.JSONtoThreeDinstance  import JSONtoThreeDinstance as InstanceReader
+        from solution.read.JSONtoThreeDsolution  import JSONtoThreeDsolution as SolutionReader
+    elif fileformat == 'yaml':
+        from instance.write.ThreeDinstanceToYAML import ThreeDinstanceToYAML as InstanceWriter
+        from solution.write.ThreeDsolutionToYAML import ThreeDsolutionToYAML as SolutionWriter
+        from instance.read.YAMLtoThreeDinstance  import YAMLtoThreeDinstance as InstanceReader
+        from solution.read.YAMLtoThreeDsolution  import YAMLtoThreeDsolution as SolutionReader
+    elif fileformat == 'xml':
+        from instance.write.ThreeDinstanceToXML import ThreeDinstanceToXML as InstanceWriter
+        from solution.write.ThreeDsolutionToXML import ThreeDsolutionToXML as SolutionWriter
+        from instance.read.XMLtoThreeDinstance  import XMLtoThreeDinstance as InstanceReader
+        from solution.read.XMLtoThreeDsolution  import XMLtoThreeDsolution as SolutionReader
+    else:
+        raise Exception("Unknown file format: " + fileformat)
+    return InstanceWriter, SolutionWriter, InstanceReader, SolutionReader
+
+# Runs a stage `repeat` times and records the time of every run, a failing stage records its error instead of the result
+def TimeStage(stages, name, function, repeat=1):
+    runs, result = list(), None
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with HidePrint():
+                result = function()
+            runs.append(time.perf_counter() - start)
+    except Exception as e:
+        stages[name] = {"error": str(e) if str(e) else type(e).__name__, "runs": runs}
+        return None
+    stages[name] = {"seconds": min(runs), "runs": runs}
+    return result
+
+def RunScenario(generator, directory, formats, repeat, backend="python", overlap="ngoi"):
+    stages = dict()
+    threeDinstance = TimeStage(stages, "generate.instance", generator.CreateThreeDinstance)
+    threeDsolution = TimeStage(stages, "generate.solution", lambda: generator.CreateThreeDsolution(threeDinstance))
+    sizes = dict()
+    for fileformat in formats:
+        InstanceWriter, SolutionWriter, InstanceReader, SolutionReader = Converters(fileformat)
+        instancefile = os.path.join(directory, "instance." + fileformat)
+        solutionfile = os.path.join(directory, "solution." + fileformat)
+        TimeStage(stages, "write.instance." + fileformat, lambda: InstanceWriter(threeDinstance).WriteInstance(instancefile))
+        TimeStage(stages, "write.solution." + fileformat, lambda: SolutionWriter(threeDsolution).WriteSolution(solutionfile))
+        sizes[fileformat] = {"instance": os.path.getsize(instancefile) if os.path.exists(instancefile) else None,
+                             "solution": os.path.getsize(solutionfile) if os.path.exists(solutionfile) else None}
+        read_instance = TimeStage(stages, "read.instance." + fileformat, lambda: InstanceReader(instancefile).CreateThreeDinstance(), repeat)
+        TimeStage(stages, "read.solution." + fileformat, lambda: SolutionReader(solutionfile).CreateThreeDsolution(read_instance if read_instance is not None else threeDinstance), repeat)
+
+    # The checks run on the generated objects, which are equivalent to the objects read from the files
+    TimeStage(stages, "instance.AllChecks", threeDinstance.AllChecks, repeat)
+    TimeStage(stages, "solution.DecorateSolution", lambda: threeDsolution.DecorateSolution(backend, overlap), repeat)
+    if "error" in stages["solution.DecorateSolution"]:
+        return ScenarioResult(generator, sizes, stages)
+    TimeStage(stages, "solution.IsValid", threeDsolution.IsValid, repeat)
+    TimeStage(stages, "solution.sort", threeDsolution.sort, repeat)
+    TimeStage(stages, "constraint.orientation", threeDsolution.CheckAllowedOrientations, repeat)
+    TimeStage(stages, "constraint.overlap", threeDsolution.CheckOverlapInside, repeat)
+    for constraint in threeDinstance.constraints:
+        TimeStage(stages, "constraint." + constraint.constraint.name, lambda: constraint.constraint.Validate(threeDsolution), repeat)
+    for objective in threeDinstance.objectives:
+        TimeStage(stages, "objective." + objective.objective.name, lambda: objective.objective.Evaluate(threeDsolution), repeat)
+    return ScenarioResult(generator, sizes, stages)
+
+# The result of a scenario, a scenario of which a stage failed is marked as aborted with the failed stages
+def ScenarioResult(generator, sizes, stages):
+    result = {"parameters": generator.Parameters(), "sizes": sizes, "stages": stages}
+    failed = [name for name, stage in stages.items() if "error" in stage]
+    if failed:
+        result["aborted"] = failed
+    return result
+
+def RunBenchmark(scenarios, formats=FORMATS, repeat=3, backend="python", overlap="ngoi", keep=None):
+    results = {"python": platform.python_version(), "platform": platform.platform(), "backend": backend, "overlap": overlap,
+               "repeat": repeat, "scenarios": list()}
+    for generator in scenarios:
+        if keep is not None:
+            directory = os.path.join(keep, generator.CreateThreeDinstance().description.name)
+            os.makedirs(directory, exist_ok=True)
+        else:
+            directory = tempfile.mkdtemp(prefix="benchmark")
+        try:
+            results["scenarios"].append(RunScenario(generator, directory, formats, repeat, backend, overlap))
+        finally:
+            if keep is None:
+                shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Time every stage of reading and checking generated loadbuilding instances and solutions')
+    parser.add_argument('--items', '-n', type=int, nargs='+', default=[1000], help='The numbers of items of the generated instances')
+    parser.add_argument('--kinds', '-k', type=int, default=10, help='The number of item kinds')
+    parser.add_argument('--depth', '-d', type=int, nargs='+', default=[0], choices=[0, 1, 2], help='The nesting depths: items in containers (0), in boxes (1), or in boxes on pallets (2), the decoration of pallets is not supported yet so depth 2 aborts')
+    parser.add_argument('--stack', '-s', type=int, nargs='+', default=[4], help='The numbers of items stacked on top of each other')
+    parser.add_argument('--invalid', type=float, default=0.0, help='The fraction of stacks that is shifted to overlap with another one')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of the generator')
+    parser.add_argument('--formats', '-f', nargs='+', choices=FORMATS, default=FORMATS, help='The file formats of which the readers and writers are timed')
+    parser.add_argument('--repeat', '-r', type=int, default=3, help='The number of runs of every stage, of which the fastest is reported')
+    parser.add_argument('--backend', choices=['python', 'numpy'], default='python', help='The NgoiMatrix backend used for the overlap and support checks')
+    parser.add_argument('--overlap', choices=['ngoi', 'sweep'], default='ngoi', help='The engine used for the overlap check')
+    parser.add_argument('--keep', metavar='DIRECTORY', help='Keep the generated files in this directory')
+    parser.add_argument('--output', '-O', metavar='OUTPUT_FILE', help='The JSON output file, standard output if not given')
+    args = parser.parse_args()
+
+    scenarios = [BenchmarkGenerator(items, args.kinds, depth, stack, args.invalid, args.seed) for items, depth, stack in itertools.product(args.items, args.depth, args.stack)]
+    results = RunBenchmark(scenarios, args.formats, args.repeat, args.backend, args.overlap, args.keep)
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    # A failed stage has no timing, so the benchmark fails instead of reporting the scenario as timed
+    aborted = [scenario for scenario in results["scenarios"] if "aborted" in scenario]
+    for scenario in aborted:
+        for name in scenario["aborted"]:
+            print("Aborted scenario " + json.dumps(scenario["parameters"]) + ", stage " + name + " failed: " + scenario["stages"][name]["error"], file=sys.stderr)
+    if aborted:
+        exit(1)
@@ -3,22 +3,33 @@
 import os
 import argparse
 import ConvertLoadbuildInstance
+from common.Profile import Profile, NO_PROFILE
 
 class CheckLoadbuildSolution(object):
-    def _jsonToSol_(self,lbInstance,jsonSolutionLocation):
+    # The solution readers parse the document once, and the instance embedded in it is read from the same parse
+    def _jsonToSol_(self,jsonSolutionLocation):
         from solution.read.JSONtoThreeDsolution import JSONtoThreeDsolution
+        from instance.read.JSONtoThreeDinstance import JSONtoThreeDinstance
         jsonToSol = JSONtoThreeDsolution(jsonSolutionLocation)
-        self.lbSolution = jsonToSol.CreateThreeDsolution(lbInstance)
+        return jsonToSol, JSONtoThreeDinstance(root=jsonToSol.base).CreateThreeDinstance()
 
-    def _yamlToSol_(self,lbInstance,yamlSolutionLocation):
+    def _yamlToSol_(self,yamlSolutionLocation):
         from solution.read.YAMLtoThreeDsolution import YAMLtoThreeDsolution
+        from instance.read.YAMLtoThreeDinstance import YAMLtoThreeDinstance
         yamlToSol = YAMLtoThreeDsolution(yamlSolutionLocation)
-        self.lbSolution = yamlToSol.CreateThreeDsolution(lbInstance)
+        return yamlToSol, YAMLtoThreeDinstance(root=yamlToSol.base).CreateThreeDinstance()
 
-    def _xmlToSol_(self,lbInstance,xmlSolutionLocation):
+    def _xmlToSol_(self,xmlSolutionLocation):
         from solution.read.XMLtoThreeDsolution import XMLtoThreeDsolution
+        from instance.read.XMLtoThreeDinstance import XMLtoThreeDinstance
         xmlToSol = XMLtoThreeDsolution(xmlSolutionLocation)
-        self.lbSolution = xmlToSol.CreateThreeDsolution(lbInstance)
+        return xmlToSol, XMLtoThreeDinstance(root=xmlToSol.base).CreateThreeDinstance()
+
+    # Binary solution files do not contain an instance, so the instance is always read from the instance file
+    def _binToSol_(self,binSolutionLocation):
+        from solution.read.BinarytoThreeDsolution import BinarytoThreeDsolution
+        from instance.ThreeDinstance import ThreeDinstance
+        return BinarytoThreeDsolution(binSolutionLocation), ThreeDinstance()
 
     def _solToJSON_(self,outputfile):
         from solution.write.ThreeDsolutionToJSON import ThreeDsolutionToJSON
@@ -35,6 +46,11 @@ class CheckLoadbuildSolution(object):
         solToXML = ThreeDsolutionToXML(self.lbSolution)
         solToXML.WriteSolution(outputfile)
 
+    def _solToBin_(self,outputfile):
+        from solution.write.ThreeDsolutionToBinary import ThreeDsolutionToBinary
+        solToBin = ThreeDsolutionToBinary(self.lbSolution)
+        solToBin.WriteSolution(outputfile)
+
     def _CreateSolution_(self,outputfile,outputType):
         if outputType == 'json':
             self._solToJSON_(outputfile)
@@ -42,34 +58,68 @@ class CheckLoadbuildSolution(object):
             self._solToYAML_(outputfile)
         elif outputType == 'xml':
             self._solToXML_(outputfile)
+        elif outputType == 'bin':
+            self._solToBin_(outputfile)
         else:
             raise Exception("Unknown output type: " + outputType)
         
-    def __init__(self,instancename,instancetype,solutionname,solutiontype,setname,name):
-        instance             = ConvertLoadbuildInstance.ConvertLoadbuildInstance(instancename, instancetype, "", "")
-        instance_in_solution = ConvertLoadbuildInstance.ConvertLoadbuildInstance(solutionname, solutiontype, "", "")
-        instance.lbInstance.AllChecks()
-        
-        if solutiontype == 'json':
-            self._jsonToSol_(instance.lbInstance, solutionname)
-        elif solutiontype == 'yaml':
-            self._yamlToSol_(instance.lbInstance, solutionname)
-        elif solutiontype == 'xml':
-            self._xmlToSol_(instance.lbInstance, solutionname)
+    # Returns the checked instance together with the fingerprint of the instance as read, from the cache if possible
+    def _readInstance_(self,instancename,instancetype,cache):
+        if cache is not None:
+            key   = cache.Key(instancename, instancetype)
+            entry = cache.Load(key)
+            if entry is not None:
+                self.profile.Count("cache.hits")
+                fingerprint, report, lbInstance = entry
+                if report:
+                    print(report)
+                return lbInstance, fingerprint
+        with self.profile.Time("read.instance"):
+            lbInstance  = ConvertLoadbuildInstance.ConvertLoadbuildInstance(instancename, instancetype, "", "").lbInstance
+            fingerprint = lbInstance.Fingerprint()
+        with self.profile.Time("instance.AllChecks"):
+            _, report   = lbInstance.AllChecks()
+        if cache is not None:
+            cache.Store(key, (fingerprint, report, lbInstance))
+        return lbInstance, fingerprint
+
+    # If profile is set, the time spent in every phase is recorded and added to the results of the solution
+    def __init__(self,instancename,instancetype,solutionname,solutiontype,setname,name,backend="python",overlap="ngoi",printResults=True,cache=None,profile=False):
+        self.profile = Profile() if profile else NO_PROFILE
+        with self.profile.Time("read.solution"):
+            if solutiontype == 'json':
+                solutionReader, instance_in_solution = self._jsonToSol_(solutionname)
+            elif solutiontype == 'yaml':
+                solutionReader, instance_in_solution = self._yamlToSol_(solutionname)
+            elif solutiontype == 'xml':
+                solutionReader, instance_in_solution = self._xmlToSol_(solutionname)
+            elif solutiontype == 'bin':
+                solutionReader, instance_in_solution = self._binToSol_(solutionname)
+            else:
+                raise Exception("Unknown solution file type: " + solutiontype)
+        if instancetype == solutiontype and os.path.abspath(instancename) == os.path.abspath(solutionname):
+            lbInstance = instance_in_solution
+            with self.profile.Time("instance.AllChecks"):
+                lbInstance.AllChecks()
         else:
-            raise Exception("Unknown solution file type: " + solutiontype)
-        if instance.lbInstance != instance_in_solution.lbInstance and\
-          not (instance_in_solution.lbInstance.constraints     == [] and\
-               instance_in_solution.lbInstance.objectives      == [] and\
-               instance_in_solution.lbInstance.containerkinds  == [] and\
-               instance_in_solution.lbInstance.itemkinds       == []):
-            raise Exception("Either specify the entire instance in the solution file, or no instance at all")
+            # The instances are compared as read, before the checks fill in default values
+            lbInstance, fingerprint = self._readInstance_(instancename, instancetype, cache)
+            if fingerprint != instance_in_solution.Fingerprint() and\
+              not (instance_in_solution.constraints     == [] and\
+                   instance_in_solution.objectives      == [] and\
+                   instance_in_solution.containerkinds  == [] and\
+                   instance_in_solution.itemkinds       == []):
+                raise Exception("Either specify the entire instance in the solution file, or no instance at all")
+        with self.profile.Time("read.layout"):
+            self.lbSolution = solutionReader.CreateThreeDsolution(lbInstance)
+        self.lbSolution.profile = self.profile
         if setname:
             self.OverwriteSetname(setname)
         if name:
             self.OverwriteInstancename(name)
-        self.lbSolution.DecorateSolution()
-        self.lbSolution.PrintResults()
+        self.lbSolution.DecorateSolution(backend, overlap)
+        if printResults:
+            self.lbSolution.PrintResults()
 
     def CreateSolution(self,outputfilebasename,outputtypes):
         for t in outputtypes:
@@ -89,13 +139,19 @@ if __name__ == "__main__":
     parser.add_argument('--instance',     '-I',  metavar='INPUT_FILE',    required=True,                   help='The instance file')
     parser.add_argument('--instancetype', '-IT', metavar='INSTANCE_TYPE', choices=['json', 'yaml', 'xml'], help='The type of the instance file')
     parser.add_argument('--solution',     '-S',  metavar='SOLUTION_FILE', required=True,                   help='The solution file')
-    parser.add_argument('--solutiontype', '-ST', metavar='SOLUTION_TYPE', choices=['json', 'yaml', 'xml'], help='The type of the solution file')
+    parser.add_argument('--solutiontype', '-ST', metavar='SOLUTION_TYPE', choices=['json', 'yaml', 'xml', 'bin'], help='The type of the solution file')
     parser.add_argument('--output', '-O', metavar='OUTPUT_FILE', help='The output file basename, extension is set by output type')
     parser.add_argument('--xml', '-X', action='store_true',  help='Create xml file')
     parser.add_argument('--yaml', '-Y', action='store_true', help='Create yaml file')
     parser.add_argument('--json', '-J', action='store_true', help='Create json file')
+    parser.add_argument('--bin', '-B', action='store_true', help='Create binary file')
     parser.add_argument('--setname', help='Overwrite the set name')
     parser.add_argument('--instancename', help='Overwrite the instance name')
+    parser.add_argument('--backend', choices=['python', 'numpy'], default='python', help='The NgoiMatrix backend used for the overlap and support checks')
+    parser.add_argument('--overlap', choices=['ngoi', 'sweep'], default='ngoi', help='The engine used for the overlap check')
+    parser.add_argument('--cache', metavar='CACHE_DIR', help='Directory in which parsed and checked instances are cached')
+    parser.add_argument('--cachesize', type=int, default=1024, help='The maximum size of the instance cache in MB')
+    parser.add_argument('--profile', action='store_true', help='Report the time spent in every phase of the check')
     args = parser.parse_args()
 
     if args.instancetype is None:
@@ -106,15 +162,22 @@ if __name__ == "__main__":
     if args.solutiontype is None:
         filename = args.solution
         _, file_extension = os.path.splitext(filename)
-        if file_extension in ['.json', '.xml', '.yaml']:
+        if file_extension in ['.json', '.xml', '.yaml', '.bin']:
             args.solutiontype = file_extension[1:]
-    if (args.json or args.yaml or args.xml) and args.output is None:
+    if (args.json or args.yaml or args.xml or args.bin) and args.output is None:
         if args.setname is None or args.instancename is None:
             exit('Could not deduce output filename setname or instancename is not given')
         else:
             args.output = args.setname + '_' + args.instancename
 
-    converter = CheckLoadbuildSolution(args.instance,args.instancetype,args.solution,args.solutiontype,args.setname,args.instancename)
+    cache = None
+    if args.cache:
+        from common.InstanceCache import InstanceCache
+        cache = InstanceCache(args.cache, args.cachesize*1024*1024)
+
+    converter = CheckLoadbuildSolution(args.instance,args.instancetype,args.solution,args.solutiontype,args.setname,args.instancename,args.backend,args.overlap,cache=cache,profile=args.profile)
+    if args.profile:
+        print(converter.profile.Report())
     
     outputTypes = list()
     if args.xml:
@@ -123,4 +186,6 @@ if __name__ == "__main__":
         outputTypes.append('json')
     if args.yaml:
         outputTypes.append('yaml')
+    if args.bin:
+        outputTypes.append('bin')
     converter.CreateSolution(args.output,outputTypes)
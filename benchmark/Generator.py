@@ -0,0 +1,203 @@
+import random
+from common.Requirements import BaseRequirement
+from instance.ThreeDinstance      import ThreeDinstance
+from instance.ThreeDcontainerkind import ThreeDcontainerkind
+from instance.ThreeDpalletkind    import ThreeDpalletkind
+from instance.ThreeDboxkind       import ThreeDboxkind
+from instance.ThreeDitemkind      import ThreeDitemkind
+from instance.ThreeDloadingspace  import ThreeDloadingspace as ThreeDkindLoadingspace
+from instance.ThreeDconstraint    import ThreeDconstraint
+from instance.ThreeDobjective     import ThreeDobjective
+from solution.ThreeDsolution     import ThreeDsolution
+from solution.ThreeDcontainer    import ThreeDcontainer
+from solution.ThreeDpallet       import ThreeDpallet
+from solution.ThreeDbox          import ThreeDbox
+from solution.ThreeDloadingspace import ThreeDloadingspace
+from solution.ThreeDplacement    import ThreeDplacement
+
+# Procedurally generates an instance and a layout for it, with the same interface as the instance and solution readers.
+# The layout consists of units: stacks of `stack` items of a single kind. At nesting depth 0 the units are placed directly
+# in the container, at depth 1 every unit is packed in a box, and at depth 2 every box is loaded on a pallet. Units stand
+# on a grid of square slots along the container, so the layout is valid (inside, not overlapping, fully supported, and
+# within weight bounds) unless a fraction `invalid` of the units is shifted half a slot, which makes them overlap.
+class BenchmarkGenerator(object):
+    SLOT = 40               # the side of a slot, the footprint of every item kind fits in it
+    SLOTS_ACROSS = 6        # the number of slots across the width of the container
+    DECK = 10               # the height of the deck of a pallet
+    CONSTRAINTS = ["support", "maximum_weight", "axle_weight", "must_place"]
+    OBJECTIVES  = ["item_count", "container_count", "box_count", "pallet_count", "average_fill_rate", "worst_fill_rate", "axle_weight"]
+
+    def __init__(self, items=1000, kinds=10, depth=0, stack=4, invalid=0.0, seed=0):
+        if depth not in [0, 1, 2]:
+            raise Exception("The nesting depth should be 0 (items), 1 (boxes), or 2 (pallets)")
+        if items < 1 or kinds < 1 or stack < 1:
+            raise Exception("The number of items, kinds, and the stack height should be positive")
+        self.items   = items
+        self.kinds   = kinds
+        self.depth   = depth
+        self.stack   = stack
+        self.invalid = invalid
+        self.seed    = seed
+        self.units   = (items + stack - 1)//stack
+        self.rows    = (self.units + self.SLOTS_ACROSS - 1)//self.SLOTS_ACROSS
+
+    def Parameters(self):
+        return {"items": self.items, "kinds": self.kinds, "depth": self.depth, "stack": self.stack, "invalid": self.invalid, "seed": self.seed}
+
+    # The number of items in every unit, the last one takes the remainder
+    def _unitSizes_(self):
+        return [min(self.stack, self.items - unit*self.stack) for unit in range(self.units)]
+
+    def _kindOfUnit_(self, unit):
+        return unit % self.kinds + 1
+
+    def CreateThreeDinstance(self):
+        rnd = random.Random(self.seed)
+        threeDinstance = ThreeDinstance()
+        threeDinstance.description.setname = "benchmark"
+        threeDinstance.description.name    = "_".join([key + str(value) for key,value in sorted(self.Parameters().items())])
+        for name in self.CONSTRAINTS:
+            threeDconstraint = ThreeDconstraint()
+            threeDconstraint.constraint = [c for c in BaseRequirement.Constraints() if c.name == name][0]
+            threeDinstance.addConstraint(threeDconstraint)
+        for priority, name in enumerate(self.OBJECTIVES, 1):
+            threeDobjective = ThreeDobjective()
+            threeDobjective.objective = [o for o in BaseRequirement.Objectives() if o.name == name][0]
+            threeDobjective.priority  = priority
+            threeDobjective.weight    = 1.0
+            threeDinstance.addObjective(threeDobjective)
+
+        quantities = dict()
+        for unit, size in enumerate(self._unitSizes_()):
+            quantities[self._kindOfUnit_(unit)] = quantities.get(self._kindOfUnit_(unit), 0) + size
+        max_height = 0
+        for kindid in range(1, self.kinds + 1):
+            itemkind = ThreeDitemkind()
+            itemkind.id           = kindid
+            itemkind.quantity     = quantities.get(kindid, 0)
+            itemkind.boundingBox  = [rnd.randint(self.SLOT//2, self.SLOT), rnd.randint(self.SLOT//2, self.SLOT), rnd.randint(5, 30)]
+            itemkind.orientations = set(["LWH", "WLH"])
+            itemkind.weight       = float(rnd.randint(1, 50))
+            itemkind.support      = 1.0
+            itemkind.place        = True
+            threeDinstance.addItemkind(itemkind)
+            max_height = max(max_height, itemkind.boundingBox[2]*self.stack)
+            if self.depth >= 1:
+                threeDinstance.addBoxkind(self._boxkind_(itemkind, (quantities.get(kindid, 0) + self.stack - 1)//self.stack))
+            if self.depth >= 2:
+                threeDinstance.addPalletkind(self._palletkind_(itemkind, (quantities.get(kindid, 0) + self.stack - 1)//self.stack))
+
+        length = self.rows*self.SLOT + self.SLOT # one slot extra, so the shifted units of an invalid layout stay inside
+        containerkind = ThreeDcontainerkind()
+        containerkind.id             = 1
+        containerkind.quantity       = 1
+        containerkind.maxWeight      = 1e12
+        containerkind.axle1          = -float(length)
+        containerkind.axle2          = 2.0*length
+        containerkind.minWeightAxle1 = 0.0
+        containerkind.minWeightAxle2 = 0.0
+        containerkind.maxWeightAxle1 = 1e12
+        containerkind.maxWeightAxle2 = 1e12
+        loadingspace = ThreeDkindLoadingspace()
+        loadingspace.id          = 1
+        loadingspace.position    = [0, 0, 0]
+        loadingspace.boundingBox = [length, self.SLOTS_ACROSS*self.SLOT, max_height + self.DECK]
+        containerkind.addLoadingspace(loadingspace)
+        threeDinstance.addContainerkind(containerkind)
+        return threeDinstance
+
+    # A box that fits a unit of the given item kind exactly, box kinds share the id of their item kind
+    def _boxkind_(self, itemkind, quantity):
+        boxkind = ThreeDboxkind()
+        boxkind.id           = itemkind.id
+        boxkind.quantity     = quantity
+        boxkind.boundingBox  = [itemkind.boundingBox[0], itemkind.boundingBox[1], itemkind.boundingBox[2]*self.stack]
+        boxkind.position     = [0, 0, 0]
+        boxkind.orientations = set(["LWH"])
+        boxkind.weight       = 1.0
+        boxkind.support      = 1.0
+        boxkind.place        = True
+        boxkind.loadingspace = ThreeDkindLoadingspace()
+        boxkind.loadingspace.id          = 1
+        boxkind.loadingspace.position    = [0, 0, 0]
+        boxkind.loadingspace.boundingBox = list(boxkind.boundingBox)
+        return boxkind
+
+    # A pallet with a deck the size of the box of a unit of the given item kind, pallet kinds share the id of their item kind
+    def _palletkind_(self, itemkind, quantity):
+        palletkind = ThreeDpalletkind()
+        palletkind.id           = itemkind.id
+        palletkind.quantity     = quantity
+        palletkind.boundingBox  = [itemkind.boundingBox[0], itemkind.boundingBox[1], self.DECK]
+        palletkind.position     = [0, 0, 0]
+        palletkind.orientations = set(["LWH"])
+        palletkind.weight       = 5.0
+        palletkind.support      = 1.0
+        palletkind.place        = True
+        palletkind.loadingspace = ThreeDkindLoadingspace()
+        palletkind.loadingspace.id          = 1
+        palletkind.loadingspace.position    = [0, 0, self.DECK]
+        palletkind.loadingspace.boundingBox = [itemkind.boundingBox[0], itemkind.boundingBox[1], itemkind.boundingBox[2]*self.stack]
+        return palletkind
+
+    @staticmethod
+    def _placement_(placementid, attribute, value, position):
+        placement = ThreeDplacement()
+        placement.id          = placementid
+        placement.position    = position
+        placement.orientation = "LWH"
+        setattr(placement, attribute, value)
+        return placement
+
+    @staticmethod
+    def _loadingspace_(placements):
+        loadingspace = ThreeDloadingspace()
+        loadingspace.id = 1
+        for placement in placements:
+            loadingspace.addPlacement(placement)
+        return loadingspace
+
+    def CreateThreeDsolution(self, threeDinstance):
+        rnd = random.Random(self.seed + 1)
+        heights = {itemkind.id: itemkind.boundingBox[2] for itemkind in threeDinstance.itemkinds}
+        threeDsolution = ThreeDsolution(threeDinstance)
+        threeDsolution.description.setname = threeDinstance.description.setname
+        threeDsolution.description.name    = threeDinstance.description.name
+        placementid = 1
+        top_level   = list()
+        for unit, size in enumerate(self._unitSizes_()):
+            kindid = self._kindOfUnit_(unit)
+            items  = list()
+            for n in range(size):
+                items.append(self._placement_(placementid, "itemid", kindid, [0, 0, n*heights[kindid]]))
+                placementid += 1
+            row, column = divmod(unit, self.SLOTS_ACROSS)
+            position = [row*self.SLOT, column*self.SLOT, 0]
+            if rnd.random() < self.invalid:
+                position[0] += self.SLOT//2
+            if self.depth == 0:
+                for item in items:
+                    item.position = [x + z for x,z in zip(position, item.position)]
+                top_level += items
+                continue
+            box = ThreeDbox()
+            box.id, box.kindid, box.loadingspace = unit + 1, kindid, self._loadingspace_(items)
+            threeDsolution.addBox(box)
+            if self.depth == 1:
+                top_level.append(self._placement_(placementid, "boxid", box.id, position))
+                placementid += 1
+                continue
+            pallet = ThreeDpallet()
+            pallet.id, pallet.kindid = unit + 1, kindid
+            pallet.loadingspace = self._loadingspace_([self._placement_(placementid, "boxid", box.id, [0, 0, 0])])
+            threeDsolution.addPallet(pallet)
+            top_level.append(self._placement_(placementid + 1, "palletid", pallet.id, position))
+            placementid += 2
+        container = ThreeDcontainer()
+        container.id, container.kindid = 1, 1
+        container.addLoadingspace(self._loadingspace_(top_level))
+        threeDsolution.addContainer(container)
+        return threeDsolution
+
+if __name__=="__main__":
+    exit("Don't run this file")
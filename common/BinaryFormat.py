@@ -0,0 +1,21 @@
+import struct
+
+# Binary solution files consist of a fixed header, a JSON document with the description and the structure of the layout, and
+# a block of fixed-width placement records, aligned to 8 bytes. Every loadingspace in the structure refers to the records of its
+# placements by [first record, number of records]. Orientations and colors are stored as indices in the strings of the document.
+#
+#   header:  magic (8 bytes), version (uint32), length of the document (uint32), number of records (uint64), offset of the records (uint64)
+#   record:  id, item/box/pallet id, x, y, z (int64), color (int32, -1 if none), orientation (int16, -1 if none), type (int8), padding
+MAGIC   = b"LBSOLBIN"
+VERSION = 1
+HEADER  = struct.Struct("<8sIIQQ")
+RECORD  = struct.Struct("<qqqqqihbx")
+TYPES   = ["item", "box", "pallet"]
+
+# The offset of the records behind a document of the given length
+def RecordsOffset(documentLength):
+    end = HEADER.size + documentLength
+    return end + (-end % 8)
+
+if __name__=="__main__":
+    exit("Don't run this file")
@@ -28,13 +28,14 @@ class AxleWeightConstraint(BaseConstraint):
                               PropositionalRequirement("weight", lambda x: x>=0, "weight must be non-negative")]
     def Validate(threeDsolution):
         b,e = True, [""]
+        threeDsolution.AggregateContainers()
         for container in threeDsolution.containers:
             L_min, L_max =  float("inf"), -float("inf")
-            for loadingspace in threeDsolution.threeDinstance.containerkinds[container.kindid].loadingspaces:
+            for loadingspace in threeDsolution.containerkindById[container.kindid].loadingspaces:
                 L_min, L_max = min(L_min, loadingspace.position[0]), max(L_max, loadingspace.position[0] + loadingspace.boundingBox[0])
             C_min, C_max = container.GetCOGbounds()
             C_min, C_max = max(C_min, L_min), min(C_max, L_max)
-            x            = container.GetCOG()
+            x, _         = container.GetCOG()
             if x[0] < C_min or x[0] > C_max:
                 b = False
                 e.append("Container with id " + str(container.id) + " and kind " + str(container.kindid) + " c.o.g.: " + str(x[0]) + " not in [" + str(C_min) + ", " + str(C_max) + "] <- VIOLATION")
@@ -54,6 +55,7 @@ class MaximumWeightConstraint(BaseConstraint):
                               PropositionalRequirement("weight", lambda x: x>=0, "weight must be non-negative")]
     def Validate(threeDsolution):
         b,e = True, [""]
+        threeDsolution.AggregateContainers()
         for container in threeDsolution.containers:
             total_weight = container.GetTotalWeight()
             rep = "Container with id " + str(container.id) + " and kind " + str(container.kindid) + ": " + str(total_weight) + "/" + str(container.maxWeight)
@@ -97,7 +99,7 @@ class ReadableItemLabelConstraint(BaseConstraint):
         for placement in loadingspace.placements:
             if hasattr(placement, "label"):
                 dummy = ReadableItemLabelConstraint.Dummy()
-                dummy.__dict__ = {x: placement.__dict__[x] for x in placement.__dict__ if x not in ['position', 'boundingBox']}
+                dummy.SetAttributes({x: v for x,v in placement.GetAttributes().items() if x not in ['position', 'boundingBox']})
                 dummy.position    = list(placement.position)
                 dummy.boundingBox = list(placement.boundingBox)
                 global_label = Orientation.ApplyToSide(Orientation.GetFromAlias(dummy.orientation), dummy.label)
@@ -0,0 +1,63 @@
+from common.utils import bool_cast
+from common.Requirements import BaseRequirement
+
+# Helpers for the fast path of the JSON readers, which map a parsed document straight onto the ThreeD* objects. The YAML
+# readers load their documents into the same structures and share the fast path. Every field is read with a dictionary
+# lookup and converted by the cast table of its cast, which lists the types the cast accepts. Any other type, a section
+# of the wrong type, or a value the cast rejects raises MalformedJSON, upon which the readers fall back to their tolerant
+# path. For well-formed input the results are the same as those of safeGetAttr and safeGetText.
+class MalformedJSON(Exception):
+    pass
+
+CASTS = {int:   {int: int,   float: int,   bool: int,   str: int},
+         float: {int: float, float: float, bool: float, str: float},
+         str:   {str: str,   int: str,     float: str,  bool: str},
+         bool:  {str: bool_cast, bool: bool}} # a JSON boolean is kept as it is, a string is read with bool_cast
+
+EMPTY = dict()
+
+def GetField(json, tag, casts):
+    value = json.get(tag)
+    if value is None:
+        return None
+    try:
+        return casts[type(value)](value)
+    except (KeyError, ValueError, TypeError, OverflowError):
+        raise MalformedJSON(tag)
+
+# A section that should be an object, an absent section reads as an empty object
+def GetOne(json, tag):
+    value = json.get(tag)
+    if value is None:
+        return EMPTY
+    if type(value) is not dict:
+        raise MalformedJSON(tag)
+    return value
+
+# A section that should be a list of objects, an absent section reads as an empty list
+def GetAll(json, tag):
+    value = json.get(tag)
+    if value is None:
+        return []
+    if type(value) is not list or not all([type(element) is dict for element in value]):
+        raise MalformedJSON(tag)
+    return value
+
+# A position "x,y,z" as a list of integers
+def GetPosition(json, tag):
+    value = json.get(tag)
+    if value is None:
+        return None
+    if type(value) is not str:
+        raise MalformedJSON(tag)
+    try:
+        return list(map(int, value.split(',')))
+    except ValueError:
+        raise MalformedJSON(tag)
+
+# The optional fields of a kind type ("itemkind", ...) with the cast table of each, fields with another cast always fall back
+def OptionalFields(kindtype):
+    return [(field, CASTS.get(cast, EMPTY)) for field, cast in BaseRequirement.OptionalFields(kindtype)]
+
+if __name__=="__main__":
+    exit("Don't run this file")
@@ -0,0 +1,122 @@
+import os
+import sys
+import pickle
+import hashlib
+import tempfile
+
+# On-disk cache of parsed and checked instances. Entries are keyed by the content of the instance file, its file type and
+# the version of the code that parses and checks it, so changing either invalidates the entry. The cache is bounded in size
+# and evicts the least recently used entries first, where the modification time of an entry is its time of last use.
+#
+# Entries are pickled, and unpickling runs code chosen by whoever wrote the file, so the cache directory must be trusted:
+# it is created readable and writable by its owner only, and a directory that is not owned by the user or that others can
+# write to is refused.
+class InstanceCache(object):
+    EXTENSION = ".pickle"
+    FORMAT    = 1 # the layout of the entries, (fingerprint, report, instance)
+    # The sources that determine the entries: the packages of the instance model, its readers and checks, and the converter
+    SOURCES   = ["common", "instance", "ConvertLoadbuildInstance.py"]
+    LOW_WATER = 0.9 # eviction brings the size of the cache down to this fraction of the maximum size
+
+    def __init__(self, directory, max_size=1024*1024*1024):
+        self.directory = directory
+        self.max_size  = max_size
+        self.version   = self.ToolVersion()
+        self.size      = None # the size of the cache as of the last eviction plus the entries stored since, None if unknown
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self._checkDirectory_()
+
+    def _checkDirectory_(self):
+        if not hasattr(os, "getuid"):
+            return
+        stat = os.stat(self.directory)
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+            raise Exception("The instance cache directory " + self.directory + " should be owned by the user and not be writable by others")
+
+    # Hash of the sources of the instance model and the checks, pickled entries are only valid for the code that created them
+    @classmethod
+    def ToolVersion(cls):
+        digest = hashlib.sha256()
+        digest.update(("format " + str(cls.FORMAT) + ", python " + sys.version).encode())
+        root   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for source in cls.SOURCES:
+            path = os.path.join(root, source)
+            if os.path.isfile(path):
+                files = [path]
+            else:
+                files = [os.path.join(directory, filename) for directory, _, filenames in os.walk(path) for filename in filenames if filename.endswith(".py")]
+            for filename in sorted(files):
+                digest.update(os.path.relpath(filename, root).replace(os.sep, "/").encode())
+                with open(filename, "rb") as f:
+                    digest.update(f.read())
+        return digest.hexdigest()
+
+    def Key(self, filename, filetype):
+        digest = hashlib.sha256()
+        digest.update(self.version.encode())
+        digest.update(str(filetype).encode())
+        with open(filename, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _path_(self, key):
+        return os.path.join(self.directory, key + self.EXTENSION)
+
+    # Returns the cached entry, or None if there is no (readable) entry for the key
+    def Load(self, key):
+        path = self._path_(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    # Entries are written to a temporary file first, so concurrent readers never see a partially written entry
+    def Store(self, key, entry):
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(temporary, self._path_(key))
+        except Exception:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        # The directory is only scanned once the entries stored since the last scan may have filled the cache up. Eviction
+        # frees a tenth of the maximum size, so the directory is scanned once per tenth stored rather than on every store.
+        # Entries stored by other processes are only counted from the next scan on.
+        if self.size is not None:
+            self.size += size
+        if self.size is None or self.size > self.max_size:
+            self.Evict()
+
+    def Evict(self):
+        entries = list()
+        for filename in os.listdir(self.directory):
+            if filename.endswith(self.EXTENSION):
+                try:
+                    stat = os.stat(os.path.join(self.directory, filename))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, filename))
+        total_size = sum(size for _, size, _ in entries)
+        if total_size > self.max_size:
+            for _, size, filename in sorted(entries):
+                if total_size <= self.LOW_WATER*self.max_size:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+                total_size -= size
+        self.size = total_size
+
+if __name__=="__main__":
+    exit("Don't run this file")
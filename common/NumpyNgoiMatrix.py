@@ -0,0 +1,120 @@
+from common.NgoiMatrix import NgoiMatrix
+import numpy as np
+
+# NgoiMatrix variant that keeps the top surface of the loadingspace in a 2-D array over the compressed x/y grid.
+# The history of a cell is not stored: a cuboid was placed in a cell exactly when the lower corner of that cell lies
+# in the footprint of the cuboid, so the placements underneath a cell are recovered from the arrays of cuboid bounds.
+class NumpyNgoiMatrix(NgoiMatrix):
+    def __init__(self, L, W, H):
+        super(NumpyNgoiMatrix, self).__init__(L, W, H)
+        self.xs   = np.array([0, L], dtype=float)
+        self.ys   = np.array([0, W], dtype=float)
+        self.ngoi = np.zeros((1, 1))
+        self.placements = list()
+        self.bounds     = np.empty((16, 5)) # x1, y1, x2, y2, z2 of each added cuboid, in order of addition
+
+    def SplitHorizontally(self, x):
+        i = int(np.searchsorted(self.xs, x))
+        if i == 0 or i == len(self.xs) or self.xs[i] == x:
+            return
+        self.xs   = np.insert(self.xs, i, x)
+        self.splits += 1
+        self.ngoi = np.insert(self.ngoi, i, self.ngoi[i-1], axis=0)
+
+    def SplitVertically(self, y):
+        j = int(np.searchsorted(self.ys, y))
+        if j == 0 or j == len(self.ys) or self.ys[j] == y:
+            return
+        self.ys   = np.insert(self.ys, j, y)
+        self.splits += 1
+        self.ngoi = np.insert(self.ngoi, j, self.ngoi[:,j-1], axis=1)
+
+    def GetIndices(self, X1, X2):
+        x1, y1 = X1
+        x2, y2 = X2
+        x_indices = range(int(np.searchsorted(self.xs, x1)), min(int(np.searchsorted(self.xs, x2)), len(self.xs) - 1))
+        y_indices = range(int(np.searchsorted(self.ys, y1)), min(int(np.searchsorted(self.ys, y2)), len(self.ys) - 1))
+        return x_indices, y_indices
+
+    # Whether the loadingspace and the cuboids only have integer coordinates, for which all areas are exact in float64
+    # (below 2^53), so that the support areas do not depend on how the footprint of a cuboid is divided into cells
+    def _integral_(self, placements):
+        values = [self.length, self.width]
+        for placement in placements:
+            values.extend(placement.position[:2])
+            values.extend(placement.boundingBox[:2])
+        return all([isinstance(value, int) for value in values]) and self.length*self.width < 2**53
+
+    # Sets up the grid of all breakpoints of the given cuboids at once, which is equivalent to splitting when adding them
+    # as long as the coordinates are integral: otherwise the finer grid would change the rounding of the support areas
+    def _presplit_(self, placements):
+        xs, ys = {0, self.length}, {0, self.width}
+        for placement in placements:
+            x1, y1, _ = placement.position
+            xs.update([x for x in (x1, x1 + placement.boundingBox[0]) if 0 < x < self.length])
+            ys.update([y for y in (y1, y1 + placement.boundingBox[1]) if 0 < y < self.width])
+        self.xs   = np.array(sorted(xs), dtype=float)
+        self.ys   = np.array(sorted(ys), dtype=float)
+        self.ngoi = np.zeros((len(self.xs) - 1, len(self.ys) - 1))
+        self.splits += len(self.xs) + len(self.ys) - 4
+
+    # Returns the earlier placements reaching above z1 that occur in a cell of the mask (given for the cells [i0,...) x [j0,...)),
+    # in the order the python engine would report them: by first such cell in x-major order, then by order of addition
+    def _placementsAbove_(self, mask, i0, j0, z1):
+        x1, y1, x2, y2, z2 = self.bounds[:len(self.placements)].T
+        a = np.searchsorted(self.xs, x1) - i0
+        b = np.searchsorted(self.xs, x2) - i0
+        c = np.searchsorted(self.ys, y1) - j0
+        d = np.searchsorted(self.ys, y2) - j0
+        a, b = np.maximum(a, 0), np.minimum(b, mask.shape[0])
+        c, d = np.maximum(c, 0), np.minimum(d, mask.shape[1])
+        found = list()
+        for k in np.nonzero((z2 > z1) & (a < b) & (c < d))[0]:
+            cells = mask[a[k]:b[k], c[k]:d[k]]
+            if cells.any():
+                row, col = divmod(int(np.argmax(cells)), cells.shape[1])
+                found.append(((a[k] + row)*mask.shape[1] + c[k] + col, k))
+        return [self.placements[k] for _,k in sorted(found)]
+
+    # Cuboids are defined by two corner points, and they should be added in increasing z-order
+    def addCuboid(self, placement):
+        x1,y1,z1 = placement.position
+        x2,y2,z2 = [coord+length for coord,length in zip(placement.position, placement.boundingBox)]
+        name = placement.TypeString().capitalize() + " with id " + str(placement.id)
+        self._reportOutside_(placement, name, x1, y1, z1, x2, y2, z2)
+        self.SplitHorizontally(x1)
+        self.SplitHorizontally(x2)
+        self.SplitVertically(y1)
+        self.SplitVertically(y2)
+        x_ind, y_ind = self.GetIndices((x1,y1), (x2,y2))
+        cells = self.ngoi[x_ind.start:x_ind.stop, y_ind.start:y_ind.stop]
+        above = cells > z1
+        if above.any():
+            self.overlap_valid = False
+            placement.correct = False
+            for old_placement in self._placementsAbove_(above, x_ind.start, y_ind.start, z1):
+                self._reportOverlap_(name, old_placement)
+        dx = np.diff(self.xs[x_ind.start:x_ind.stop + 1])
+        dy = np.diff(self.ys[y_ind.start:y_ind.stop + 1])
+        # The supported areas are added one cell at a time in x-major order, as by the python engine, since a pairwise sum
+        # rounds differently for non-integer coordinates
+        areas = (dx[:,None]*dy[None,:])[cells == z1]
+        supported_area = np.add.accumulate(areas)[-1].item() if len(areas) else 0
+        cells[...] = z2
+        if len(self.placements) == len(self.bounds):
+            self.bounds = np.resize(self.bounds, (2*len(self.bounds), 5))
+        self.bounds[len(self.placements)] = x1, y1, x2, y2, z2
+        self.placements.append(placement)
+        self._reportSupport_(placement, name, supported_area, (x2 - x1)*(y2 - y1))
+
+    # Adds all cuboids in the given order, which should be increasing in z
+    def addCuboids(self, placements):
+        placements = list(placements)
+        if not self.placements and self._integral_(placements):
+            self._presplit_(placements)
+            self.bounds = np.empty((max(len(placements), 1), 5))
+        for placement in placements:
+            self.addCuboid(placement)
+
+if __name__=="__main__":
+    exit("Don't run this file")
@@ -1,5 +1,5 @@
 from common.Requirements import BaseObjective, ExistenceRequirement, PropositionalRequirement
-from common.utils import prod, mean
+from common.utils import mean
 
 # When implementing a base class that should not be listed in the OBJECTIVE_LIST,
 # use the following template (not tested with multiple inheritance):
@@ -35,13 +35,14 @@ class AxleWeightObjective(BaseObjective):
                               PropositionalRequirement("weight", lambda x: x>=0, "weight must be non-negative")]
     def Evaluate(threeDsolution):
         obj = 0
+        threeDsolution.AggregateContainers()
         for container in threeDsolution.containers:
             L_min, L_max =  float("inf"), -float("inf")
-            for loadingspace in threeDsolution.threeDinstance.containerkinds[container.kindid].loadingspaces:
+            for loadingspace in threeDsolution.containerkindById[container.kindid].loadingspaces:
                 L_min, L_max = min(L_min, loadingspace.position[0]), max(L_max, loadingspace.position[0] + loadingspace.boundingBox[0])
             C_min, C_max = container.GetCOGbounds()
             C_min, C_max = max(C_min, L_min), min(C_max, L_max)
-            x            = container.GetCOG()
+            x, _         = container.GetCOG()
             obj += max(abs(x[0] - (C_min+C_max)/2) - (C_max-C_min)/2, 0)
         return obj
 
@@ -55,7 +56,7 @@ class ContainerCountObjective(BaseObjective):
 class ItemCountObjective(BaseObjective):
     name = "item_count"
     def Evaluate(threeDsolution):
-        return -sum([1 for placement in threeDsolution.GetAllPlacements() if placement.position != placement.UNPLACED and placement.itemid is not None])
+        return -threeDsolution.GetPlacementTable().PlacedItemCount()
 
 # MINIMIZE
 class BoxCountObjective(BaseObjective):
@@ -70,12 +71,7 @@ class PalletCountObjective(BaseObjective):
         return len(threeDsolution.pallets)
 
 def fillRates(threeDsolution):
-    fill_rates = list()
-    for container in threeDsolution.containers:
-        container_volume = sum([prod(loadingspace.boundingBox) for loadingspace in container.loadingspaces])
-        fill_volume = sum([sum([prod(placement.boundingBox) for placement in loadingspace.placements]) for loadingspace in container.loadingspaces])
-        fill_rates.append(fill_volume/container_volume)
-    return fill_rates
+    return threeDsolution.GetPlacementTable().FillRates()
 
 # Average container fill rate (MAXIMIZE)
 class AverageFillRateObjective(BaseObjective):
@@ -0,0 +1,269 @@
+import random
+
+# Dynamic interval tree (a treap ordered on the lower end, augmented with the maximum upper end of each subtree)
+class IntervalTree(object):
+    class Node(object):
+        __slots__ = ['low', 'high', 'key', 'value', 'priority', 'max_high', 'left', 'right']
+        def __init__(self, low, high, key, value, priority):
+            self.low      = low
+            self.high     = high
+            self.key      = key
+            self.value    = value
+            self.priority = priority
+            self.max_high = high
+            self.left     = None
+            self.right    = None
+
+    def __init__(self, seed=0):
+        self.root   = None
+        self.random = random.Random(seed)
+
+    @staticmethod
+    def _update_(node):
+        node.max_high = node.high
+        if node.left is not None and node.left.max_high > node.max_high:
+            node.max_high = node.left.max_high
+        if node.right is not None and node.right.max_high > node.max_high:
+            node.max_high = node.right.max_high
+
+    @staticmethod
+    def _rotateRight_(node):
+        left = node.left
+        node.left, left.right = left.right, node
+        IntervalTree._update_(node)
+        IntervalTree._update_(left)
+        return left
+
+    @staticmethod
+    def _rotateLeft_(node):
+        right = node.right
+        node.right, right.left = right.left, node
+        IntervalTree._update_(node)
+        IntervalTree._update_(right)
+        return right
+
+    def _insert_(self, node, new):
+        if node is None:
+            return new
+        if new.low < node.low or new.low == node.low and new.key < node.key:
+            node.left = self._insert_(node.left, new)
+            if node.left.priority > node.priority:
+                return self._rotateRight_(node)
+        else:
+            node.right = self._insert_(node.right, new)
+            if node.right.priority > node.priority:
+                return self._rotateLeft_(node)
+        if new.high > node.max_high: # an insertion can only raise the maximum
+            node.max_high = new.high
+        return node
+
+    def _remove_(self, node, low, key):
+        if node is None:
+            raise Exception("Interval with key " + str(key) + " not found")
+        if (low, key) < (node.low, node.key):
+            node.left = self._remove_(node.left, low, key)
+        elif (low, key) > (node.low, node.key):
+            node.right = self._remove_(node.right, low, key)
+        elif node.left is None:
+            return node.right
+        elif node.right is None:
+            return node.left
+        elif node.left.priority > node.right.priority:
+            node = self._rotateRight_(node)
+            node.right = self._remove_(node.right, low, key)
+        else:
+            node = self._rotateLeft_(node)
+            node.left = self._remove_(node.left, low, key)
+        self._update_(node)
+        return node
+
+    def _query_(self, node, low, high, result):
+        if node is None or node.max_high <= low:
+            return
+        self._query_(node.left, low, high, result)
+        if node.low >= high:
+            return
+        if node.high > low:
+            result.append(node.value)
+        self._query_(node.right, low, high, result)
+
+    # Intervals are half-open [low, high) and identified by (low, key), so keys only need to be unique per lower end
+    def insert(self, low, high, key, value):
+        self.root = self._insert_(self.root, self.Node(low, high, key, value, self.random.random()))
+
+    def remove(self, low, key):
+        self.root = self._remove_(self.root, low, key)
+
+    # Returns the values of all intervals that share a point with the open interval (low, high)
+    def query(self, low, high):
+        result = list()
+        self._query_(self.root, low, high, result)
+        return result
+
+# Segment tree over the elementary x-intervals of a fixed set of x-coordinates, of which every node holds an interval tree on
+# the y-extents of the rectangles stored in it. A rectangle [x1,x2) x [y1,y2) is stored both in the O(log n) nodes that cover
+# [x1,x2) and in the O(log n) nodes on the path to the leaf of x1. The rectangles that intersect a query rectangle
+# either contain its lower x-coordinate, and are found in the nodes on the path to that leaf, or start strictly inside its
+# x-extent, and are found in the nodes that cover that range. Both are queried on y, so every rectangle is found once.
+class RectangleTree(object):
+    BUCKET = 32 # a node with at most this many rectangles keeps them in a dictionary instead, which is scanned when queried
+
+    def __init__(self, xs):
+        self.xs    = sorted(set(xs))
+        self.index = {x: i for i,x in enumerate(self.xs)}
+        self.size  = 1
+        while self.size < len(self.xs):
+            self.size *= 2
+        self.cover = dict() # node -> the rectangles of which the x-extent covers the node
+        self.start = dict() # node -> the rectangles of which the lower x-coordinate lies in the node
+
+    # The nodes that together cover the leaves [l, r)
+    def _nodes_(self, l, r):
+        nodes = list()
+        l, r = l + self.size, r + self.size
+        while l < r:
+            if l & 1:
+                nodes.append(l)
+                l += 1
+            if r & 1:
+                r -= 1
+                nodes.append(r)
+            l, r = l >> 1, r >> 1
+        return nodes
+
+    # The nodes on the path from the leaf i to the root
+    def _path_(self, i):
+        nodes = list()
+        node = i + self.size
+        while node:
+            nodes.append(node)
+            node >>= 1
+        return nodes
+
+    def _stored_(self, x1, x2):
+        i1, i2 = self.index[x1], self.index[x2]
+        return [(self.cover, node) for node in self._nodes_(i1, i2)] + [(self.start, node) for node in self._path_(i1)]
+
+    def _add_(self, trees, node, y1, y2, key, value):
+        entries = trees.get(node)
+        if entries is None:
+            trees[node] = {key: (y1, y2, value)}
+        elif type(entries) is dict:
+            entries[key] = (y1, y2, value)
+            if len(entries) > self.BUCKET:
+                tree = IntervalTree()
+                for k, (low, high, v) in entries.items():
+                    tree.insert(low, high, k, v)
+                trees[node] = tree
+        else:
+            entries.insert(y1, y2, key, value)
+
+    def _discard_(self, trees, node, y1, key):
+        entries = trees[node]
+        if type(entries) is dict:
+            del entries[key]
+        else:
+            entries.remove(y1, key)
+        if not entries or type(entries) is IntervalTree and entries.root is None:
+            del trees[node]
+
+    @staticmethod
+    def _query_(entries, y1, y2):
+        if type(entries) is dict:
+            return [v for low, high, v in entries.values() if low < y2 and y1 < high]
+        return entries.query(y1, y2)
+
+    # Rectangles are identified by key, which should be unique among the stored rectangles
+    def insert(self, x1, x2, y1, y2, key, value):
+        for trees, node in self._stored_(x1, x2):
+            self._add_(trees, node, y1, y2, key, value)
+
+    def remove(self, x1, x2, y1, key):
+        for trees, node in self._stored_(x1, x2):
+            self._discard_(trees, node, y1, key)
+
+    # Returns the values of all stored rectangles that share a point with the open rectangle (x1, x2) x (y1, y2)
+    def query(self, x1, x2, y1, y2):
+        i1, i2 = self.index[x1], self.index[x2]
+        result = list()
+        for node in self._path_(i1):
+            if node in self.cover:
+                result.extend(self._query_(self.cover[node], y1, y2))
+        for node in self._nodes_(i1 + 1, i2):
+            if node in self.start:
+                result.extend(self._query_(self.start[node], y1, y2))
+        return result
+
+# Finds all pairs of overlapping cuboids, regardless of the order in which they are given, by sweeping along the z-axis.
+# The cuboids that are cut by the sweep plane are first kept in an interval tree on their x-extent, and every new cuboid is
+# checked on y against the active cuboids whose x-extent overlaps its own. This is fast as long as few of those candidates
+# are rejected on y. Once more than BUDGET candidates per cuboid have been rejected, the active cuboids are moved to a
+# RectangleTree on their footprints, which only returns the cuboids that overlap. In total this is O(n log^2 n + k log n),
+# where k is the number of overlapping pairs.
+class OverlapSweep(object):
+    BUDGET = 16 # candidates per cuboid that may be rejected on y before switching to a RectangleTree
+
+    def __init__(self, placements=()):
+        self.overlap_report = list()
+        self.overlaps       = list()
+        self.overlap_valid  = True
+        self.Sweep(placements)
+
+    @staticmethod
+    def _name_(placement):
+        return placement.TypeString() + " with id " + str(placement.id)
+
+    def Sweep(self, placements):
+        events, xs = list(), list()
+        for n,placement in enumerate(placements):
+            x1,y1,z1 = placement.position
+            x2,y2,z2 = [coord+length for coord,length in zip(placement.position, placement.boundingBox)]
+            if x1 < x2 and y1 < y2 and z1 < z2:
+                # At equal z, cuboids that end are removed before cuboids that start are added, as touching is not overlapping
+                events.append((z1, 1, n, (x1, x2, y1, y2, placement)))
+                events.append((z2, 0, n, (x1, x2, y1, y2, placement)))
+                xs.extend([x1, x2])
+        events.sort(key=lambda event: event[:3])
+        active   = IntervalTree()
+        cuboids  = dict() # n -> cuboid of the active cuboids, as long as they are kept in the interval tree
+        rejected = 0
+        budget   = self.BUDGET*len(xs)//2
+        for _, start, n, cuboid in events:
+            x1, x2, y1, y2, placement = cuboid
+            if not start:
+                if cuboids is None:
+                    active.remove(x1, x2, y1, n)
+                else:
+                    active.remove(x1, n)
+                    del cuboids[n]
+                continue
+            # The overlaps of a cuboid are reported in order of the lower x-coordinate of the other cuboid
+            if cuboids is None:
+                others = sorted(active.query(x1, x2, y1, y2), key=lambda value: value[:2])
+            else:
+                candidates = active.query(x1, x2)
+                others     = [value for value in candidates if value[2][2] < y2 and y1 < value[2][3]]
+                rejected  += len(candidates) - len(others)
+            for _, _, other in others:
+                self._reportOverlap_(other[4], placement)
+            if cuboids is None:
+                active.insert(x1, x2, y1, y2, n, (x1, n, cuboid))
+                continue
+            active.insert(x1, x2, n, (x1, n, cuboid))
+            cuboids[n] = cuboid
+            if rejected > budget:
+                active = RectangleTree(xs)
+                for m, (ox1, ox2, oy1, oy2, _) in cuboids.items():
+                    active.insert(ox1, ox2, oy1, oy2, m, (ox1, m, cuboids[m]))
+                cuboids = None
+
+    def _reportOverlap_(self, old_placement, placement):
+        self.overlap_valid = False
+        old_placement.correct = False
+        placement.correct     = False
+        self.overlaps.append((old_placement, placement))
+        names = tuple(sorted([self._name_(old_placement), self._name_(placement)]))
+        self.overlap_report.append(names[0].capitalize() + " overlaps with " + names[1] + " <- VIOLATION")
+
+if __name__=="__main__":
+    exit("Don't run this file")
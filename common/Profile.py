@@ -0,0 +1,67 @@
+import time
+
+# Opt-in instrumentation of a validation: the wall time and the number of calls of every phase, and named counters
+# (e.g. the number of cells of the NgoiMatrices). Phases are timed with a with-statement, and may be nested.
+class Profile(object):
+    class Phase(object):
+        def __init__(self, profile, name):
+            self.profile = profile
+            self.name    = name
+
+        def __enter__(self):
+            self.start = time.perf_counter()
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            phase = self.profile.phases.setdefault(self.name, {"seconds": 0.0, "calls": 0})
+            phase["seconds"] += time.perf_counter() - self.start
+            phase["calls"]   += 1
+
+    def __init__(self):
+        self.phases   = dict()
+        self.counters = dict()
+
+    def __bool__(self):
+        return True
+
+    def Time(self, name):
+        return Profile.Phase(self, name)
+
+    def Count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def GetResults(self):
+        return {"phases":   {name: dict(phase) for name, phase in self.phases.items()},
+                "counters": dict(self.counters)}
+
+    def Report(self):
+        lines = ["Profile:"]
+        for name, phase in self.phases.items():
+            lines.append("\t- " + name + ": " + "%.6f" % phase["seconds"] + "s in " + str(phase["calls"]) + " call" + ("" if phase["calls"] == 1 else "s"))
+        for name, value in self.counters.items():
+            lines.append("\t- " + name + ": " + str(value))
+        return "\n".join(lines)
+
+# Stands in for a Profile when profiling is off, so that instrumented code does not have to check whether it is on
+class NoProfile(object):
+    class Phase(object):
+        def __enter__(self):
+            pass
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            pass
+
+    PHASE = Phase()
+
+    def __bool__(self):
+        return False
+
+    def Time(self, name):
+        return NoProfile.PHASE
+
+    def Count(self, name, value=1):
+        pass
+
+NO_PROFILE = NoProfile()
+
+if __name__=="__main__":
+    exit("Don't run this file")
@@ -1,3 +1,4 @@
+import importlib
 from common.utils import flatten
 
 class Requirements(object):
@@ -47,6 +48,17 @@ class Requirements(object):
                 elif isinstance(req, PropositionalRequirement):
                     self.RequireProposition(tf, req)
     
+    # Imposes a single requirement on all given fields, only dispatching on the type of requirement once
+    def addRequirement(self, req, fields):
+        if isinstance(req, ExistenceRequirement):
+            require = self.RequireExists
+        elif isinstance(req, PropositionalRequirement):
+            require = self.RequireProposition
+        else:
+            return
+        for tf in fields:
+            require(tf, req)
+    
     # Return the current warning report
     def getWarnings(self):
         return "\n".join(self.warnings)
@@ -70,6 +82,55 @@ class PropositionalRequirement(object):
     def __str__(self):
         return str(self.error)
 
+# Merged validator for the requirements of a number of constraints and objectives. Requirements that several of them declare
+# are checked only once for every kind, in the order in which they are first declared, so that the report is the same as
+# when testing them one by one, except that warnings are not repeated.
+class CompiledRequirements(object):
+    KIND_TYPES = ["itemkind", "boxkind", "palletkind", "containerkind", "loadingspace"]
+
+    def __init__(self, classes):
+        self.requirements = list()
+        self.indices      = dict()
+        seen = dict()
+        for cls in classes:
+            indices = list()
+            for kindtype in self.KIND_TYPES:
+                for req in getattr(cls, kindtype + "Requirements"):
+                    if isinstance(req, ExistenceRequirement):
+                        signature = (kindtype, "exists", req.field, req.default, req.cast)
+                    else:
+                        signature = (kindtype, "proposition", req.field, getattr(req, "error", None))
+                    if signature not in seen:
+                        seen[signature] = len(self.requirements)
+                        self.requirements.append((kindtype, req))
+                    if seen[signature] not in indices:
+                        indices.append(seen[signature])
+            self.indices[cls] = indices
+
+    # Returns the validity and the warnings of every merged requirement
+    def Run(self, threeDinstance):
+        kinds = {"itemkind":      threeDinstance.itemkinds,
+                 "boxkind":       threeDinstance.boxkinds,
+                 "palletkind":    threeDinstance.palletkinds,
+                 "containerkind": threeDinstance.containerkinds,
+                 "loadingspace":  flatten([c.loadingspaces for c in threeDinstance.containerkinds])}
+        results = list()
+        for kindtype, req in self.requirements:
+            r = Requirements()
+            r.addRequirement(req, kinds[kindtype])
+            results.append((r.valid, r.warnings))
+        return results
+
+    # Tests whether all requirements of all constraints and objectives are met
+    def Test(self, threeDinstance):
+        results = self.Run(threeDinstance)
+        return all([valid for valid, _ in results]), "\n".join(flatten([warnings for _, warnings in results]))
+
+    # Tests for every constraint and objective separately whether its requirements are met
+    def TestEach(self, threeDinstance):
+        results = self.Run(threeDinstance)
+        return {cls: (all([results[n][0] for n in indices]), "\n".join(flatten([results[n][1] for n in indices]))) for cls, indices in self.indices.items()}
+
 # Used for checking whether all defaults match for all fields in the Constraints and Objectives files
 itemkindDefaults      = dict()
 boxkindDefaults       = dict()
@@ -80,6 +141,10 @@ loadingspaceDefaults  = dict()
 class BaseRequirement(type):
     OBJECTIVE_LIST  = []
     CONSTRAINT_LIST = []
+    COMPILED        = dict()
+    MODULES         = ["common.Constraints", "common.Objectives"] # imported by Load, when the registry is first used
+    LOADED          = False
+    TEMPLATES       = dict()
     
     itemkindRequirements      = []
     boxkindRequirements       = []
@@ -136,17 +201,58 @@ class BaseRequirement(type):
                 BaseRequirement.OBJECTIVE_LIST.append(cls)
             if cls.IsConstraint():
                 BaseRequirement.CONSTRAINT_LIST.append(cls)
+            BaseRequirement.TEMPLATES.clear()
         super(BaseRequirement, cls).__init__(name, bases, clsdict)
+
+    # The registry of constraints and objectives. Their modules, which pull in the solution model, are only imported when
+    # the registry is first used, not when the kinds are.
+    @staticmethod
+    def Load():
+        if not BaseRequirement.LOADED:
+            BaseRequirement.LOADED = True
+            for module in BaseRequirement.MODULES:
+                importlib.import_module(module)
+
+    @staticmethod
+    def Objectives():
+        BaseRequirement.Load()
+        return BaseRequirement.OBJECTIVE_LIST
+
+    @staticmethod
+    def Constraints():
+        BaseRequirement.Load()
+        return BaseRequirement.CONSTRAINT_LIST
+
+    # The optional fields of a kind type ("itemkind", ...): the (field, cast) pairs of the existence requirements of all
+    # objectives and constraints, in the order in which they are first declared
+    @staticmethod
+    def OptionalFields(kindtype):
+        if kindtype not in BaseRequirement.TEMPLATES:
+            fields = list()
+            for r in BaseRequirement.Objectives() + BaseRequirement.Constraints():
+                for req in getattr(r, kindtype + "Requirements"):
+                    if isinstance(req, ExistenceRequirement) and (req.field, req.cast) not in fields:
+                        fields.append((req.field, req.cast))
+            BaseRequirement.TEMPLATES[kindtype] = (fields, dict.fromkeys([field for field, cast in fields]))
+        return BaseRequirement.TEMPLATES[kindtype][0]
+
+    # The optional fields of a kind type, all set to None, with which a new kind gets its optional fields in one update
+    @staticmethod
+    def FieldTemplate(kindtype):
+        BaseRequirement.OptionalFields(kindtype)
+        return BaseRequirement.TEMPLATES[kindtype][1]
+    
+    # Returns the merged validator of the given constraints and objectives, which is compiled only once
+    @staticmethod
+    def CompileRequirements(classes):
+        classes = tuple(classes)
+        if classes not in BaseRequirement.COMPILED:
+            BaseRequirement.COMPILED[classes] = CompiledRequirements(classes)
+        return BaseRequirement.COMPILED[classes]
     
     # Test whether all requirements are met in a given ThreeDinstance object
     def TestDataRequirements(self,threeDinstance):
-        r = Requirements()
-        r.addRequirements(self.itemkindRequirements,      threeDinstance.itemkinds)
-        r.addRequirements(self.boxkindRequirements,       threeDinstance.boxkinds)
-        r.addRequirements(self.palletkindRequirements,    threeDinstance.palletkinds)
-        r.addRequirements(self.containerkindRequirements, threeDinstance.containerkinds)
-        r.addRequirements(self.loadingspaceRequirements,  flatten([c.loadingspaces for c in threeDinstance.containerkinds]))
-        return r.valid, r.getWarnings()
+        return BaseRequirement.CompileRequirements([self]).Test(threeDinstance)
 
 class BaseObjective(metaclass = BaseRequirement):
     name = ""
@@ -164,8 +270,5 @@ class BaseConstraint(metaclass = BaseRequirement):
     def Validate(threeDinstance):
         raise Exception("Derived classes of BaseConstraint need to override the Validate-method")
 
-import common.Constraints
-import common.Objectives
-
 if __name__=="__main__":
     exit("Don't run this file")
\ No newline at end of file
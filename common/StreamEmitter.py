@@ -0,0 +1,192 @@
+import yaml
+from json.encoder import encode_basestring_ascii
+
+# Streaming JSON and YAML emitters for the solution writers. Every mapping, list, and value is serialized when the writer
+# creates it, so no tree of the document is built. As with common.XMLStream, the document must be created in document
+# order: adding to a mapping or list closes everything that was opened inside it before. Adding to a list ignores the key.
+#
+# The output is the same as that of json.dump and of yaml.dump with default_flow_style=False on the equivalent OrderedDict,
+# except that the emitter of libyaml, which is used if PyYAML has been built with it, may fold long quoted strings differently.
+class StreamNode(object):
+    __slots__ = ["emitter", "isList", "count", "closed"]
+
+    def __init__(self, emitter, isList):
+        self.emitter = emitter
+        self.isList  = isList
+        self.count   = 0
+        self.closed  = False
+
+    def Object(self, key):
+        return self.emitter.Object(self, key)
+
+    def List(self, key):
+        return self.emitter.List(self, key)
+
+    def Value(self, key, value):
+        self.emitter.Value(self, key, value)
+
+class StreamEmitter(object):
+    def __init__(self):
+        self.stack = list()
+
+    def Root(self):
+        if self.stack:
+            raise Exception("The document already has a root")
+        return self._open_(False)
+
+    def Object(self, parent, key):
+        self._enter_(parent, key)
+        return self._open_(False)
+
+    def List(self, parent, key):
+        self._enter_(parent, key)
+        return self._open_(True)
+
+    def Value(self, parent, key, value):
+        self._enter_(parent, key)
+        self._scalar_(value)
+
+    def _open_(self, isList):
+        node = StreamNode(self, isList)
+        if isList:
+            self._startList_()
+        else:
+            self._startObject_()
+        self.stack.append(node)
+        return node
+
+    # Closes the nodes opened inside the parent, and starts a new entry in it
+    def _enter_(self, parent, key):
+        if parent.closed:
+            raise Exception("The entry " + str(key) + " is added to a mapping or list that has already been written")
+        while self.stack[-1] is not parent:
+            self._close_(self.stack.pop())
+        self._entry_(parent, key)
+        parent.count += 1
+
+    def _close_(self, node):
+        node.closed = True
+        if node.isList:
+            self._endList_()
+        else:
+            self._endObject_()
+
+    # Closes all open nodes and ends the document
+    def Close(self):
+        while self.stack:
+            self._close_(self.stack.pop())
+        self._end_()
+
+class JSONEmitter(StreamEmitter):
+    CHUNK = 4096 # number of pieces joined per write
+
+    def __init__(self, stream):
+        StreamEmitter.__init__(self)
+        self.stream = stream
+        self.pieces = list()
+
+    def _write_(self, piece):
+        self.pieces.append(piece)
+        if len(self.pieces) >= self.CHUNK:
+            self._flush_()
+
+    def _flush_(self):
+        self.stream.write("".join(self.pieces))
+        self.pieces = list()
+
+    def _startObject_(self):
+        self._write_("{")
+
+    def _endObject_(self):
+        self._write_("}")
+
+    def _startList_(self):
+        self._write_("[")
+
+    def _endList_(self):
+        self._write_("]")
+
+    def _entry_(self, parent, key):
+        if parent.isList:
+            if parent.count:
+                self._write_(", ")
+        else:
+            self._write_((", " if parent.count else "") + encode_basestring_ascii(key) + ": ")
+
+    def _scalar_(self, value):
+        if isinstance(value, str):
+            self._write_(encode_basestring_ascii(value))
+        elif value is None:
+            self._write_("null")
+        elif value is True or value is False:
+            self._write_("true" if value else "false")
+        elif isinstance(value, int):
+            self._write_(int.__repr__(value))
+        elif isinstance(value, float):
+            if value != value:
+                self._write_("NaN")
+            elif value in [float("inf"), float("-inf")]:
+                self._write_("Infinity" if value > 0 else "-Infinity")
+            else:
+                self._write_(float.__repr__(value))
+        else:
+            raise Exception("Cannot write a value of type " + type(value).__name__ + " to JSON")
+
+    def _end_(self):
+        self._flush_()
+
+# Feeds the events of the document straight to the emitter of PyYAML (or of libyaml), skipping its representer and serializer
+class YAMLEmitter(StreamEmitter):
+    STR, INT, FLOAT, BOOL, NULL = ["tag:yaml.org,2002:" + tag for tag in ["str", "int", "float", "bool", "null"]]
+    MAP, SEQ = "tag:yaml.org,2002:map", "tag:yaml.org,2002:seq"
+
+    def __init__(self, stream):
+        StreamEmitter.__init__(self)
+        self.dumper = getattr(yaml, "CDumper", yaml.Dumper)(stream, default_flow_style=False)
+        self.dumper.open()
+        self.dumper.emit(yaml.DocumentStartEvent(explicit=None, version=None, tags=None))
+
+    def _startObject_(self):
+        self.dumper.emit(yaml.MappingStartEvent(None, self.MAP, True, flow_style=False))
+
+    def _endObject_(self):
+        self.dumper.emit(yaml.MappingEndEvent())
+
+    def _startList_(self):
+        self.dumper.emit(yaml.SequenceStartEvent(None, self.SEQ, True, flow_style=False))
+
+    def _endList_(self):
+        self.dumper.emit(yaml.SequenceEndEvent())
+
+    def _entry_(self, parent, key):
+        if not parent.isList:
+            self._emitScalar_(self.STR, key)
+
+    def _emitScalar_(self, tag, value):
+        implicit = (tag == self.dumper.resolve(yaml.ScalarNode, value, (True, False)), tag == self.STR)
+        self.dumper.emit(yaml.ScalarEvent(None, tag, implicit, value))
+
+    # The same scalars as those of the representer of PyYAML
+    def _scalar_(self, value):
+        if isinstance(value, str):
+            self._emitScalar_(self.STR, str(value))
+        elif value is None:
+            self.dumper.emit(yaml.ScalarEvent(None, self.NULL, (True, False), "null"))
+        elif value is True or value is False:
+            self.dumper.emit(yaml.ScalarEvent(None, self.BOOL, (True, False), "true" if value else "false"))
+        elif isinstance(value, int):
+            self.dumper.emit(yaml.ScalarEvent(None, self.INT, (True, False), str(int(value))))
+        elif isinstance(value, float):
+            self._emitScalar_(self.FLOAT, self.dumper.represent_float(value).value)
+        else:
+            raise Exception("Cannot write a value of type " + type(value).__name__ + " to YAML")
+
+    def _end_(self):
+        try:
+            self.dumper.emit(yaml.DocumentEndEvent(explicit=None))
+            self.dumper.close()
+        finally:
+            self.dumper.dispose()
+
+if __name__=="__main__":
+    exit("Don't run this file")
@@ -0,0 +1,113 @@
+# Streaming XML writer for the instance and solution writers. The document is written to the file while it is built, instead of
+# being kept as an ElementTree, so that the memory use does not depend on the size of the document. Elements must be created
+# in document order: creating a child of an element closes all elements that were opened inside it before. The start tag of
+# an element is written when its first child is created or when it is closed, so attributes can be set until then.
+#
+# The output is the same as that of ElementTree.write on a tree indented with one tab per level (see the effbot prettyprint
+# recipe): no XML declaration, us-ascii with character references for other characters, and "<tag />" for empty elements.
+class XMLElement(object):
+    __slots__ = ["stream", "tag", "attrib", "level", "started", "closed"]
+
+    def __init__(self, stream, tag, level):
+        self.stream  = stream
+        self.tag     = tag
+        self.attrib  = list()
+        self.level   = level
+        self.started = False # whether the start tag has been written, i.e. whether the element has children
+        self.closed  = False
+
+    def Set(self, attr, val):
+        if self.started or self.closed:
+            raise Exception("Attribute " + attr + " cannot be set after the start tag of " + self.tag + " has been written")
+        self.attrib.append((attr, val))
+
+    def SubElement(self, tag):
+        return self.stream.SubElement(self, tag)
+
+    def TextElement(self, tag, text):
+        self.stream.TextElement(self, tag, text)
+
+# Same escaping as ElementTree
+def _escapeText_(text):
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+def _escapeAttrib_(text):
+    text = _escapeText_(text)
+    if "\"" in text:
+        text = text.replace("\"", "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+class XMLStream(object):
+    def __init__(self, filename):
+        self.file  = open(filename, 'w', encoding="us-ascii", errors="xmlcharrefreplace", newline="\n")
+        self.write = self.file.write
+        self.stack = list()
+
+    def Root(self, tag):
+        if self.stack:
+            raise Exception("The XML document already has a root element")
+        root = XMLElement(self, tag, 0)
+        self.stack.append(root)
+        return root
+
+    def SubElement(self, parent, tag):
+        self._openChild_(parent)
+        element = XMLElement(self, tag, parent.level + 1)
+        self.stack.append(element)
+        return element
+
+    # A child without attributes or children of its own, which is written at once
+    def TextElement(self, parent, tag, text):
+        self._openChild_(parent)
+        if text:
+            self.write("<" + tag + ">" + _escapeText_(text) + "</" + tag + ">")
+        else:
+            self.write("<" + tag + " />")
+
+    # Closes the elements opened inside the parent, and writes what precedes a new child of the parent
+    def _openChild_(self, parent):
+        if parent.closed:
+            raise Exception("Element " + parent.tag + " has already been written, its children should be created in document order")
+        while self.stack[-1] is not parent:
+            self._close_(self.stack.pop())
+        if not parent.started:
+            self._startTag_(parent, ">")
+            parent.started = True
+        self.write("\n" + "\t"*(parent.level + 1))
+
+    def _startTag_(self, element, end):
+        self.write("<" + element.tag + "".join([" " + attr + "=\"" + _escapeAttrib_(val) + "\"" for attr, val in element.attrib]) + end)
+
+    def _close_(self, element):
+        if element.started:
+            self.write("\n" + "\t"*element.level + "</" + element.tag + ">")
+        else:
+            self._startTag_(element, " />")
+        element.closed = True
+
+    # Closes all open elements and the file
+    def Close(self):
+        try:
+            if self.stack:
+                root = self.stack[0]
+                while self.stack:
+                    self._close_(self.stack.pop())
+                if root.started:
+                    self.write("\n")
+        finally:
+            self.file.close()
+
+if __name__=="__main__":
+    exit("Don't run this file")
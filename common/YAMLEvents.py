@@ -0,0 +1,115 @@
+import re
+import yaml
+from yaml.resolver import Resolver
+from yaml.constructor import SafeConstructor
+
+# Loads YAML documents from the events of the parser (the one of libyaml if PyYAML has been built with it), into the
+# same plain dicts, lists, and scalars as yaml.load with the SafeLoader. The whole document is still built as a tree of
+# dicts and lists before the reader sees it; this only skips composing the node graph and the constructor pass over it.
+# Common scalars are converted directly, other tags go through the SafeConstructor. Documents with aliases, merge keys,
+# explicitly tagged collections, complex keys, or more than one document are loaded by yaml.load.
+LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+STR, INT, FLOAT, BOOL, NULL, MERGE = ["tag:yaml.org,2002:" + tag for tag in ["str", "int", "float", "bool", "null", "merge"]]
+MAP, SEQ = "tag:yaml.org,2002:map", "tag:yaml.org,2002:seq"
+DECIMAL  = re.compile(r'[-+]?(?:0|[1-9][0-9]*)$')
+DOTTED   = re.compile(r'[-+]?(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][-+][0-9]+)?$')
+
+class _Fallback_(Exception):
+    pass
+
+class _Loader_(object):
+    NOKEY = object()
+    TAGS  = 4096 # the number of plain scalars of which the resolved tag is remembered, such as the keys of the mappings
+
+    def __init__(self):
+        self.resolver    = Resolver()
+        self.constructor = SafeConstructor()
+        self.tags        = dict()
+
+    def _scalar_(self, event):
+        value, tag = event.value, event.tag
+        if tag is None or tag == "!":
+            if event.implicit[0] and value in self.tags:
+                tag = self.tags[value]
+            else:
+                tag = self.resolver.resolve(yaml.ScalarNode, value, event.implicit)
+                if event.implicit[0] and len(self.tags) < self.TAGS:
+                    self.tags[value] = tag
+        if tag == STR:
+            return value
+        if tag == INT and DECIMAL.match(value):
+            return int(value)
+        if tag == FLOAT and DOTTED.match(value):
+            return float(value)
+        if tag == NULL:
+            return None
+        if tag == BOOL:
+            return SafeConstructor.bool_values[value.lower()]
+        if tag == MERGE:
+            raise _Fallback_()
+        node = yaml.ScalarNode(tag, value, style=event.style)
+        try:
+            return self.constructor.construct_object(node)
+        finally:
+            self.constructor.constructed_objects.clear()
+
+    def Load(self, stream):
+        root, stack, documents = None, list(), 0
+        for event in yaml.parse(stream, Loader=LOADER):
+            kind = event.__class__
+            if kind is yaml.ScalarEvent:
+                value = self._scalar_(event)
+            elif kind is yaml.MappingStartEvent:
+                if event.tag not in [None, "!", MAP]:
+                    raise _Fallback_()
+                value = dict()
+            elif kind is yaml.SequenceStartEvent:
+                if event.tag not in [None, "!", SEQ]:
+                    raise _Fallback_()
+                value = list()
+            elif kind is yaml.MappingEndEvent or kind is yaml.SequenceEndEvent:
+                stack.pop()
+                continue
+            elif kind is yaml.DocumentStartEvent:
+                documents += 1
+                if documents > 1:
+                    raise _Fallback_()
+                continue
+            elif kind is yaml.AliasEvent:
+                raise _Fallback_()
+            else:
+                continue
+
+            # A mapping on the stack holds [dict, the key of the next value], a sequence [list, NOKEY]
+            if not stack:
+                root = value
+            elif type(stack[-1][0]) is list:
+                stack[-1][0].append(value)
+            elif stack[-1][1] is self.NOKEY:
+                if isinstance(value, (dict, list)):
+                    raise _Fallback_()
+                stack[-1][1] = value
+            else:
+                stack[-1][0][stack[-1][1]] = value
+                stack[-1][1] = self.NOKEY
+            if kind is not yaml.ScalarEvent:
+                stack.append([value, self.NOKEY])
+        return root
+
+def LoadYAML(filename="", text=""):
+    if filename:
+        with open(filename) as f:
+            try:
+                return _Loader_().Load(f)
+            except _Fallback_:
+                f.seek(0)
+                return yaml.load(f, Loader=LOADER)
+    if text:
+        try:
+            return _Loader_().Load(text)
+        except _Fallback_:
+            return yaml.load(text, Loader=LOADER)
+
+if __name__=="__main__":
+    exit("Don't run this file")
@@ -1,3 +1,5 @@
+import hashlib
+
 def prod(_list):
     res = 1
     for element in _list:
@@ -27,6 +29,51 @@ def key(attribute, default=-float('infinity')):
 def combine(lambdas):
     return (lambda x: [lambd(x) for lambd in lambdas])
 
+# Content fingerprint of a value: lists keep their order, sets and dicts do not, and objects are
+# fingerprinted by their Fingerprint-method if they have one, or by their attributes otherwise.
+# Fingerprints are blake2b digests instead of hashes, so that they are the same in every process and
+# distinct values do not collide like hash(-1) and hash(-2). Numbers that compare equal have equal fingerprints.
+def fingerprint(value):
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+    if hasattr(value, "Fingerprint"):
+        return value.Fingerprint()
+    if isinstance(value, (list, tuple)):
+        return _digest_("sequence", tuple(map(fingerprint, value)))
+    if isinstance(value, (set, frozenset)):
+        return _digest_("set", tuple(sorted(map(fingerprint, value))))
+    if isinstance(value, dict):
+        return _digest_("dict", tuple(sorted((fingerprint(k), fingerprint(v)) for k,v in value.items())))
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        return _digest_("object", fingerprint(type(value).__name__), fingerprint(value.__dict__))
+    if isinstance(value, (bool, int, float)):
+        return _digest_("number", int(value) if isinstance(value, bool) or (isinstance(value, float) and value.is_integer()) else value)
+    return _digest_(type(value).__name__, hash(value))
+
+# 64-bit blake2b digest of the representation of a tuple of numbers and strings
+def _digest_(*parts):
+    return int.from_bytes(hashlib.blake2b(repr(parts).encode(), digest_size=8).digest(), "little")
+
+# Hashable equivalent of a value, such that two values are equal exactly when their hashable equivalents are
+def hashable(value):
+    if isinstance(value, list):
+        return (list, tuple(map(hashable, value)))
+    if isinstance(value, tuple):
+        return (tuple, tuple(map(hashable, value)))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(map(hashable, value))
+    if isinstance(value, dict):
+        return (dict, frozenset((k, hashable(v)) for k,v in value.items()))
+    return value
+
+# Fingerprint of a list that does not depend on the order of its elements, but does count duplicates
+def unorderedFingerprint(values):
+    if values is None:
+        return 0
+    return _digest_("multiset", tuple(sorted(map(fingerprint, values))))
+
 def testListOnId(listOfObjects):
     allIds = [x.id for x in listOfObjects if hasattr(x, "id") and isinstance(x.id, int)]
     sortedIds = sorted(set(allIds))
@@ -1,6 +1,6 @@
 from instance.ThreeDloadingspace import ThreeDloadingspace
 from common.utils import Orientation, indent
-from common.Requirements import BaseRequirement, ExistenceRequirement
+from common.Requirements import BaseRequirement
 
 class ThreeDboxkind(object):
     def __init__(self):
@@ -12,11 +12,7 @@ class ThreeDboxkind(object):
         self.orientations              = None
         
         # Load all known optional fields
-        boxRequirements = list()
-        for requirements in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-            boxRequirements += requirements.boxkindRequirements
-        for field, cast in set([(requirement.field, requirement.cast) for requirement in boxRequirements if isinstance(requirement, ExistenceRequirement)]):
-            setattr(self, field, None)
+        self.__dict__.update(BaseRequirement.FieldTemplate("boxkind"))
 
     def IsValid(self):
         errors = [""]
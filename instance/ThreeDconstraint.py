@@ -1,8 +1,7 @@
 from common.Requirements import BaseRequirement, BaseConstraint
-from common.utils import indent
+from common.utils import indent, fingerprint
 
 class ThreeDconstraint(object):
-    CONSTRAINTS = sorted([c.name for c in BaseRequirement.CONSTRAINT_LIST])
     
     def __init__(self):
         self.constraint = BaseConstraint()
@@ -15,7 +14,7 @@ class ThreeDconstraint(object):
             errors.append("Constraint name undefined")
         elif not isinstance(self.constraint.name, str):
             errors.append("Constraint name should be a string")
-        elif self.constraint.name not in self.CONSTRAINTS:
+        elif self.constraint.name not in [c.name for c in BaseRequirement.Constraints()]:
             errors.append("Constraint name not found")
             
         if len(errors)>1:
@@ -31,3 +30,6 @@ class ThreeDconstraint(object):
     
     def __ne__(self,other):
         return not self.__eq__(other)
+
+    def Fingerprint(self):
+        return fingerprint(getattr(self.constraint, "name", None))
@@ -1,6 +1,6 @@
 from instance.ThreeDloadingspace import ThreeDloadingspace
-from common.utils import key, checkDuplicateIds, indent
-from common.Requirements import BaseRequirement, ExistenceRequirement
+from common.utils import key, checkDuplicateIds, indent, fingerprint, unorderedFingerprint
+from common.Requirements import BaseRequirement
 
 class ThreeDcontainerkind(object):
     def __init__(self):
@@ -9,11 +9,7 @@ class ThreeDcontainerkind(object):
         self.quantity      = None
         
         # Load all known optional fields
-        containerRequirements = list()
-        for requirements in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-            containerRequirements += requirements.containerkindRequirements
-        for field, cast in set([(requirement.field, requirement.cast) for requirement in containerRequirements if isinstance(requirement, ExistenceRequirement)]):
-            setattr(self, field, None)
+        self.__dict__.update(BaseRequirement.FieldTemplate("containerkind"))
 
     def addLoadingspace(self, loadingspace):
         if not isinstance(loadingspace, ThreeDloadingspace): raise Exception("Expected a loadingspace")
@@ -71,3 +67,9 @@ class ThreeDcontainerkind(object):
 
     def __ne__(self,other):
         return not self.__eq__(other)
+
+    # Equal containerkinds have equal fingerprints, regardless of the order of their loadingspaces
+    def Fingerprint(self):
+        fields = dict(self.__dict__)
+        fields["loadingspaces"] = unorderedFingerprint(self.loadingspaces)
+        return fingerprint(fields)
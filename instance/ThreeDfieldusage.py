@@ -0,0 +1,70 @@
+from common.Requirements import BaseRequirement
+
+# Field usage matrix of an instance, built in one traversal of its kinds. For every kind type it records which kinds carry
+# a value for which optional field, and which constraints and objectives (all known ones, and those of the instance) consume it.
+class ThreeDfieldusage(object):
+    KIND_TYPES = ["itemkind", "boxkind", "palletkind", "containerkind", "loadingspace"]
+
+    def __init__(self, threeDinstance):
+        self.kinds = {"itemkind":      threeDinstance.itemkinds,
+                      "boxkind":       threeDinstance.boxkinds,
+                      "palletkind":    threeDinstance.palletkinds,
+                      "containerkind": threeDinstance.containerkinds,
+                      "loadingspace":  threeDinstance.GetAllLoadingspaces()}
+        constraints = set([c.constraint.name for c in threeDinstance.constraints])
+        objectives  = set([o.objective.name  for o in threeDinstance.objectives])
+        active      = [r for r in BaseRequirement.Constraints() if r.name in constraints] +\
+                      [r for r in BaseRequirement.Objectives()  if r.name in objectives]
+        self.consumers = {kindtype: dict() for kindtype in self.KIND_TYPES}
+        self.active    = {kindtype: dict() for kindtype in self.KIND_TYPES}
+        self.carriers  = {kindtype: dict() for kindtype in self.KIND_TYPES}
+        for r in BaseRequirement.Objectives() + BaseRequirement.Constraints():
+            for kindtype in self.KIND_TYPES:
+                for field in set([req.field for req in getattr(r, kindtype + "Requirements")]):
+                    self.consumers[kindtype].setdefault(field, list()).append(r)
+                    self.active[kindtype].setdefault(field, list())
+                    if r in active:
+                        self.active[kindtype][field].append(r)
+        for kindtype in self.KIND_TYPES:
+            fields = list(self.consumers[kindtype])
+            carriers = self.carriers[kindtype]
+            for field in fields:
+                carriers[field] = list()
+            for kind in self.kinds[kindtype]:
+                for field in fields:
+                    if getattr(kind, field, None) is not None:
+                        carriers[field].append(kind)
+
+    # The optional fields of a kind type that no constraint or objective of the instance consumes
+    def UnusedFields(self, kindtype):
+        return sorted([field for field, consumers in self.active[kindtype].items() if not consumers])
+
+    # The warnings for all kinds that carry unused fields, from which these fields are removed if remove_unused is set
+    def ReportUnused(self, remove_unused):
+        warnings = list()
+        for kindtype in self.KIND_TYPES:
+            for field in self.UnusedFields(kindtype):
+                for kind in self.carriers[kindtype][field]:
+                    if remove_unused:
+                        warnings.append("Removed unused " + field + " for " + kindtype + " with id " + str(kind.id))
+                        delattr(kind, field)
+                    else:
+                        warnings.append("Unused " + field + " for " + kindtype + " with id " + str(kind.id))
+                if remove_unused:
+                    self.carriers[kindtype][field] = list()
+        return warnings
+
+    # Per kind type and optional field: how many kinds carry it, and which constraints and objectives consume it
+    def Summary(self):
+        summary = dict()
+        for kindtype in self.KIND_TYPES:
+            summary[kindtype] = dict()
+            for field in sorted(self.consumers[kindtype]):
+                summary[kindtype][field] = {"carriers":  len(self.carriers[kindtype][field]),
+                                            "kinds":     len(self.kinds[kindtype]),
+                                            "consumers": sorted([r.name for r in self.consumers[kindtype][field]]),
+                                            "active":    sorted([r.name for r in self.active[kindtype][field]])}
+        return summary
+
+if __name__=="__main__":
+    exit("Don't run this file")
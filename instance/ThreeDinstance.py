@@ -1,5 +1,5 @@
 from common.Requirements import BaseRequirement
-from common.utils import key, combine, checkDuplicateIds, checkDuplicateNames, flatten, Report
+from common.utils import key, combine, checkDuplicateIds, checkDuplicateNames, flatten, Report, fingerprint, unorderedFingerprint, hashable
 
 from instance.ThreeDdescription   import ThreeDdescription
 from instance.ThreeDcontainerkind import ThreeDcontainerkind
@@ -8,6 +8,7 @@ from instance.ThreeDboxkind       import ThreeDboxkind
 from instance.ThreeDitemkind      import ThreeDitemkind
 from instance.ThreeDconstraint    import ThreeDconstraint
 from instance.ThreeDobjective     import ThreeDobjective
+from instance.ThreeDfieldusage    import ThreeDfieldusage
 
 class ThreeDinstance(object):
     def __init__(self):
@@ -29,6 +30,16 @@ class ThreeDinstance(object):
     def __ne__(self,other):
         return not self.__eq__(other)
     
+    # Equal instances have equal fingerprints, regardless of the order of their kinds, constraints and objectives
+    def Fingerprint(self):
+        return fingerprint((fingerprint(self.description),
+                            unorderedFingerprint(self.containerkinds),
+                            unorderedFingerprint(self.palletkinds),
+                            unorderedFingerprint(self.boxkinds),
+                            unorderedFingerprint(self.itemkinds),
+                            unorderedFingerprint(self.constraints),
+                            unorderedFingerprint(self.objectives)))
+    
     def addContainerkind(self, containerkind):
         if not isinstance(containerkind, ThreeDcontainerkind):
             raise Exception("Expected a containerkind")
@@ -81,93 +92,33 @@ class ThreeDinstance(object):
     # Checks whether all requirements are met
     def IsDataComplete(self):
         report = Report()
-        for r in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-            if r.name in [o.objective.name for o in self.objectives] + [c.constraint.name for c in self.constraints]:
-                report.add(r.TestDataRequirements(self), fail=False, verbose=False)
+        names  = set([o.objective.name for o in self.objectives] + [c.constraint.name for c in self.constraints])
+        active = [r for r in BaseRequirement.Objectives() + BaseRequirement.Constraints() if r.name in names]
+        report.add(BaseRequirement.CompileRequirements(active).Test(self), fail=False, verbose=False)
         return report.get()
     
     # Checks whether there are fields defined that are not needed to satisfy the requirements of the constraints and objectives
     def TooMuchData(self, remove_unused):
-        warnings = list()
-        unusedItemFields, unusedBoxFields, unusedPalletFields, unusedContainerFields,  unusedLoadingspaceFields  = set(), set(), set(), set(), set()
-        for r in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-            unusedItemFields         |= set([req.field for req in r.itemkindRequirements])
-            unusedBoxFields          |= set([req.field for req in r.boxkindRequirements])
-            unusedPalletFields       |= set([req.field for req in r.palletkindRequirements])
-            unusedContainerFields    |= set([req.field for req in r.containerkindRequirements])
-            unusedLoadingspaceFields |= set([req.field for req in r.loadingspaceRequirements])
-        for c in self.constraints:
-            for r in BaseRequirement.CONSTRAINT_LIST:
-                if c.constraint.name != r.name:
-                    continue
-                unusedItemFields         -= set([req.field for req in r.itemkindRequirements])
-                unusedBoxFields          -= set([req.field for req in r.boxkindRequirements])
-                unusedPalletFields       -= set([req.field for req in r.palletkindRequirements])
-                unusedContainerFields    -= set([req.field for req in r.containerkindRequirements])
-                unusedLoadingspaceFields -= set([req.field for req in r.loadingspaceRequirements])
-                break
-        for o in self.objectives:
-            for r in BaseRequirement.OBJECTIVE_LIST:
-                if o.objective.name != r.name:
-                    continue
-                unusedItemFields         -= set([req.field for req in r.itemkindRequirements])
-                unusedBoxFields          -= set([req.field for req in r.boxkindRequirements])
-                unusedPalletFields       -= set([req.field for req in r.palletkindRequirements])
-                unusedContainerFields    -= set([req.field for req in r.containerkindRequirements])
-                unusedLoadingspaceFields -= set([req.field for req in r.loadingspaceRequirements])
-                break
-        for uif in unusedItemFields:
-            for i in self.itemkinds:
-                if hasattr(i,uif) and getattr(i,uif) is not None:
-                    if remove_unused:
-                        warnings.append("Removed unused " + uif + " for itemkind with id " + str(i.id))
-                        delattr(i, uif)
-                    else:
-                        warnings.append("Unused " + uif + " for itemkind with id " + str(i.id))
-        for ubf in unusedBoxFields:
-            for b in self.boxkinds:
-                if hasattr(b,ubf) and getattr(b,ubf) is not None:
-                    if remove_unused:
-                        warnings.append("Removed unused " + ubf + " for boxkind with id " + str(b.id))
-                        delattr(b, ubf)
-                    else:
-                        warnings.append("Unused " + ubf + " for boxkind with id " + str(b.id))
-        for upf in unusedPalletFields:
-            for p in self.palletkinds:
-                if hasattr(p,upf) and getattr(p,upf) is not None:
-                    if remove_unused:
-                        warnings.append("Removed unused " + upf + " for palletkind with id " + str(p.id))
-                        delattr(p, upf)
-                    else:
-                        warnings.append("Unused " + upf + " for palletkind with id " + str(p.id))
-        for ucf in unusedContainerFields:
-            for c in self.containerkinds:
-                if hasattr(c,ucf) and getattr(c, ucf) is not None:
-                    if remove_unused:
-                        warnings.append("Removed unused " + ucf + " for containerkind with id " + str(c.id))
-                        delattr(c, ucf)
-                    else:
-                        warnings.append("Unused " + ucf + " for containerkind with id " + str(c.id))
-        for ulf in unusedLoadingspaceFields:
-            for l in self.GetAllLoadingspaces():
-                if hasattr(l,ulf) and getattr(l, ulf) is not None:
-                    if remove_unused:
-                        warnings.append("Removed unused " + ulf + " for loadingspace with id " + str(l.id))
-                        delattr(l, ulf)
-                    else:
-                        warnings.append("Unused " + ulf + " for loadingspace with id " + str(l.id))
+        warnings = self.FieldUsage().ReportUnused(remove_unused)
         return True, "\n".join(warnings)
     
+    # Returns which kinds carry which optional fields, and which constraints and objectives consume them
+    def FieldUsage(self):
+        return ThreeDfieldusage(self)
+    
+    # Merges itemkinds that only differ in id and quantity into the first of them, grouping them by all their other fields
     def CountMultiples(self):
-        warnings  = list()
-        to_remove = list()
-        for n,i in enumerate(self.itemkinds):
-            for m,j in enumerate(self.itemkinds[n+1:]):
-                if n+m+1 not in to_remove and {x: i.__dict__[x] for x in i.__dict__ if x not in ['id', 'quantity']} == {x: j.__dict__[x] for x in j.__dict__ if x not in ['id', 'quantity']}:
-                    i.quantity += j.quantity
-                    to_remove.append(n+m+1)
-                    warnings.append("Removed duplicate of item with id " + str(i.id) + ": item with id " + str(j.id))
-        self.itemkinds = [i for n,i in enumerate(self.itemkinds) if n not in to_remove]
+        warnings = list()
+        groups   = dict()
+        for i in self.itemkinds:
+            signature = frozenset((x, hashable(v)) for x,v in i.__dict__.items() if x not in ['id', 'quantity'])
+            groups.setdefault(signature, list()).append(i)
+        for group in groups.values():
+            i = group[0]
+            for j in group[1:]:
+                i.quantity += j.quantity
+                warnings.append("Removed duplicate of item with id " + str(i.id) + ": item with id " + str(j.id))
+        self.itemkinds = [group[0] for group in groups.values()]
         return True, "\n".join(warnings)
     
     # Changes all ids of containerkinds, palletkinds, boxkinds, their loadingspaces, and itemkinds by mapping them to the lowest possible positive integers that preserve their ordering
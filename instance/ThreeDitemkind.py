@@ -1,5 +1,5 @@
 from common.utils import Orientation, indent
-from common.Requirements import BaseRequirement, ExistenceRequirement
+from common.Requirements import BaseRequirement
 
 class ThreeDitemkind(object):
     def __init__(self):
@@ -9,11 +9,7 @@ class ThreeDitemkind(object):
         self.orientations = None
         
         # Load all known optional fields
-        itemRequirements = list()
-        for requirements in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-            itemRequirements += requirements.itemkindRequirements
-        for field, cast in set([(requirement.field, requirement.cast) for requirement in itemRequirements if isinstance(requirement, ExistenceRequirement)]):
-            setattr(self, field, None)
+        self.__dict__.update(BaseRequirement.FieldTemplate("itemkind"))
 
     def GetOrientationString(self):
         return ','.join(sorted(self.orientations))
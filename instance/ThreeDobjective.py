@@ -1,8 +1,7 @@
 from common.Requirements import BaseRequirement, BaseObjective
-from common.utils import indent
+from common.utils import indent, fingerprint
 
 class ThreeDobjective(object):
-    OBJECTIVES = sorted([o.name for o in BaseRequirement.OBJECTIVE_LIST])
     
     def __init__(self):
         self.objective = BaseObjective()
@@ -18,7 +17,7 @@ class ThreeDobjective(object):
             errors.append("Objective name undefined")
         elif not isinstance(self.objective.name, str):
             errors.append("Objective name should be a string")
-        elif self.objective.name not in self.OBJECTIVES:
+        elif self.objective.name not in [o.name for o in BaseRequirement.Objectives()]:
             errors.append("Objective name not found")
             
         if self.priority is None:
@@ -48,3 +47,6 @@ class ThreeDobjective(object):
     
     def __ne__(self,other):
         return not self.__eq__(other)
+
+    def Fingerprint(self):
+        return fingerprint((getattr(self.objective, "name", None), self.priority, self.weight))
@@ -1,6 +1,6 @@
 from instance.ThreeDloadingspace import ThreeDloadingspace
 from common.utils import Orientation, indent
-from common.Requirements import BaseRequirement, ExistenceRequirement
+from common.Requirements import BaseRequirement
 
 class ThreeDpalletkind(object):
     def __init__(self):
@@ -12,11 +12,7 @@ class ThreeDpalletkind(object):
         self.orientations = None
         
         # Load all known optional fields
-        palletRequirements = list()
-        for requirements in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-            palletRequirements += requirements.palletkindRequirements
-        for field, cast in set([(requirement.field, requirement.cast) for requirement in palletRequirements if isinstance(requirement, ExistenceRequirement)]):
-            setattr(self, field, None)
+        self.__dict__.update(BaseRequirement.FieldTemplate("palletkind"))
 
     def IsValid(self):
         errors = [""]
@@ -7,7 +7,7 @@ from instance.ThreeDloadingspace  import ThreeDloadingspace
 from instance.ThreeDconstraint    import ThreeDconstraint
 from instance.ThreeDobjective     import ThreeDobjective
 
-from common.Requirements import BaseRequirement, ExistenceRequirement
+from common.Requirements import BaseRequirement
 
 class BaseToThreeDinstance(object):
     @staticmethod 
@@ -30,10 +30,11 @@ class BaseToThreeDinstance(object):
     def safeGetText(container, propertyname, cast):
         raise Exception("Derived classes of BaseToThreeDinstance need to override the safeGetText-method")
     
-    def __init__(self,filename="",text=""):
+    # An already parsed document can be passed as root, so that one parse serves both the instance and the solution reader
+    def __init__(self,filename="",text="",root=None):
         self.filename    = filename
         self.text        = text
-        self.base        = self.safeFindRoot(self.filename, self.text)
+        self.base        = self.safeFindRoot(self.filename, self.text) if root is None else root
         self.description = self.safeFindOne(self.base, 'description')
         self.constraints = self.safeFindOne(self.base, 'constraints')
         self.objectives  = self.safeFindOne(self.base, 'objectives')
@@ -70,18 +71,12 @@ class BaseToThreeDinstance(object):
                         pass
                 
                 # Load all known optional fields
-                loadingspaceFields = set()
-                for r in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                    loadingspaceFields |= set([req for req in r.loadingspaceRequirements])
-                for lf in filter(lambda x: isinstance(x, ExistenceRequirement), loadingspaceFields):
-                    setattr(lbLoadingSpace, lf.field, self.safeGetText(loadingSpace, lf.field, lf.cast))
+                for field, cast in BaseRequirement.OptionalFields("loadingspace"):
+                    setattr(lbLoadingSpace, field, self.safeGetText(loadingSpace, field, cast))
                 lbContainer.addLoadingspace(lbLoadingSpace)      
 
             # Load all known optional fields
-            containerRequirements = list()
-            for requirements in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                containerRequirements += requirements.containerkindRequirements
-            for field, cast in set([(requirement.field, requirement.cast) for requirement in containerRequirements if isinstance(requirement, ExistenceRequirement)]):
+            for field, cast in BaseRequirement.OptionalFields("containerkind"):
                 setattr(lbContainer, field, self.safeGetText(baseContainer, field, cast))
             threeDinstance.addContainerkind(lbContainer)
     
@@ -122,10 +117,7 @@ class BaseToThreeDinstance(object):
                 lbPallet.orientations = set(orientations.split(','))
             
             # Load all known optional fields
-            palletRequirements = list()
-            for requirements in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                palletRequirements += requirements.palletkindRequirements
-            for field, cast in set([(requirement.field, requirement.cast) for requirement in palletRequirements if isinstance(requirement, ExistenceRequirement)]):
+            for field, cast in BaseRequirement.OptionalFields("palletkind"):
                 setattr(lbPallet, field, self.safeGetText(basePallet, field, cast))
             threeDinstance.addPalletkind(lbPallet)
             
@@ -166,10 +158,7 @@ class BaseToThreeDinstance(object):
                 lbBox.orientations = set(orientations.split(','))
             
             # Load all known optional fields
-            boxRequirements = list()
-            for requirements in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                boxRequirements += requirements.boxkindRequirements
-            for field, cast in set([(requirement.field, requirement.cast) for requirement in boxRequirements if isinstance(requirement, ExistenceRequirement)]):
+            for field, cast in BaseRequirement.OptionalFields("boxkind"):
                 setattr(lbBox, field, self.safeGetText(baseBox, field, cast))
             threeDinstance.addBoxkind(lbBox)
    
@@ -188,10 +177,7 @@ class BaseToThreeDinstance(object):
                 lbItem.orientations = set(orientations.split(','))
             
             # Load all known optional fields
-            itemRequirements = list()
-            for requirements in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                itemRequirements += requirements.itemkindRequirements
-            for field, cast in set([(requirement.field, requirement.cast) for requirement in itemRequirements if isinstance(requirement, ExistenceRequirement)]):
+            for field, cast in BaseRequirement.OptionalFields("itemkind"):
                 setattr(lbItem, field, self.safeGetText(baseItem, field, cast))
             threeDinstance.addItemkind(lbItem)
     
@@ -199,7 +185,7 @@ class BaseToThreeDinstance(object):
         for baseConstraint in self.safeFindAll(self.constraints, 'constraint'):
             lbConstraint = ThreeDconstraint()
             name = self.safeGetAttr(baseConstraint, 'name', str)
-            for c in BaseRequirement.CONSTRAINT_LIST:
+            for c in BaseRequirement.Constraints():
                 if c.name == name:
                     lbConstraint.constraint = c
                     break
@@ -209,7 +195,7 @@ class BaseToThreeDinstance(object):
         for baseObjective in self.safeFindAll(self.objectives, 'objective'):
             lbObjective = ThreeDobjective()
             name = self.safeGetAttr(baseObjective, 'name', str)
-            for o in BaseRequirement.OBJECTIVE_LIST:
+            for o in BaseRequirement.Objectives():
                 if o.name == name:
                     lbObjective.objective = o
                     break
@@ -92,86 +92,79 @@ class CLBStoThreeDinstance(object):
                 raise Exception("Configuration exists")
             self.configurations[configuration.id] = configuration
         
-    def _makeShapes_(self):
-        elbeShapes = self.localDataElements.find('elbeshapes')
-        self.shapes = self.Shapes()
-        for elbeShape in elbeShapes:
-            assert elbeShape.tag == 'elbeshape'
-            shape = self.Shapes.Shape()
-            shape.id = int(elbeShape.get("id"))
-            inner = elbeShape.find('inner')
-            if inner is not None:
-                cuboid = inner.find('cuboid')
-                length = cuboid.get('length')
-                width = cuboid.get('width')
-                height = cuboid.get('height')
-                #position = cuboid.get('position')
-            else:
-                outer = elbeShape.find('outer')
-                cuboid = outer.find('cuboid')
-                length = cuboid.get('length')
-                width = cuboid.get('width')
-                height = cuboid.get('height')
-                #position = cuboid.get('position')
-            shape.boundingBox = list(map(attempt(int,1),[length,width,height]))
-            self.shapes.addShape(shape)
+    # The records in the sections of the localDataElements: the tag of the records of each section, and the method reading them
+    RECORDS = {'elbeshapes':               ('elbeshape',               '_makeShape_'),
+               'configurations':           ('configuration',           '_makeConfiguration_'),
+               'orders':                   ('order',                   '_makeOrder_'),
+               'products':                 ('product',                 '_makeProduct_'),
+               'resourcekinds':            ('resourcekind',            '_makeResourceKind_'),
+               'resourcekindcombinations': ('resourcekindcombination', '_makeResourceKindCombination_')}
+
+    def _makeShape_(self, elbeShape):
+        shape = self.Shapes.Shape()
+        shape.id = int(elbeShape.get("id"))
+        inner = elbeShape.find('inner')
+        if inner is not None:
+            cuboid = inner.find('cuboid')
+            length = cuboid.get('length')
+            width = cuboid.get('width')
+            height = cuboid.get('height')
+            #position = cuboid.get('position')
+        else:
+            outer = elbeShape.find('outer')
+            cuboid = outer.find('cuboid')
+            length = cuboid.get('length')
+            width = cuboid.get('width')
+            height = cuboid.get('height')
+            #position = cuboid.get('position')
+        shape.boundingBox = list(map(attempt(int,1),[length,width,height]))
+        self.shapes.addShape(shape)
     
-    def _makeConfigurations_(self):
-        configs = self.localDataElements.find('configurations')
-        self.configurations = self.Configurations()
-        for configInfo in configs:
-            assert configInfo.tag == 'configuration'
-            config = self.Configurations.Configuration()
-            config.id = int(configInfo.get('id'))
-            config.capacity = float(configInfo.get('capacity')[2:])
-            self.configurations.addConfiguration(config)
+    def _makeConfiguration_(self, configInfo):
+        config = self.Configurations.Configuration()
+        config.id = int(configInfo.get('id'))
+        config.capacity = float(configInfo.get('capacity')[2:])
+        self.configurations.addConfiguration(config)
 
-    def _makeOrders_(self):
-        ordersInXml  = self.localDataElements.find('orders')
-        self.orders = self.Orders()
-        for orderInfo in ordersInXml:
-            assert orderInfo.tag == 'order'
-            order = self.Orders.Order()
-            order.id = int(orderInfo.get('id'))
-            fields = orderInfo.find('fields')
-            order.count = int(fields.get('itemCount'))
-            order.productId = int(fields.get('productId'))
-            self.orders.addOrder(order)
-            
-    def _makeProducts_(self):
-        productsInXml = self.localDataElements.find('products')
-        self.products = self.Products()
-        for productInfo in productsInXml:
-            assert productInfo.tag == 'product'
-            product = self.Products.Product()
-            product.id = int(productInfo.get('id'))
-            try:
-                product.weight = attempt(float, 0)(productInfo.get("amount")[2:])
-            except Exception:
-                product.weight = 0
-            elbefields = productInfo.find('elbefields')
-            product.shapeId = int(elbefields.get('elbeshapeId'))
-            product.orientations = set(elbefields.get('allowedOrientations').split(','))
-            self.products.addProduct(product)
+    def _makeOrder_(self, orderInfo):
+        order = self.Orders.Order()
+        order.id = int(orderInfo.get('id'))
+        fields = orderInfo.find('fields')
+        order.count = int(fields.get('itemCount'))
+        order.productId = int(fields.get('productId'))
+        self.orders.addOrder(order)
             
-    def _makeResourceKinds_(self):
-        resourcekindsInXml = self.localDataElements.find('resourcekinds')
-        self.resourcekinds = self.ResourceKinds()
-        for resourcekindInfo in resourcekindsInXml:
-            assert resourcekindInfo.tag == 'resourcekind'
-            resourcekind = self.ResourceKinds.ResourceKind()
-            resourcekind.id = int(resourcekindInfo.get('id'))
-            fields = resourcekindInfo.find('fields')
-            configurationIds = fields.get('configurationIds')
-            resourcekind.configurationId = int(configurationIds)
-            elbefields = resourcekindInfo.find('elbefields')
-            resourcekind.shapeId = int(elbefields.get('elbeshapeId'))
-            self.resourcekinds.addResourceKind(resourcekind)
+    def _makeProduct_(self, productInfo):
+        product = self.Products.Product()
+        product.id = int(productInfo.get('id'))
+        try:
+            product.weight = attempt(float, 0)(productInfo.get("amount")[2:])
+        except Exception:
+            product.weight = 0
+        elbefields = productInfo.find('elbefields')
+        product.shapeId = int(elbefields.get('elbeshapeId'))
+        product.orientations = set(elbefields.get('allowedOrientations').split(','))
+        self.products.addProduct(product)
+        
+    def _makeResourceKind_(self, resourcekindInfo):
+        resourcekind = self.ResourceKinds.ResourceKind()
+        resourcekind.id = int(resourcekindInfo.get('id'))
+        fields = resourcekindInfo.find('fields')
+        configurationIds = fields.get('configurationIds')
+        resourcekind.configurationId = int(configurationIds)
+        elbefields = resourcekindInfo.find('elbefields')
+        resourcekind.shapeId = int(elbefields.get('elbeshapeId'))
+        self.resourcekinds.addResourceKind(resourcekind)
+
+    # The items of the combinations are indexed by the id of the combination, combinations with the same id are joined
+    def _makeResourceKindCombination_(self, resourceKindCombination):
+        items = self.combinations.setdefault(resourceKindCombination.get("id"), list())
+        items.extend([(item.get("id"), item.get("resourcekind_id")) for item in resourceKindCombination.findall("item")])
 
     def _addItemsToInstance_(self,threeDinstance):
-        for itemInfo in self.parameters.findall("order"):
+        for itemId in self.parameterOrders:
             item = ThreeDitemkind()
-            item.id = int(itemInfo.get("id"))
+            item.id = int(itemId)
             assert item.id in self.orders.orders, 'Order %d not found' % item.id
             order = self.orders.orders[item.id]
             assert order.productId in self.products.products, 'Product %d not found' % order.productId
@@ -184,9 +177,9 @@ class CLBStoThreeDinstance(object):
             threeDinstance.addItemkind(item)
         
     def _addResourceKindsToInstance_(self,threeDinstance):
-        for resourceKindInfo in self.parameters.findall("resourcekindcombination"):
+        for combinationId, maxNumber in self.parameterCombinations:
             container = ThreeDcontainerkind()
-            container.id = int(resourceKindInfo.get("id"))
+            container.id = int(combinationId)
             assert container.id in self.resourcekinds.resourcekinds, 'ResourceKind %d not found' % container.id
             resource = self.resourcekinds.resourcekinds[container.id]
             configurationId = resource.configurationId
@@ -194,30 +187,65 @@ class CLBStoThreeDinstance(object):
             configuration = self.configurations.configurations[configurationId]
             container.maxWeight = configuration.capacity
             assert resource.shapeId in self.shapes.shapes, 'Shape %d not found' % resource.shapeId
-            container.quantity = attempt(int,1)(resourceKindInfo.get("maxNumber"))
-            for resourceKindCombination in self.localDataElements.find('resourcekindcombinations').findall("resourcekindcombination"):
-                if resourceKindCombination.get("id") != resourceKindInfo.get("id"):
-                    continue
-                for item in resourceKindCombination.findall("item"):
-                    loadingspace             = ThreeDloadingspace()
-                    loadingspace.id          = int(item.get("id"))
-                    loadingspace.boundingBox = self.shapes.shapes[int(item.get("resourcekind_id"))].boundingBox
-                    loadingspace.position    = [0,0,0]
-                    container.addLoadingspace(loadingspace)
+            container.quantity = attempt(int,1)(maxNumber)
+            if 'resourcekindcombinations' not in self.sections:
+                raise Exception("No resourcekindcombinations in the localDataElements of " + self.filename)
+            for itemId, resourceKindId in self.combinations.get(combinationId, []):
+                loadingspace             = ThreeDloadingspace()
+                loadingspace.id          = int(itemId)
+                loadingspace.boundingBox = self.shapes.shapes[int(resourceKindId)].boundingBox
+                loadingspace.position    = [0,0,0]
+                container.addLoadingspace(loadingspace)
             threeDinstance.addContainerkind(container)
-        
+
+    # Reads the file with iterparse: every record is read as soon as it has been parsed, after which it is removed from the
+    # tree, so only the records themselves are kept. As with find, only the first parameters, the first localDataElements
+    # in them, and the first section of each kind are read. The orders and resourcekindcombinations in the parameters are
+    # looked up when the instance is created, so they may come before or after the localDataElements.
+    def _parse_(self):
+        path, parameters, localDataElements = list(), None, None
+        for event, element in ET.iterparse(self.filename, events=("start", "end")):
+            if event == "start":
+                if len(path) == 1 and parameters is None and element.tag == 'parameters':
+                    parameters = element
+                elif len(path) == 2 and path[1] is parameters and localDataElements is None and element.tag == 'localDataElements':
+                    localDataElements = element
+                path.append(element)
+                continue
+            path.pop()
+            if len(path) == 4 and path[2] is localDataElements:
+                section = path[3].tag
+                if section in self.RECORDS and section not in self.sections:
+                    tag, make = self.RECORDS[section]
+                    assert element.tag == tag
+                    getattr(self, make)(element)
+            elif len(path) == 3 and path[2] is localDataElements:
+                self.sections.add(element.tag)
+            elif len(path) == 2 and path[1] is parameters:
+                if element.tag == "order":
+                    self.parameterOrders.append(element.get("id"))
+                elif element.tag == "resourcekindcombination":
+                    self.parameterCombinations.append((element.get("id"), element.get("maxNumber")))
+            if 0 < len(path) <= 4:
+                path[-1].remove(element)
+        if localDataElements is None:
+            raise Exception("No parameters with localDataElements in " + self.filename)
+        for section in ['elbeshapes', 'configurations', 'orders', 'products', 'resourcekinds']:
+            if section not in self.sections:
+                raise Exception("No " + section + " in the localDataElements of " + self.filename)
+
     def __init__(self,filename):
         self.filename = filename
-        self.clbsXML = ET.parse(self.filename)
-        self.xmlRoot = self.clbsXML.getroot()
-        self.parameters = self.xmlRoot.find('parameters')
-        self.localDataElements = self.parameters.find('localDataElements')
-        
-        self._makeShapes_()
-        self._makeConfigurations_()
-        self._makeOrders_()
-        self._makeProducts_()
-        self._makeResourceKinds_()       
+        self.shapes         = self.Shapes()
+        self.configurations = self.Configurations()
+        self.orders         = self.Orders()
+        self.products       = self.Products()
+        self.resourcekinds  = self.ResourceKinds()
+        self.combinations   = dict()
+        self.sections       = set()
+        self.parameterOrders       = list()
+        self.parameterCombinations = list()
+        self._parse_()
         
     def CreateThreeDinstance(self):
         threeDinstance = ThreeDinstance()
@@ -1,4 +1,14 @@
 from instance.read.BaseToThreeDinstance import BaseToThreeDinstance
+from instance.ThreeDinstance      import ThreeDinstance
+from instance.ThreeDcontainerkind import ThreeDcontainerkind
+from instance.ThreeDitemkind      import ThreeDitemkind
+from instance.ThreeDboxkind       import ThreeDboxkind
+from instance.ThreeDpalletkind    import ThreeDpalletkind
+from instance.ThreeDloadingspace  import ThreeDloadingspace
+from instance.ThreeDconstraint    import ThreeDconstraint
+from instance.ThreeDobjective     import ThreeDobjective
+from common.Requirements import BaseRequirement
+from common.FastJSON import MalformedJSON, CASTS, GetField, GetOne, GetAll, GetPosition, OptionalFields
 from common.utils import bool_cast
 import json
 
@@ -41,8 +51,100 @@ class JSONtoThreeDinstance(BaseToThreeDinstance):
     def safeGetText(json, tag, cast):
         return JSONtoThreeDinstance.safeGetAttr(json, tag, cast)
         
-    def __init__(self,filename="", text=""):
-        super(JSONtoThreeDinstance, self).__init__(filename, text)
-        
+    def __init__(self,filename="", text="", root=None):
+        super(JSONtoThreeDinstance, self).__init__(filename, text, root)
+        self.fastPath = None # whether the last instance was created by the fast path
+
+    # Maps the document straight onto the instance (see common.FastJSON), the tolerant path only reads malformed documents
+    def CreateThreeDinstance(self):
+        try:
+            threeDinstance = self._fastCreateThreeDinstance_()
+            self.fastPath  = True
+        except MalformedJSON:
+            threeDinstance = super(JSONtoThreeDinstance, self).CreateThreeDinstance()
+            self.fastPath  = False
+        return threeDinstance
+
+    @staticmethod
+    def _fastSize_(json, kind):
+        size = GetOne(json, 'size')
+        kind.boundingBox = [GetField(size, 'length', CASTS[int]), GetField(size, 'width', CASTS[int]), GetField(size, 'height', CASTS[int])]
+
+    @staticmethod
+    def _fastLoadingspace_(json, fields):
+        lbLoadingspace          = ThreeDloadingspace()
+        lbLoadingspace.id       = GetField(json, 'id', CASTS[int])
+        JSONtoThreeDinstance._fastSize_(json, lbLoadingspace)
+        lbLoadingspace.position = GetPosition(json, 'position')
+        for field, casts in fields:
+            setattr(lbLoadingspace, field, GetField(json, field, casts))
+        return lbLoadingspace
+
+    # The fields that item, box, and pallet kinds have in common
+    @staticmethod
+    def _fastKind_(json, kind, fields):
+        kind.id       = GetField(json, 'id',       CASTS[int])
+        kind.quantity = GetField(json, 'quantity', CASTS[int])
+        JSONtoThreeDinstance._fastSize_(json, kind)
+        orientations  = GetField(json, 'orientations', CASTS[str])
+        if orientations is not None:
+            kind.orientations = set(orientations.split(','))
+        for field, casts in fields:
+            setattr(kind, field, GetField(json, field, casts))
+        return kind
+
+    def _fastCreateThreeDinstance_(self):
+        if type(self.base) is not dict:
+            raise MalformedJSON('root')
+        threeDinstance = ThreeDinstance()
+        description = GetOne(self.base, 'description')
+        threeDinstance.description.setname = GetField(description, 'set',  CASTS[str])
+        threeDinstance.description.name    = GetField(description, 'name', CASTS[str])
+        constraints = {c.name: c for c in reversed(BaseRequirement.Constraints())}
+        for baseConstraint in GetAll(self.base, 'constraints'):
+            lbConstraint = ThreeDconstraint()
+            name = GetField(baseConstraint, 'name', CASTS[str])
+            if name in constraints:
+                lbConstraint.constraint = constraints[name]
+            threeDinstance.addConstraint(lbConstraint)
+        objectives = {o.name: o for o in reversed(BaseRequirement.Objectives())}
+        for baseObjective in GetAll(self.base, 'objectives'):
+            lbObjective = ThreeDobjective()
+            name = GetField(baseObjective, 'name', CASTS[str])
+            if name in objectives:
+                lbObjective.objective = objectives[name]
+            lbObjective.weight   = GetField(baseObjective, 'weight',   CASTS[float])
+            lbObjective.priority = GetField(baseObjective, 'priority', CASTS[int])
+            threeDinstance.addObjective(lbObjective)
+
+        data = GetOne(self.base, 'data')
+        loadingspaceFields = OptionalFields("loadingspace")
+        containerFields    = OptionalFields("containerkind")
+        for baseContainer in GetAll(data, 'containerkinds'):
+            lbContainer          = ThreeDcontainerkind()
+            lbContainer.id       = GetField(baseContainer, 'id',       CASTS[int])
+            lbContainer.quantity = GetField(baseContainer, 'quantity', CASTS[int])
+            for loadingspace in GetAll(baseContainer, 'loadingspaces'):
+                lbContainer.addLoadingspace(self._fastLoadingspace_(loadingspace, loadingspaceFields))
+            for field, casts in containerFields:
+                setattr(lbContainer, field, GetField(baseContainer, field, casts))
+            threeDinstance.addContainerkind(lbContainer)
+        palletFields = OptionalFields("palletkind")
+        for basePallet in GetAll(data, 'palletkinds'):
+            lbPallet              = ThreeDpalletkind()
+            lbPallet.position     = GetPosition(basePallet, 'position')
+            lbPallet.loadingspace = self._fastLoadingspace_(GetOne(basePallet, 'loadingspace'), [])
+            threeDinstance.addPalletkind(self._fastKind_(basePallet, lbPallet, palletFields))
+        boxFields = OptionalFields("boxkind")
+        for baseBox in GetAll(data, 'boxkinds'):
+            lbBox              = ThreeDboxkind()
+            lbBox.position     = GetPosition(baseBox, 'position')
+            lbBox.loadingspace = self._fastLoadingspace_(GetOne(baseBox, 'loadingspace'), [])
+            threeDinstance.addBoxkind(self._fastKind_(baseBox, lbBox, boxFields))
+        itemFields = OptionalFields("itemkind")
+        for baseItem in GetAll(data, 'itemkinds'):
+            threeDinstance.addItemkind(self._fastKind_(baseItem, ThreeDitemkind(), itemFields))
+        return threeDinstance
+
 if __name__=="__main__":
     exit("Don't run this file")
\ No newline at end of file
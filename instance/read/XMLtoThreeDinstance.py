@@ -52,8 +52,8 @@ class XMLtoThreeDinstance(BaseToThreeDinstance):
             except:
                 return None
     
-    def __init__(self,filename="",text=""):
-        super(XMLtoThreeDinstance, self).__init__(filename,text)
+    def __init__(self,filename="",text="", root=None):
+        super(XMLtoThreeDinstance, self).__init__(filename,text, root)
         
 if __name__=="__main__":
     exit("Don't run this file")
\ No newline at end of file
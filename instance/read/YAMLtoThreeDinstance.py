@@ -1,14 +1,13 @@
-from instance.read.BaseToThreeDinstance import BaseToThreeDinstance
+from instance.read.JSONtoThreeDinstance import JSONtoThreeDinstance
 from common.utils import bool_cast
-import yaml
+from common.YAMLEvents import LoadYAML
 
-class YAMLtoThreeDinstance(BaseToThreeDinstance):
+# YAML documents are loaded from the events of the parser into the same dicts and lists as JSON documents, which are then
+# read by the fast path of the JSON reader (see common.YAMLEvents and common.FastJSON)
+class YAMLtoThreeDinstance(JSONtoThreeDinstance):
     @staticmethod
     def safeFindRoot(filename="", text=""):
-        if filename:
-            return yaml.load(open(filename))
-        if text:
-            return yaml.load(text)
+        return LoadYAML(filename, text)
     
     @staticmethod
     def safeFindOne(yaml, tag):
@@ -44,8 +43,8 @@ class YAMLtoThreeDinstance(BaseToThreeDinstance):
     def safeGetText(yaml, tag, cast):
         return YAMLtoThreeDinstance.safeGetAttr(yaml, tag, cast)
     
-    def __init__(self,filename="", text=""):
-        super(YAMLtoThreeDinstance, self).__init__(filename,text)
+    def __init__(self,filename="", text="", root=None):
+        super(YAMLtoThreeDinstance, self).__init__(filename,text, root)
         
 if __name__=="__main__":
     exit("Don't run this file")
\ No newline at end of file
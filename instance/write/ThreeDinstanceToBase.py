@@ -1,4 +1,4 @@
-from common.Requirements import BaseRequirement, ExistenceRequirement
+from common.Requirements import BaseRequirement
 
 class ThreeDinstanceToBase(object):
     @staticmethod
@@ -27,17 +27,6 @@ class ThreeDinstanceToBase(object):
     def __init__(self,instance):
         self.instance = instance
     
-    def _createFrame_(self):
-        self.base           = self.createBase()
-        self.description    = self.newObject(self.base, "description")
-        self.constraints    = self.newObjectList(self.base, "constraints")
-        self.objectives     = self.newObjectList(self.base, "objectives")
-        self.data           = self.newObject(self.base, "data")
-        self.containerkinds = self.newObjectList(self.data, "containerkinds")
-        self.palletkinds    = self.newObjectList(self.data, "palletkinds")
-        self.boxkinds       = self.newObjectList(self.data, "boxkinds")
-        self.itemkinds      = self.newObjectList(self.data, "itemkinds")
-
     def _fillInfo_(self):
         self.setText(self.description, "set",  self.instance.description.setname, str)
         self.setText(self.description, "name", self.instance.description.name,    str)
@@ -58,20 +47,14 @@ class ThreeDinstanceToBase(object):
                 self.setText(size, "height", loadingSpace.boundingBox[2], int)
                 
                 # automatic writing of optional fields
-                fields = set()
-                for r in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                    fields |= set([req for req in r.loadingspaceRequirements])
-                for field, cast in set([(req.field, req.cast) for req in filter(lambda x: isinstance(x, ExistenceRequirement), fields)]):
+                for field, cast in BaseRequirement.OptionalFields("loadingspace"):
                     if hasattr(loadingSpace, field):
                         attr = getattr(loadingSpace, field)
                         if attr is not None:
                             self.setText(baseLoadingSpace, field, attr, cast)
 
             # automatic writing of optional fields
-            fields = set()
-            for r in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                fields |= set([req for req in r.containerkindRequirements])
-            for field, cast in set([(req.field, req.cast) for req in filter(lambda x: isinstance(x, ExistenceRequirement), fields)]):
+            for field, cast in BaseRequirement.OptionalFields("containerkind"):
                 if hasattr(lbContainer, field):
                     attr = getattr(lbContainer, field)
                     if attr is not None:
@@ -97,10 +80,7 @@ class ThreeDinstanceToBase(object):
             self.setText(basePallet, "orientations", ",".join(lbPallet.orientations), str)
 
             # automatic writing of optional fields
-            fields = set()
-            for r in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                fields |= set([req for req in r.palletkindRequirements])
-            for field, cast in set([(req.field, req.cast) for req in filter(lambda x: isinstance(x, ExistenceRequirement), fields)]):
+            for field, cast in BaseRequirement.OptionalFields("palletkind"):
                 if hasattr(lbPallet, field):
                     attr = getattr(lbPallet, field)
                     if attr is not None:
@@ -108,7 +88,7 @@ class ThreeDinstanceToBase(object):
     
     def _fillBoxes_(self):
         for lbBox in self.instance.boxkinds:
-            baseBox = self.newObject(self.boxkinds, "palletkind")
+            baseBox = self.newObject(self.boxkinds, "boxkind")
             self.addAttrib(baseBox, "id", lbBox.id, int)
             self.setText(baseBox, "quantity", lbBox.quantity, int)
             size = self.newObject(baseBox, "size")
@@ -126,10 +106,7 @@ class ThreeDinstanceToBase(object):
             self.setText(baseBox, "orientations", ",".join(lbBox.orientations), str)
 
             # automatic writing of optional fields
-            fields = set()
-            for r in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                fields |= set([req for req in r.boxkindRequirements])
-            for field, cast in set([(req.field, req.cast) for req in filter(lambda x: isinstance(x, ExistenceRequirement), fields)]):
+            for field, cast in BaseRequirement.OptionalFields("boxkind"):
                 if hasattr(lbBox, field):
                     attr = getattr(lbBox, field)
                     if attr is not None:
@@ -147,10 +124,7 @@ class ThreeDinstanceToBase(object):
             self.setText(baseItem, "orientations", lbItem.GetOrientationString(), str)
             
             # automatic writing of optional fields
-            fields = set()
-            for r in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-                fields |= set([req for req in r.itemkindRequirements])
-            for field, cast in set([(req.field, req.cast) for req in filter(lambda x: isinstance(x, ExistenceRequirement), fields)]):
+            for field, cast in BaseRequirement.OptionalFields("itemkind"):
                 if hasattr(lbItem, field):
                     attr = getattr(lbItem, field)
                     if attr is not None:
@@ -168,14 +142,23 @@ class ThreeDinstanceToBase(object):
             self.setText(baseObjective, "weight", lbObjective.weight, float)
             self.setText(baseObjective, "priority", lbObjective.priority, int)
         
+    # The sections are created in document order, each right before it is filled, so that writers can stream the document
     def _createBase_(self):
-        self._createFrame_()
+        self.base           = self.createBase()
+        self.description    = self.newObject(self.base, "description")
         self._fillInfo_()
+        self.constraints    = self.newObjectList(self.base, "constraints")
         self._fillConstraints_()
+        self.objectives     = self.newObjectList(self.base, "objectives")
         self._fillObjectives_()
+        self.data           = self.newObject(self.base, "data")
+        self.containerkinds = self.newObjectList(self.data, "containerkinds")
         self._fillContainers_()
+        self.palletkinds    = self.newObjectList(self.data, "palletkinds")
         self._fillPallets_()
+        self.boxkinds       = self.newObjectList(self.data, "boxkinds")
         self._fillBoxes_()
+        self.itemkinds      = self.newObjectList(self.data, "itemkinds")
         self._fillItems_()
         
 if __name__=="__main__":
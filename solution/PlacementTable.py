@@ -0,0 +1,191 @@
+from array import array
+
+# Columnar (struct-of-arrays) view of the placements of a decorated solution: one row per placement in the loadingspaces of
+# the containers, pallets, and boxes, with every field in a contiguous typed array. The weight aggregates of the containers,
+# their fill rates, and the number of placed items are computed from the columns at once, with numpy if the backend is
+# "numpy", and in plain loops over the arrays otherwise. Sums are taken in the same order as the Get*Aggregate-methods of
+# the objects, so the results are exactly the same. The table is a snapshot: it is valid for the generation of the
+# aggregates of the solution in which it was built (see solution.ThreeDplacement.AggregateScope).
+class PlacementTable(object):
+    TYPES = ["item", "box", "pallet"]
+
+    def __init__(self, threeDsolution, backend="python"):
+        if backend not in ["python", "numpy"]:
+            raise Exception("Unknown PlacementTable backend: " + backend)
+        self.backend    = backend
+        self.scope      = threeDsolution.aggregateScope
+        self.generation = self.scope.generation
+        self.containers = list(threeDsolution.containers)
+
+        # Per loadingspace: the loadingspace, the index of its container (-1 for those of pallets and boxes), its position,
+        # and its nesting level (0 in a container, 1 on a pallet or in a box in a container, ..., -1 if not in a container)
+        self.loadingspaces = list()
+        self.container     = array('l')
+        self.level         = array('l')
+        self.lsX, self.lsY, self.lsZ = array('d'), array('d'), array('d')
+        spaceIndex = dict()
+        for c, container in enumerate(self.containers):
+            for loadingspace in container.loadingspaces:
+                spaceIndex[id(loadingspace)] = len(self.loadingspaces)
+                self._addLoadingspace_(loadingspace, c)
+        self.containerSpaces = len(self.loadingspaces) # the loadingspaces of the containers come first, and so do their rows
+        for holder in threeDsolution.pallets + threeDsolution.boxes:
+            if id(holder.loadingspace) not in spaceIndex:
+                spaceIndex[id(holder.loadingspace)] = len(self.loadingspaces)
+                self._addLoadingspace_(holder.loadingspace, -1)
+
+        # Per placement: its loadingspace, type, kind (the item id for items), whether it is placed, its position and
+        # rotated bounding box, its own weight, its required support (nan if none), and the loadingspace it holds (or -1)
+        nan, unknown = float("nan"), [float("nan")]*3
+        placements = [placement for loadingspace in self.loadingspaces for placement in loadingspace.placements]
+        positions  = [placement.position if placement.position != placement.UNPLACED else unknown for placement in placements]
+        sizes      = [placement.boundingBox if placement.boundingBox is not None else unknown for placement in placements]
+        types      = {name: index for index, name in enumerate(self.TYPES)}
+        self.space   = array('l', [s for s, loadingspace in enumerate(self.loadingspaces) for _ in loadingspace.placements])
+        self.containerRows = sum([len(loadingspace.placements) for loadingspace in self.loadingspaces[:self.containerSpaces]])
+        self.type    = array('b', [types[placement.type] for placement in placements])
+        kindids      = [placement.itemid if placement.type == "item" else placement.kindid for placement in placements]
+        self.kindid  = array('l', [kindid if kindid is not None else -1 for kindid in kindids])
+        self.placed  = array('b', [placement.position != placement.UNPLACED for placement in placements])
+        self.x, self.y, self.z = [array('d', [position[d] for position in positions]) for d in range(3)]
+        self.l, self.w, self.h = [array('d', [size[d] for size in sizes]) for d in range(3)]
+        # The weight and support of a placement are fields of its kind, which are looked up once per kind, unless a weight
+        # has been set on the placement itself
+        kindfields   = {id(placement.kindfields): placement.kindfields for placement in placements}
+        weights      = {key: getattr(fields, "weight", 0.0) for key, fields in kindfields.items()}
+        supports     = {key: getattr(fields, "support", None) for key, fields in kindfields.items()}
+        self.weight  = array('d', [weights[id(placement.kindfields)] if placement._weight is None else placement._weight for placement in placements])
+        self.support = array('d', [supports[id(placement.kindfields)] if supports[id(placement.kindfields)] is not None else nan for placement in placements])
+        self.child   = array('l', [spaceIndex.get(id(getattr(placement, "loadingspace", None)), -1) if placement.type != "item" else -1 for placement in placements])
+
+        # The nesting levels follow the holders from the loadingspaces of the containers downwards
+        holders = [r for r in range(len(self.space)) if self.child[r] >= 0]
+        frontier = [s for s in range(len(self.loadingspaces)) if self.container[s] >= 0]
+        while frontier:
+            spaces = set(frontier)
+            frontier = list()
+            for r in holders:
+                if self.space[r] in spaces and self.level[self.child[r]] < 0:
+                    self.level[self.child[r]] = self.level[self.space[r]] + 1
+                    frontier.append(self.child[r])
+        self.holders = array('l', sorted(holders, key=lambda r: -self.level[self.child[r]]))
+
+    def _addLoadingspace_(self, loadingspace, container):
+        self.loadingspaces.append(loadingspace)
+        self.container.append(container)
+        self.level.append(0 if container >= 0 else -1)
+        position = getattr(loadingspace, "position", None) or [0, 0, 0]
+        self.lsX.append(position[0]); self.lsY.append(position[1]); self.lsZ.append(position[2])
+
+    def __len__(self):
+        return len(self.space)
+
+    # Per container (in the order of the solution): the total weight and the first moments of everything loaded in it
+    def ContainerAggregates(self):
+        if self.backend == "numpy":
+            return self._containerAggregatesNumpy_()
+        return self._containerAggregatesPython_()
+
+    def _containerAggregatesPython_(self):
+        n = len(self.loadingspaces)
+        positions   = [self.x, self.y, self.z]
+        sizes       = [self.l, self.w, self.h]
+        lsPositions = [self.lsX, self.lsY, self.lsZ]
+        ownMoment = [[w*(x + l/2) for w,x,l in zip(self.weight, positions[d], sizes[d])] for d in range(3)]
+        rowWeight = list(self.weight)
+        rowMoment = [list(m) for m in ownMoment]
+        def spaceTotals():
+            weight, moment = [0]*n, [[0]*n, [0]*n, [0]*n]
+            for r, s in enumerate(self.space):
+                weight[s] += rowWeight[r]
+                for d in range(3):
+                    moment[d][s] += rowMoment[d][r]
+            return weight, moment
+        level = None
+        for r in self.holders:
+            c = self.child[r]
+            if self.level[c] < 1:
+                break
+            if self.level[c] != level: # the rows of the loadingspaces one level deeper are all final
+                level = self.level[c]
+                weight, moment = spaceTotals()
+            rowWeight[r] = self.weight[r] + weight[c]
+            for d in range(3):
+                rowMoment[d][r] = ownMoment[d][r] + moment[d][c] + weight[c]*(positions[d][r] + lsPositions[d][c])
+        weight, moment = spaceTotals()
+        return self._combine_(weight, moment)
+
+    def _containerAggregatesNumpy_(self):
+        import numpy as np
+        n = len(self.loadingspaces)
+        space, child, level, holders = [np.frombuffer(a, dtype=a.typecode) for a in [self.space, self.child, self.level, self.holders]]
+        own         = np.frombuffer(self.weight, dtype=self.weight.typecode)
+        positions   = [np.frombuffer(a, dtype=a.typecode) for a in [self.x, self.y, self.z]]
+        sizes       = [np.frombuffer(a, dtype=a.typecode) for a in [self.l, self.w, self.h]]
+        lsPositions = [np.frombuffer(a, dtype=a.typecode) for a in [self.lsX, self.lsY, self.lsZ]]
+        ownMoment = [own*(x + l/2) for x,l in zip(positions, sizes)]
+        rowWeight = own.copy()
+        rowMoment = [m.copy() for m in ownMoment]
+        def spaceTotals():
+            return np.bincount(space, rowWeight, n), [np.bincount(space, m, n) for m in rowMoment]
+        childLevel = level[child[holders]]
+        for depth in sorted(set(childLevel.tolist()), reverse=True):
+            if depth < 1:
+                break
+            weight, moment = spaceTotals()
+            rows = holders[childLevel == depth]
+            children = child[rows]
+            rowWeight[rows] = own[rows] + weight[children]
+            for d in range(3):
+                rowMoment[d][rows] = ownMoment[d][rows] + moment[d][children] + weight[children]*(positions[d][rows] + lsPositions[d][children])
+        weight, moment = spaceTotals()
+        return self._combine_(weight.tolist(), [m.tolist() for m in moment])
+
+    # Adds up the totals of the loadingspaces of every container, in the order of its loadingspaces
+    def _combine_(self, weight, moment):
+        aggregates = [[0, [0,0,0]] for _ in self.containers]
+        for s in range(self.containerSpaces):
+            c = self.container[s]
+            position = [self.lsX[s], self.lsY[s], self.lsZ[s]]
+            aggregates[c][0] += weight[s]
+            aggregates[c][1]  = [m + moment[d][s] + weight[s]*position[d] for d,m in enumerate(aggregates[c][1])]
+        return [tuple(aggregate) for aggregate in aggregates]
+
+    # Stores the aggregates in the containers, so that GetTotalWeight, GetCOG, and GetCOGbounds do not recompute them
+    def StoreAggregates(self):
+        if self.scope.generation != self.generation:
+            raise Exception("The placements have changed since the placement table was built")
+        for container, (weight, moment) in zip(self.containers, self.ContainerAggregates()):
+            container.aggregate = (self.generation, weight, moment)
+
+    # Per container: the volume of the placements directly in its loadingspaces over the volume of its loadingspaces
+    def FillRates(self):
+        n, rows = self.containerSpaces, self.containerRows
+        if self.backend == "numpy":
+            import numpy as np
+            space = np.frombuffer(self.space, dtype=self.space.typecode)[:rows]
+            l, w, h = [np.frombuffer(a, dtype=a.typecode)[:rows] for a in [self.l, self.w, self.h]]
+            volume = np.bincount(space, l*w*h, n).tolist()
+        else:
+            volume = [0]*n
+            for s, l, w, h in zip(self.space[:rows], self.l[:rows], self.w[:rows], self.h[:rows]):
+                volume[s] += l*w*h
+        spacesOf = [list() for _ in self.containers]
+        for s in range(n):
+            spacesOf[self.container[s]].append(s)
+        fill_rates = list()
+        for spaces in spacesOf:
+            container_volume = sum([self.loadingspaces[s].boundingBox[0]*self.loadingspaces[s].boundingBox[1]*self.loadingspaces[s].boundingBox[2] for s in spaces])
+            fill_rates.append(sum([volume[s] for s in spaces])/container_volume)
+        return fill_rates
+
+    # The number of placed items, in containers, on pallets, and in boxes
+    def PlacedItemCount(self):
+        item = self.TYPES.index("item")
+        if self.backend == "numpy":
+            import numpy as np
+            return int(np.count_nonzero((np.frombuffer(self.type, dtype=self.type.typecode) == item) & (np.frombuffer(self.placed, dtype=self.placed.typecode) != 0)))
+        return sum([1 for t, placed in zip(self.type, self.placed) if t == item and placed])
+
+if __name__=="__main__":
+    exit("Don't run this file")
@@ -44,27 +44,27 @@ class ThreeDcontainer:
             return False, "Invalid container" + (" with id " + str(self.id) if validid else "") + ":" + "\n\t- ".join(map(indent, errors))
         return True,""
     
-    def GetTotalWeight(self):
-        final_weight = 0
+    # Returns the total weight and the first moments (weight times c.o.g.) of everything loaded in the container
+    def GetAggregate(self):
+        scope     = self.__dict__.get("scope")
+        aggregate = self.__dict__.get("aggregate")
+        if aggregate is not None and scope is not None and aggregate[0] == scope.generation:
+            return aggregate[1], aggregate[2]
+        weight, moment = 0, [0,0,0]
         for loadingspace in self.loadingspaces:
-            for placement in loadingspace.placements:
-                final_weight += placement.GetTotalWeight()
-        return final_weight
+            ls_weight, ls_moment = loadingspace.GetAggregate()
+            weight += ls_weight
+            moment  = [m + ls_m + ls_weight*x for m,ls_m,x in zip(moment, ls_moment, loadingspace.position)]
+        if scope is not None:
+            self.aggregate = (scope.generation, weight, moment)
+        return weight, moment
+
+    def GetTotalWeight(self):
+        return self.GetAggregate()[0]
     
     def GetCOG(self):
-        final_cog    = [0,0,0]
-        final_weight = 0
-        for loadingspace in self.loadingspaces:
-            ls_pos = loadingspace.position
-            for placement in loadingspace.placements:
-                cog, weight = placement.GetCOG()
-                final_weight += weight
-                final_cog[0] += weight*(cog[0] + ls_pos[0])
-                final_cog[1] += weight*(cog[1] + ls_pos[1])
-                final_cog[2] += weight*(cog[2] + ls_pos[2])
-        final_weight = self.GetTotalWeight()
-        final_cog    = [coord/final_weight for coord in final_cog]
-        return final_cog, final_weight
+        weight, moment = self.GetAggregate()
+        return [m/weight for m in moment], weight
     
     def GetCOGbounds(self):
         W = self.GetTotalWeight()
@@ -98,4 +98,8 @@ class ThreeDcontainer:
 
     def addLoadingspace(self, loadingspace):
         if not isinstance(loadingspace, ThreeDloadingspace): raise Exception("Expected a loadingspace")
-        self.loadingspaces.append(loadingspace)
\ No newline at end of file
+        self.loadingspaces.append(loadingspace)
+        scope = self.__dict__.get("scope")
+        if scope is not None:
+            scope.AddLoadingspace(loadingspace)
+            scope.Invalidate()
\ No newline at end of file
@@ -33,6 +33,21 @@ class ThreeDloadingspace:
             return False, "Invalid loadingspace" + (" with id " + str(self.id) if validid else "") + ":" + "\n\t- ".join(map(indent, errors))
         return True,""
 
+    # Returns the total weight and the first moments (weight times c.o.g.) of all placements, relative to the loadingspace
+    def GetAggregate(self):
+        scope     = self.__dict__.get("scope")
+        aggregate = self.__dict__.get("aggregate")
+        if aggregate is not None and scope is not None and aggregate[0] == scope.generation:
+            return aggregate[1], aggregate[2]
+        weight, moment = 0, [0,0,0]
+        for placement in self.placements:
+            p_weight, p_moment = placement.GetAggregate()
+            weight += p_weight
+            moment  = [m + p_m for m,p_m in zip(moment, p_moment)]
+        if scope is not None:
+            self.aggregate = (scope.generation, weight, moment)
+        return weight, moment
+
     @staticmethod
     def TypeString():
         return "loadingspace"
@@ -54,4 +69,8 @@ class ThreeDloadingspace:
     def addPlacement(self, placement):
         if not isinstance(placement, ThreeDplacement): raise Exception("Expected a placement")
         self.placements.append(placement)
+        scope = self.__dict__.get("scope")
+        if scope is not None:
+            scope.AddPlacement(placement)
+            scope.Invalidate()
  
\ No newline at end of file
@@ -1,16 +1,78 @@
+from operator import attrgetter
 from common.utils import indent
 
+# The requirement fields (weight, support, ...) of a kind, shared by all placements of that kind instead of copied into each
+class ThreeDkindfields(object):
+    def __init__(self, kind, fields):
+        for field in fields:
+            if hasattr(kind, field):
+                setattr(self, field, getattr(kind, field))
+
+    def __eq__(self, other):
+        return isinstance(other, type(self)) and self.__dict__ == other.__dict__
+
+    def __ne__(self,other):
+        return not self.__eq__(other)
+
+# The generation of the cached weight aggregates of the placements, loadingspaces, and containers of one decorated solution.
+# Cached aggregates are only valid for the generation of their scope in which they were computed. Objects without a scope,
+# such as those of a solution that has not been decorated, do not cache their aggregates.
+class AggregateScope(object):
+    __slots__ = ['generation']
+
+    def __init__(self):
+        self.generation = 0
+
+    def Invalidate(self):
+        self.generation += 1
+
+    def AddPlacement(self, placement):
+        placement.scope     = self
+        placement.aggregate = None
+
+    def AddLoadingspace(self, loadingspace):
+        loadingspace.scope     = self
+        loadingspace.aggregate = None
+        for placement in loadingspace.placements:
+            self.AddPlacement(placement)
+
+    def AddContainer(self, container):
+        container.scope     = self
+        container.aggregate = None
+        for loadingspace in container.loadingspaces:
+            self.AddLoadingspace(loadingspace)
+
+# Setter of a field that the weight aggregates depend on, which invalidates the aggregates of the scope of the placement
+def _aggregateField_(slot):
+    setSlot = slot.__set__
+    def setter(placement, value):
+        setSlot(placement, value)
+        scope = placement.scope
+        if scope is not None:
+            scope.generation += 1
+    return setter
+
+# Placements are stored in slots, as there can be millions of them. The attributes added by decorating the solution have
+# slots too, and the requirement fields of the kind of a placement are looked up in the shared ThreeDkindfields of that kind.
+# Any other attribute is kept in a dictionary, which is only created when such an attribute is set.
+# The position, orientation, bounding box, and weight are properties, as setting them invalidates the cached aggregates.
 class ThreeDplacement(object):
+    __slots__ = ['id', 'itemid', 'boxid', 'palletid', '_position', '_orientation', 'color', 'quantity', 'type', 'correct',
+                 '_boundingBox', 'orientations', 'kindid', 'loadingspace', 'support', '_weight', 'aggregate', 'scope', 'kindfields', '__dict__']
     UNPLACED = "UNPLACED"
+    PROPERTIES = {'_position': 'position', '_orientation': 'orientation', '_boundingBox': 'boundingBox', '_weight': 'weight'}
     
     def __init__(self):
-        self.id          = None
-        self.itemid      = None # only for items
-        self.boxid       = None # only for boxes
-        self.palletid    = None # only for pallets
-        self.position    = None
-        self.orientation = None
-        self.color       = None
+        self.scope        = None # the AggregateScope of the solution, set when the solution is decorated
+        self.id           = None
+        self.itemid       = None # only for items
+        self.boxid        = None # only for boxes
+        self.palletid     = None # only for pallets
+        self._position    = None
+        self._orientation = None
+        self._weight      = None # the weight of the kind of the placement is used unless a weight is set
+        self.color        = None
+        self.kindfields   = None # set when the solution is decorated
         
     def IsValid(self):
         errors = [""]
@@ -49,38 +111,79 @@ class ThreeDplacement(object):
             return False, "Invalid placement" + (" with id " + str(self.id) if validid else "") + ":" + "\n\t- ".join(map(indent, errors))
         return True,""
 
+    def _getWeight_(self):
+        weight = self._weight
+        if weight is None:
+            return self.__getattr__("weight")
+        return weight
+
+    # Returns the total weight and the first moments (weight times c.o.g.) of the placement and everything loaded on it,
+    # the moments of loaded placements are translated by the position of the placement and that of its loadingspace
+    def GetAggregate(self):
+        scope     = self.scope
+        aggregate = getattr(self, "aggregate", None)
+        if aggregate is not None and scope is not None and aggregate[0] == scope.generation:
+            return aggregate[1], aggregate[2]
+        weight = self.weight
+        moment = [weight*(x + l/2) for x,l in zip(self.position, self.boundingBox)]
+        if self.itemid is None:
+            ls_weight, ls_moment = self.loadingspace.GetAggregate()
+            offset  = [x + l for x,l in zip(self.position, self.loadingspace.position)]
+            weight += ls_weight
+            moment  = [m + ls_m + ls_weight*o for m,ls_m,o in zip(moment, ls_moment, offset)]
+        if scope is not None:
+            self.aggregate = (scope.generation, weight, moment)
+        return weight, moment
+
     def GetTotalWeight(self):
-        if self.itemid is not None:
-            return self.weight
-        else:
-            final_weight = self.weight
-            for placement in self.loadingspace.placements:
-                final_weight += placement.GetTotalWeight()
-            return final_weight
+        return self.GetAggregate()[0]
         
     def GetCOG(self):
-        if self.type == "item":
-            return list(map(lambda x: x[0] + x[1]/2, zip(self.position, self.boundingBox)))
-        else:
-            final_cog    = list(map(lambda x: self.weight*(x[0] + x[1]/2), zip(self.position, self.boundingBox)))
-            final_weight = self.weight
-            ls_pos = self.loadingspace.position
-            for placement in self.loadingspace.placements:
-                cog, weight = placement.GetCOG()
-                final_weight += weight
-                final_cog[0] += weight*(cog[0] + ls_pos[0])
-                final_cog[1] += weight*(cog[1] + ls_pos[1])
-                final_cog[2] += weight*(cog[2] + ls_pos[2])
-            final_weight = self.GetTotalWeight()
-            final_cog    = [coord/final_weight for coord in final_cog]
-            return final_cog, final_weight
+        weight, moment = self.GetAggregate()
+        return [m/weight for m in moment], weight
         
     @staticmethod
     def TypeString():
         return "placement"
 
+    # Only called for attributes that are not set on the placement itself, which are looked up in the fields of its kind
+    def __getattr__(self, name):
+        if name == "kindfields":
+            raise AttributeError(name)
+        try:
+            return self.kindfields.__dict__[name]
+        except (AttributeError, KeyError):
+            raise AttributeError(name) from None
+
+    # All attributes of the placement: the fields of its kind, overridden by the attributes set on the placement itself
+    def GetAttributes(self):
+        attributes = dict()
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if slot not in ["__dict__", "kindfields", "scope", "aggregate"]:
+                    try:
+                        value = object.__getattribute__(self, slot)
+                    except AttributeError:
+                        continue
+                    if slot != "_weight" or value is not None:
+                        attributes[self.PROPERTIES.get(slot, slot)] = value
+        if getattr(self, "kindfields", None) is not None:
+            attributes = dict(self.kindfields.__dict__, **attributes)
+        attributes.update(self.__dict__)
+        return attributes
+
+    def SetAttributes(self, attributes):
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
     def __eq__(self, other):
-        return isinstance(other, type(self)) and self.__dict__ == other.__dict__
+        return isinstance(other, type(self)) and self.GetAttributes() == other.GetAttributes()
     
     def __ne__(self,other):
         return not self.__eq__(other)
+
+# The properties are defined on the slots of the class, which only exist once the class has been created
+ThreeDplacement.position    = property(attrgetter("_position"),    _aggregateField_(ThreeDplacement._position))
+ThreeDplacement.orientation = property(attrgetter("_orientation"), _aggregateField_(ThreeDplacement._orientation))
+ThreeDplacement.boundingBox = property(attrgetter("_boundingBox"), _aggregateField_(ThreeDplacement._boundingBox))
+ThreeDplacement.weight      = property(ThreeDplacement._getWeight_, _aggregateField_(ThreeDplacement._weight))
@@ -1,5 +1,7 @@
-from common.Requirements import BaseRequirement, ExistenceRequirement
+from common.Requirements import BaseRequirement
 from common.NgoiMatrix import NgoiMatrix
+from common.OverlapSweep import OverlapSweep
+from common.Profile import NO_PROFILE
 from common.utils import key, Report, checkDuplicateIds
 from operator import le, eq
 
@@ -7,7 +9,9 @@ from instance.ThreeDdescription import ThreeDdescription
 from solution.ThreeDcontainer import ThreeDcontainer
 from solution.ThreeDpallet    import ThreeDpallet
 from solution.ThreeDbox       import ThreeDbox
-from solution.ThreeDplacement import ThreeDplacement
+from solution.ThreeDplacement import ThreeDplacement, ThreeDkindfields, AggregateScope
+from solution.ValidationSession import ValidationSession
+from solution.PlacementTable    import PlacementTable
 
 class ThreeDsolution(object):
     def __init__(self, threeDinstance):
@@ -17,6 +21,8 @@ class ThreeDsolution(object):
         self.pallets     = list()
         self.boxes       = list()
         self.unplaced    = list()
+        self.profile     = NO_PROFILE # set to a common.Profile.Profile to record the time spent in every phase
+        self.placementTable = None
     
     def sort(self):
         if self.threeDinstance != None:
@@ -53,16 +59,35 @@ class ThreeDsolution(object):
         if not isinstance(container, ThreeDcontainer):
             raise Exception("Expected a container")
         self.containers.append(container)
+        scope = self.__dict__.get("aggregateScope")
+        if scope is not None:
+            scope.AddContainer(container)
+            scope.Invalidate()
 
     def addPallet(self, pallet):
         if not isinstance(pallet, ThreeDpallet):
             raise Exception("Expected a pallet")
         self.pallets.append(pallet)
+        scope = self.__dict__.get("aggregateScope")
+        if scope is not None and pallet.loadingspace is not None:
+            scope.AddLoadingspace(pallet.loadingspace)
+            scope.Invalidate()
 
     def addBox(self, box):
         if not isinstance(box, ThreeDbox):
             raise Exception("Expected a box")
         self.boxes.append(box)
+        scope = self.__dict__.get("aggregateScope")
+        if scope is not None and box.loadingspace is not None:
+            scope.AddLoadingspace(box.loadingspace)
+            scope.Invalidate()
+
+    # Invalidates the cached weight aggregates of the (decorated) solution, which is only needed after changing the lists of
+    # placements or loadingspaces directly: the add-methods and the fields of the placements invalidate them themselves
+    def InvalidateAggregates(self):
+        scope = self.__dict__.get("aggregateScope")
+        if scope is not None:
+            scope.Invalidate()
 
     def addUnplaced(self, unplaced):
         if not isinstance(unplaced, ThreeDplacement):
@@ -88,18 +113,30 @@ class ThreeDsolution(object):
             return False, "Instance and solution descriptions are not equivalent. <- VIOLATION"
         return True, "Instance and solution descriptions are equivalent."
 
+    # Counts, per kind id, the number of objects and their total quantity (objects without a quantity count as one)
+    @staticmethod
+    def CountByKind(objs, attribute):
+        occurrences, counts = dict(), dict()
+        for obj in objs:
+            kindid = getattr(obj, attribute)
+            occurrences[kindid] = occurrences.get(kindid, 0) + 1
+            counts[kindid]      = counts.get(kindid, 0) + (obj.quantity if hasattr(obj, "quantity") else 1)
+        return occurrences, counts
+
     # Checks two things (default: cmp = operator.le):
     #     \forall o in objs:  o.kindid in kinds
     #     \forall k in kinds: cmp(# of objs of kind k, k.quantity)
     @staticmethod
     def CountOccurrences(kinds, objs, attribute, label, cmp=le):
         valid, warnings = True, [""]
-        for used_kind in sorted([getattr(obj, attribute) for obj in objs]):
-            if used_kind not in [kind.id for kind in kinds]:
+        occurrences, counts = ThreeDsolution.CountByKind(objs, attribute)
+        kind_ids = {kind.id for kind in kinds}
+        for used_kind in sorted(occurrences):
+            if used_kind not in kind_ids:
                 valid = False
-                warnings.append(label.capitalize() + " of kind " + str(used_kind) + " not present in instance file <- VIOLATION")
+                warnings += [label.capitalize() + " of kind " + str(used_kind) + " not present in instance file <- VIOLATION"]*occurrences[used_kind]
         for kind in kinds:
-            count = sum([obj.quantity if hasattr(obj, "quantity") else 1 for obj in objs if getattr(obj, attribute) == kind.id])
+            count = counts.get(kind.id, 0)
             temp  = label.capitalize() + " of kind " + str(kind.id) + ": " + str(count) + "/" + str(kind.quantity)
             if not cmp(count, kind.quantity):
                 valid = False
@@ -156,7 +193,7 @@ class ThreeDsolution(object):
                 for placement in loadingspace.placements:
                     if getattr(placement, excluded_type + "id") != None:
                         valid = False
-                        warnings.append(obj.TypeString().capitalize() + " with id " + str(obj.id) + " contained " + excluded_type + " with id " + str(placement.id)) + " <- VIOLATION"
+                        warnings.append(obj.TypeString().capitalize() + " with id " + str(obj.id) + " contained " + excluded_type + " with id " + str(placement.id) + " <- VIOLATION")
         return valid, ("All" if valid else "Not all") + " " + excluded_type + "->" + label + " exclusions were adhered to" + ("." if valid else ":" + "\n\t- ".join(sorted(warnings)))
 
     @staticmethod
@@ -181,10 +218,21 @@ class ThreeDsolution(object):
                 warnings.append("Loadingspace(s) with id(s) " + ", ".join(map(str,obj_loadingspaces.difference(kind_loadingspace))) + " in " + label + " with id " + str(obj.id) + " <- VIOLATION")
         return valid, ("All" if valid else "Not all") + " " + label + " loadingspace ids were defined in instance" + ("." if valid else ":" + "\n\t- ".join(warnings))
         
+    # Walks the solution once, and buckets all placements by whether they refer to an item, a box, and/or a pallet
+    def ClassifyPlacements(self):
+        placements = self.GetAllPlacements()
+        placed_items, placed_boxes, placed_pallets = list(), list(), list()
+        for placement in placements:
+            if placement.itemid is not None:
+                placed_items.append(placement)
+            if placement.boxid is not None:
+                placed_boxes.append(placement)
+            if placement.palletid is not None:
+                placed_pallets.append(placement)
+        return placements, placed_items, placed_boxes, placed_pallets
+
     def IsValid(self):
-        placed_pallets = [placement for placement in self.GetAllPlacements() if placement.palletid is not None]
-        placed_boxes   = [placement for placement in self.GetAllPlacements() if placement.boxid is not None]
-        placed_items   = [placement for placement in self.GetAllPlacements() if placement.itemid is not None]
+        placements, placed_items, placed_boxes, placed_pallets = self.ClassifyPlacements()
         
         report = Report()
         # Check if the description is valid
@@ -197,7 +245,7 @@ class ThreeDsolution(object):
             report.add(checkDuplicateIds(container.loadingspaces))
         report.add(checkDuplicateIds(self.pallets))
         report.add(checkDuplicateIds(self.boxes))
-        report.add(checkDuplicateIds(self.GetAllPlacements()))
+        report.add(checkDuplicateIds(placements))
         
         # Check whether box ids / pallet ids of placements are defined and used exactly once
         report.add(self.CheckPlacedAndLoaded(self.pallets, placed_pallets, "palletid", "pallet"))
@@ -225,69 +273,93 @@ class ThreeDsolution(object):
         for pallet in self.pallets:
             report.add(pallet.IsValid())
         for box in self.boxes:
-            box.add(pallet.IsValid())
+            report.add(box.IsValid())
         for placement in self.unplaced:
             report.add(placement.IsValid())
 
         return report.get()
 
     def DecorateLoadingspace(self, loadingspace):
-        loadingspace.ngoi = None
+        loadingspace.ngoi    = None
+        loadingspace.overlap = None
         if hasattr(loadingspace, "boundingBox"):
-            loadingspace.ngoi = NgoiMatrix(*loadingspace.boundingBox)
-            for placement in sorted(loadingspace.placements, key=lambda x: x.position[2]):
-                if not hasattr(placement, "support"):
-                    placement.support = None
-                if placement.boundingBox is not None and placement.support is not None:
-                    loadingspace.ngoi.addCuboid(placement)
+            with self.profile.Time("DecorateSolution.ngoi"):
+                loadingspace.ngoi = self.ngoiMatrix(*loadingspace.boundingBox)
+                cuboids = list()
+                for placement in sorted(loadingspace.placements, key=lambda x: x.position[2]):
+                    if not hasattr(placement, "support"):
+                        placement.support = None
+                    if placement.boundingBox is not None and placement.support is not None:
+                        cuboids.append(placement)
+                loadingspace.ngoi.addCuboids(cuboids)
+            if self.profile:
+                self.profile.Count("ngoi.matrices")
+                self.profile.Count("ngoi.cuboids", len(cuboids))
+                self.profile.Count("ngoi.cells",   loadingspace.ngoi.CellCount())
+                self.profile.Count("ngoi.splits",  loadingspace.ngoi.splits)
+            if self.overlapEngine == "sweep":
+                with self.profile.Time("DecorateSolution.sweep"):
+                    loadingspace.overlap = OverlapSweep([placement for placement in loadingspace.placements if placement.boundingBox is not None])
+            else:
+                loadingspace.overlap = loadingspace.ngoi
+
+    # Builds id-keyed indexes of the kinds of the instance and of the pallets and boxes of the solution
+    # Kinds resolve to the first definition with a given id, and pallets and boxes to the last one
+    def BuildIndexes(self):
+        self.containerkindById = {kind.id: kind for kind in reversed(self.threeDinstance.containerkinds)}
+        self.palletkindById    = {kind.id: kind for kind in reversed(self.threeDinstance.palletkinds)}
+        self.boxkindById       = {kind.id: kind for kind in reversed(self.threeDinstance.boxkinds)}
+        self.itemkindById      = {kind.id: kind for kind in reversed(self.threeDinstance.itemkinds)}
+        self.loadingspaceById  = {(kind.id, loadingspace.id): loadingspace for kind in reversed(self.threeDinstance.containerkinds)
+                                                                            for loadingspace in reversed(kind.loadingspaces)}
+        self.palletById        = {pallet.id: pallet for pallet in self.pallets}
+        self.boxById           = {box.id: box for box in self.boxes}
+        self.kindfieldsByKind  = dict() # id(kind) -> the ThreeDkindfields shared by the placements of that kind
+        self.boundingBoxes     = dict() # (type, kind id, orientation) -> the rotated bounding box shared by those placements
+
+    def GetKindfields(self, kind, fields):
+        kindfields = self.kindfieldsByKind.get(id(kind))
+        if kindfields is None:
+            kindfields = self.kindfieldsByKind[id(kind)] = ThreeDkindfields(kind, fields)
+        return kindfields
 
     # TODO: decorate box + pallet
     def DecoratePlacement(self, placement):
         placement.correct      = True
+        placement.aggregate    = None
         placement.boundingBox  = None
         placement.orientations = None
         if placement.itemid is not None:
             placement.type = "item"
-            for itemkind in self.threeDinstance.itemkinds:
-                if itemkind.id != placement.itemid:
-                    continue
+            itemkind = self.itemkindById.get(placement.itemid)
+            if itemkind is not None:
                 placement.boundingBox  = itemkind.boundingBox
                 placement.orientations = itemkind.orientations
-                for field in self.itemkindFields:
-                    if hasattr(itemkind, field):
-                        setattr(placement, field, getattr(itemkind, field))
-                break
+                placement.kindfields   = self.GetKindfields(itemkind, self.itemkindFields)
         elif placement.boxid is not None:
             placement.type = "box"
             placement.kindid = None
-            for box in self.boxes:
-                if box.id == placement.boxid:
-                    placement.kindid       = box.kindid
-                    placement.loadingspace = box.loadingspace
-            for boxkind in self.threeDinstance.boxkinds:
-                if boxkind.id != placement.kindid:
-                    continue
+            box = self.boxById.get(placement.boxid)
+            if box is not None:
+                placement.kindid       = box.kindid
+                placement.loadingspace = box.loadingspace
+            boxkind = self.boxkindById.get(placement.kindid)
+            if boxkind is not None:
                 placement.boundingBox  = boxkind.boundingBox
                 placement.orientations = boxkind.orientations
-                for field in self.boxkindFields:
-                    if hasattr(boxkind, field):
-                        setattr(placement, field, getattr(boxkind, field))
-                break
+                placement.kindfields   = self.GetKindfields(boxkind, self.boxkindFields)
         else:
             # TODO: test
             placement.type = "pallet"
             placement.kindid = None
-            for pallet in self.pallets:
-                if pallet.id == placement.palletid:
-                    placement.kindid       = pallet.kindid
-                    placement.loadingspace = pallet.loadingspace
-            for palletkind in self.threeDinstance.palletkinds:
-                if palletkind.id != placement.kindid:
-                    continue
+            pallet = self.palletById.get(placement.palletid)
+            if pallet is not None:
+                placement.kindid       = pallet.kindid
+                placement.loadingspace = pallet.loadingspace
+            palletkind = self.palletkindById.get(placement.kindid)
+            if palletkind is not None:
                 placement.orientations = palletkind.orientations
-                for field in self.palletkindFields:
-                    if hasattr(palletkind, field):
-                        setattr(placement, field, getattr(palletkind, field))
+                placement.kindfields   = self.GetKindfields(palletkind, self.palletkindFields)
                 pallet_min = list(palletkind.position)
                 pallet_max = list(map(sum,zip(pallet_min, palletkind.boundingBox)))
                 placements_min = list(map(min,zip(*map(lambda x: x.position,               palletkind.loadingspace.placements))))
@@ -301,72 +373,93 @@ class ThreeDsolution(object):
 
                 placement.position    = list(map(sum, zip(placement.position, min_coords)))
                 placement.boundingBox = list(map(sum, zip(placement.position, max_coords)))
-                break
         if placement.boundingBox is not None and placement.boundingBox != 'UNPLACED' and\
            placement.orientation is not None and placement.orientation != 'UNPLACED':
             l_index = placement.orientation.upper().find("L")
             w_index = placement.orientation.upper().find("W")
             h_index = placement.orientation.upper().find("H")
             permutation = [l_index, w_index, h_index]
-            placement.boundingBox = [placement.boundingBox[i] for i in permutation]
+            if placement.type == "pallet":
+                placement.boundingBox = [placement.boundingBox[i] for i in permutation]
+            else:
+                key = (placement.type, placement.itemid if placement.type == "item" else placement.kindid, placement.orientation)
+                boundingBox = self.boundingBoxes.get(key)
+                if boundingBox is None:
+                    boundingBox = self.boundingBoxes[key] = [placement.boundingBox[i] for i in permutation]
+                placement.boundingBox = boundingBox
             
     # Will attempt to 'decorate' the solution by adding instance fields to the solution object, such as bounding boxes, orientations, etc.
-    def DecorateSolution(self):
-        self.containerkindFields = set()
-        self.palletkindFields    = set()
-        self.boxkindFields       = set()
-        self.itemkindFields      = set()
-        self.loadingspaceFields  = set()
-        for r in BaseRequirement.OBJECTIVE_LIST + BaseRequirement.CONSTRAINT_LIST:
-            self.containerkindFields |= set([req.field for req in r.containerkindRequirements if isinstance(req, ExistenceRequirement)])
-            self.palletkindFields    |= set([req.field for req in r.palletkindRequirements    if isinstance(req, ExistenceRequirement)])
-            self.boxkindFields       |= set([req.field for req in r.boxkindRequirements       if isinstance(req, ExistenceRequirement)])
-            self.itemkindFields      |= set([req.field for req in r.itemkindRequirements      if isinstance(req, ExistenceRequirement)])
-            self.loadingspaceFields  |= set([req.field for req in r.loadingspaceRequirements  if isinstance(req, ExistenceRequirement)])
+    # The backend determines the NgoiMatrix used for the overlap and support checks: "python" or "numpy" (requires numpy)
+    # The overlap engine is either "ngoi", which reports the overlaps found by the NgoiMatrix, or "sweep", which uses an
+    # OverlapSweep that does not depend on the z-order of the placements
+    def DecorateSolution(self, backend="python", overlap="ngoi"):
+        with self.profile.Time("DecorateSolution"):
+            self._decorateSolution_(backend, overlap)
+        if self.profile:
+            self.profile.Count("placements", len(self.GetAllPlacements()))
+
+    def _decorateSolution_(self, backend, overlap):
+        if overlap not in ["ngoi", "sweep"]:
+            raise Exception("Unknown overlap engine: " + overlap)
+        self.overlapEngine  = overlap
+        self.backend        = backend
+        self.placementTable = None
+        if backend == "python":
+            self.ngoiMatrix = NgoiMatrix
+        elif backend == "numpy":
+            from common.NumpyNgoiMatrix import NumpyNgoiMatrix
+            self.ngoiMatrix = NumpyNgoiMatrix
+        else:
+            raise Exception("Unknown NgoiMatrix backend: " + backend)
+        self.containerkindFields = set(BaseRequirement.FieldTemplate("containerkind"))
+        self.palletkindFields    = set(BaseRequirement.FieldTemplate("palletkind"))
+        self.boxkindFields       = set(BaseRequirement.FieldTemplate("boxkind"))
+        self.itemkindFields      = set(BaseRequirement.FieldTemplate("itemkind"))
+        self.loadingspaceFields  = set(BaseRequirement.FieldTemplate("loadingspace"))
+        self.BuildIndexes()
+        # The aggregates are cached per solution, and decorating sets the weights and bounding boxes of the placements
+        self.aggregateScope = self.__dict__.get("aggregateScope") or AggregateScope()
+        self.aggregateScope.Invalidate()
         for container in self.containers:
-            for containerkind in self.threeDinstance.containerkinds:
-                if containerkind.id != container.kindid:
-                    continue
-                for loadingspace in container.loadingspaces:
-                    for ls_inst in containerkind.loadingspaces:
-                        if loadingspace.id != ls_inst.id:
-                            continue
-                        loadingspace.boundingBox = ls_inst.boundingBox
-                        loadingspace.position    = ls_inst.position
-                        for field in self.loadingspaceFields:
-                            setattr(loadingspace, field, getattr(ls_inst, field))
-                        break
-                    for placement in loadingspace.placements:
-                        self.DecoratePlacement(placement)
-                    self.DecorateLoadingspace(loadingspace)
-                for field in self.containerkindFields:
-                    setattr(container, field, getattr(containerkind, field))
-                break
+            self.aggregateScope.AddContainer(container)
+            containerkind = self.containerkindById.get(container.kindid)
+            if containerkind is None:
+                continue
+            for loadingspace in container.loadingspaces:
+                ls_inst = self.loadingspaceById.get((containerkind.id, loadingspace.id))
+                if ls_inst is not None:
+                    loadingspace.boundingBox = ls_inst.boundingBox
+                    loadingspace.position    = ls_inst.position
+                    for field in self.loadingspaceFields:
+                        setattr(loadingspace, field, getattr(ls_inst, field))
+                for placement in loadingspace.placements:
+                    self.DecoratePlacement(placement)
+                self.DecorateLoadingspace(loadingspace)
+            for field in self.containerkindFields:
+                setattr(container, field, getattr(containerkind, field))
         for pallet in self.pallets:
-            for palletkind in self.threeDinstance.palletkinds:
-                if palletkind.id != pallet.kindid:
-                    continue
+            self.aggregateScope.AddLoadingspace(pallet.loadingspace)
+            palletkind = self.palletkindById.get(pallet.kindid)
+            if palletkind is not None:
                 pallet.loadingspace.boundingBox = palletkind.loadingspace.boundingBox
                 pallet.loadingspace.position    = palletkind.loadingspace.position
                 for field in self.loadingspaceFields:
                     setattr(pallet.loadingspace, field, getattr(palletkind.loadingspace, field))
                 for field in self.palletkindFields:
                     setattr(pallet, field, getattr(palletkind, field))
-                break
             for placement in pallet.loadingspace.placements:
                 self.DecoratePlacement(placement)
             self.DecorateLoadingspace(pallet.loadingspace)
         for box in self.boxes:
-            for boxkind in self.threeDinstance.boxkinds:
-                if boxkind.id != box.kindid:
-                    continue
+            self.aggregateScope.AddLoadingspace(box.loadingspace)
+            boxkind = self.boxkindById.get(box.kindid)
+            if boxkind is not None:
                 box.loadingspace.boundingBox = boxkind.loadingspace.boundingBox
                 box.loadingspace.position    = boxkind.loadingspace.position
                 for field in self.loadingspaceFields:
                     setattr(box.loadingspace, field, getattr(boxkind.loadingspace, field))
                 for field in self.boxkindFields:
                     setattr(box, field, getattr(boxkind, field))
-                break
             for placement in box.loadingspace.placements:
                 self.DecoratePlacement(placement)
             self.DecorateLoadingspace(box.loadingspace)
@@ -396,19 +489,19 @@ class ThreeDsolution(object):
         for container in self.containers:
             for loadingspace in container.loadingspaces:
                 outside += loadingspace.ngoi.outside_report
-                overlap += loadingspace.ngoi.overlap_report
+                overlap += loadingspace.overlap.overlap_report
                 outside_valid = outside_valid and loadingspace.ngoi.outside_valid
-                overlap_valid = overlap_valid and loadingspace.ngoi.overlap_valid
+                overlap_valid = overlap_valid and loadingspace.overlap.overlap_valid
         for pallet in self.pallets:
             outside += pallet.loadingspace.ngoi.outside_report
-            overlap += pallet.loadingspace.ngoi.overlap_report
+            overlap += pallet.loadingspace.overlap.overlap_report
             outside_valid = outside_valid and pallet.loadingspace.ngoi.outside_valid
-            overlap_valid = overlap_valid and pallet.loadingspace.ngoi.overlap_valid
+            overlap_valid = overlap_valid and pallet.loadingspace.overlap.overlap_valid
         for box in self.boxes:
             outside += box.loadingspace.ngoi.outside_report
-            overlap += box.loadingspace.ngoi.overlap_report
+            overlap += box.loadingspace.overlap.overlap_report
             outside_valid = outside_valid and box.loadingspace.ngoi.outside_valid
-            overlap_valid = overlap_valid and box.loadingspace.ngoi.overlap_valid
+            overlap_valid = overlap_valid and box.loadingspace.overlap.overlap_valid
         warnings = ""
         if outside_valid:
             warnings = "All placements lie inside their loadingspace."
@@ -428,7 +521,8 @@ class ThreeDsolution(object):
         objective_values = {}
         for objective in self.threeDinstance.objectives:
             new_objective = {"name": objective.objective.name}
-            value = objective.objective.Evaluate(self)
+            with self.profile.Time("objective." + str(objective.objective.name)):
+                value = objective.objective.Evaluate(self)
             new_objective["value"] = value
             result["individual"].append(new_objective)
             weighted = objective.weight * value
@@ -447,14 +541,17 @@ class ThreeDsolution(object):
         self.sort()
         result = []
         orientation = {"name": "orientation"}
-        orientation["valid"], orientation["warnings"] = self.CheckAllowedOrientations()
+        with self.profile.Time("constraint.orientation"):
+            orientation["valid"], orientation["warnings"] = self.CheckAllowedOrientations()
         result.append(orientation)
         overlap = {"name": "overlap"}
-        overlap["valid"], overlap["warnings"] = self.CheckOverlapInside()
+        with self.profile.Time("constraint.overlap"):
+            overlap["valid"], overlap["warnings"] = self.CheckOverlapInside()
         result.append(overlap)
         for constraint in self.threeDinstance.constraints:
             new_constraint = {"name": constraint.constraint.name}
-            new_constraint["valid"], new_constraint["warnings"] = constraint.constraint.Validate(self)
+            with self.profile.Time("constraint." + str(constraint.constraint.name)):
+                new_constraint["valid"], new_constraint["warnings"] = constraint.constraint.Validate(self)
             result.append(new_constraint)
         return result
 
@@ -473,11 +570,30 @@ class ThreeDsolution(object):
     def GetResults(self):
         result = {}
         result["validity"] = {}
-        result["validity"]["value"], result["validity"]["warnings"] = self.IsValid()
+        with self.profile.Time("IsValid"):
+            result["validity"]["value"], result["validity"]["warnings"] = self.IsValid()
         if result["validity"]["value"]:
             result["constraints"] = self.ValidateConstraints()
             result["objectives"]  = self.EvaluateObjectives()
+        if self.profile:
+            result["profile"] = self.profile.GetResults()
         return result
+
+    # The columnar view of the placements of the (decorated) solution, which is rebuilt once the placements have changed
+    def GetPlacementTable(self):
+        if self.placementTable is None or self.placementTable.generation != self.aggregateScope.generation:
+            with self.profile.Time("PlacementTable"):
+                self.placementTable = PlacementTable(self, self.backend)
+        return self.placementTable
+
+    # Computes the weight aggregates of all containers at once from the placement table, unless they are all cached already
+    def AggregateContainers(self):
+        if any([(getattr(container, "aggregate", None) or (None,))[0] != self.aggregateScope.generation for container in self.containers]):
+            self.GetPlacementTable().StoreAggregates()
+
+    # Starts a session that validates the (decorated) solution incrementally, while placements are added, removed, and moved
+    def CreateValidationSession(self):
+        return ValidationSession(self)
     
 if __name__=="__main__":
     exit("Don't run this file")
\ No newline at end of file
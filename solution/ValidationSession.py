@@ -0,0 +1,427 @@
+from math import floor, ceil
+from common.utils import prod, mean
+
+# Geometric state of one loadingspace within a ValidationSession. The placements are hashed into a uniform grid over their
+# footprints, so a placement is only compared against the placements that share a grid cell with it. The extents are stored
+# per placement, as a moved placement has to be removed from the cells of its old position.
+class SessionLoadingspace(object):
+    def __init__(self, loadingspace, container, supported=True):
+        self.loadingspace = loadingspace
+        self.container    = container # the container the loadingspace belongs to, None for pallets and boxes
+        self.supported    = supported # whether the support constraint covers the loadingspace, as it does not for boxes
+        self.index        = {id(placement): n for n,placement in enumerate(loadingspace.placements)}
+        self.extents      = dict()
+        self.grid         = dict()
+        footprints = [placement.boundingBox for placement in loadingspace.placements if placement.boundingBox is not None]
+        if footprints:
+            self.cell = [max(mean([b[0] for b in footprints]), 1), max(mean([b[1] for b in footprints]), 1)]
+        else:
+            self.cell = [max(loadingspace.boundingBox[0]/4, 1), max(loadingspace.boundingBox[1]/4, 1)]
+
+    def Cells(self, extents):
+        x1, y1, _, x2, y2, _ = extents
+        i1, j1 = floor(x1/self.cell[0]), floor(y1/self.cell[1])
+        i2, j2 = max(ceil(x2/self.cell[0]), i1 + 1), max(ceil(y2/self.cell[1]), j1 + 1)
+        return [(i, j) for i in range(i1, i2) for j in range(j1, j2)]
+
+    # All other placements that share a grid cell with the given extents
+    def Neighbours(self, extents, exclude=None):
+        neighbours = dict()
+        for cell in self.Cells(extents):
+            neighbours.update(self.grid.get(cell, ()))
+        neighbours.pop(exclude, None)
+        return neighbours.values()
+
+    def Insert(self, placement):
+        x1, y1, z1 = placement.position
+        x2, y2, z2 = [coord+length for coord,length in zip(placement.position, placement.boundingBox)]
+        self.extents[id(placement)] = extents = (x1, y1, z1, x2, y2, z2)
+        for cell in self.Cells(extents):
+            self.grid.setdefault(cell, dict())[id(placement)] = placement
+        return extents
+
+    def Delete(self, placement):
+        extents = self.extents.pop(id(placement))
+        for cell in self.Cells(extents):
+            del self.grid[cell][id(placement)]
+            if not self.grid[cell]:
+                del self.grid[cell]
+        return extents
+
+    def AddPlacement(self, placement):
+        self.index[id(placement)] = len(self.loadingspace.placements)
+        self.loadingspace.addPlacement(placement)
+
+    # Swaps the placement with the last one of the loadingspace before removing it, so removal does not shift the list.
+    # The index is rebuilt when the placements were reordered outside of the session (e.g. sorted by a full validation).
+    def RemovePlacement(self, placement):
+        placements = self.loadingspace.placements
+        n = self.index.get(id(placement))
+        if n is None or n >= len(placements) or placements[n] is not placement:
+            self.index = {id(p): n for n,p in enumerate(placements)}
+        n = self.index.pop(id(placement))
+        last = placements.pop()
+        if last is not placement:
+            placements[n] = last
+            self.index[id(last)] = n
+
+# Validates a decorated solution incrementally, for use inside local search: placements are added, removed, and moved one
+# at a time, and the overlap, support, orientation, count, weight, and fill state is updated for the placements around the
+# change only. Constraints and objectives that only depend on the containers (axle weights, maximum weights, counts) are
+# evaluated on the weight aggregates kept by the session, all other custom ones fall back to a full evaluation.
+# Overlaps are found regardless of the z-order of the placements (as with the "sweep" overlap engine), and the support of a
+# placement is the area it shares with the tops of the placements directly underneath it, which equals the support found by
+# the NgoiMatrix as long as no placements overlap. Like the support constraint, the session only checks the support within
+# the loadingspaces of containers and pallets, not within boxes. The structure of the solution (ids, references) is not re-checked.
+class ValidationSession(object):
+    WEIGHT_RELATED = ["axle_weight", "maximum_weight"]
+
+    def __init__(self, threeDsolution):
+        if not hasattr(threeDsolution, "itemkindById"):
+            raise Exception("The solution should be decorated before starting a validation session")
+        self.solution = threeDsolution
+        constraints   = [constraint.constraint.name for constraint in threeDsolution.threeDinstance.constraints]
+        objectives    = [objective.objective.name for objective in threeDsolution.threeDinstance.objectives]
+        self.weighted = any([name in self.WEIGHT_RELATED for name in constraints + objectives])
+        self.spaces   = dict() # id(loadingspace) -> SessionLoadingspace
+        self.spaceOf  = dict() # id(placement) -> SessionLoadingspace
+        self.holders  = dict() # id(loadingspace of a pallet or box) -> the placement of that pallet or box
+        self.overlaps    = dict() # id(placement) -> ids of the placements it overlaps with
+        self.outside     = dict()
+        self.unsupported = dict()
+        self.support     = dict()
+        self.misoriented = dict()
+        self.placed      = dict()
+        self.placedItems = 0
+        self.itemCounts  = dict()
+        self.countErrors = set()
+        self.mustPlace   = dict()
+        self.containerState = dict() # id(container) -> [weight, moment, fill volume, volume]
+        for container in threeDsolution.containers:
+            weight, moment = container.GetAggregate() if self.weighted else (0, [0,0,0])
+            volume = sum([prod(loadingspace.boundingBox) for loadingspace in container.loadingspaces])
+            self.containerState[id(container)] = [weight, list(moment), 0, volume]
+            for loadingspace in container.loadingspaces:
+                self.spaces[id(loadingspace)] = SessionLoadingspace(loadingspace, container)
+        for pallet in threeDsolution.pallets:
+            self.spaces[id(pallet.loadingspace)] = SessionLoadingspace(pallet.loadingspace, None)
+        for box in threeDsolution.boxes:
+            self.spaces[id(box.loadingspace)] = SessionLoadingspace(box.loadingspace, None, False)
+        for space in self.spaces.values():
+            for placement in space.loadingspace.placements:
+                self._insert_(space, placement)
+                if space.container is not None and placement.boundingBox is not None:
+                    self.containerState[id(space.container)][2] += prod(placement.boundingBox)
+        for unplaced in threeDsolution.unplaced:
+            self._countUnplaced_(unplaced, 1)
+
+    @staticmethod
+    def _name_(placement):
+        return placement.TypeString() + " with id " + str(placement.id)
+
+    # The container a loadingspace is (indirectly) loaded in, and the position of the loadingspace in that container,
+    # or None if the loadingspace belongs to a pallet or box that is not placed
+    def _origin_(self, space):
+        offset = list(space.loadingspace.position)
+        while space.container is None:
+            holder = self.holders.get(id(space.loadingspace))
+            if holder is None or id(holder) not in self.spaceOf:
+                return None
+            space  = self.spaceOf[id(holder)]
+            offset = [o + x + l for o,x,l in zip(offset, holder.position, space.loadingspace.position)]
+        return space.container, offset
+
+    # The weight and first moments (in container coordinates) that a placement contributes to its container
+    def _contribution_(self, placement):
+        if not self.weighted or placement.position == placement.UNPLACED:
+            return None
+        origin = self._origin_(self.spaceOf[id(placement)])
+        if origin is None:
+            return None
+        container, offset = origin
+        weight, moment = placement.GetAggregate()
+        return container, weight, [m + weight*o for m,o in zip(moment, offset)]
+
+    def _applyContribution_(self, contribution, sign):
+        if contribution is not None:
+            container, weight, moment = contribution
+            state = self.containerState[id(container)]
+            state[0] += sign*weight
+            state[1]  = [m + sign*c for m,c in zip(state[1], moment)]
+
+    def _countItem_(self, itemid, quantity):
+        self.itemCounts[itemid] = self.itemCounts.get(itemid, 0) + quantity
+        itemkind = self.solution.itemkindById.get(itemid)
+        if itemkind is None or self.itemCounts[itemid] != itemkind.quantity:
+            self.countErrors.add(itemid)
+        else:
+            self.countErrors.discard(itemid)
+
+    def _countUnplaced_(self, unplaced, sign):
+        if unplaced.itemid is not None:
+            self._countItem_(unplaced.itemid, sign*unplaced.quantity)
+        if sign > 0 and getattr(unplaced, "place", False):
+            self.mustPlace[id(unplaced)] = unplaced
+        else:
+            self.mustPlace.pop(id(unplaced), None)
+
+    def _setSupport_(self, space, placement):
+        self.support.pop(id(placement), None)
+        self.unsupported.pop(id(placement), None)
+        x1, y1, z1, x2, y2, _ = space.extents[id(placement)]
+        total_area = (x2 - x1)*(y2 - y1)
+        if total_area == 0:
+            return
+        L, W, _ = space.loadingspace.boundingBox
+        if z1 == 0:
+            supported_area = max(min(x2, L) - max(x1, 0), 0)*max(min(y2, W) - max(y1, 0), 0)
+        else:
+            supported_area = 0
+            for other in space.Neighbours(space.extents[id(placement)], id(placement)):
+                ox1, oy1, _, ox2, oy2, oz2 = space.extents[id(other)]
+                if other.support is not None and oz2 == z1:
+                    supported_area += max(min(x2, ox2, L) - max(x1, ox1, 0), 0)*max(min(y2, oy2, W) - max(y1, oy1, 0), 0)
+        self.support[id(placement)] = supported_area/total_area
+        if supported_area < placement.support*total_area:
+            self.unsupported[id(placement)] = placement
+
+    # Recomputes the support of the placements that rest on the given height within the given extents
+    def _updateSupported_(self, space, extents, exclude):
+        for other in space.Neighbours(extents, exclude):
+            x1, y1, z1, x2, y2, _ = space.extents[id(other)]
+            if other.support is not None and z1 == extents[5] and x1 < extents[3] and extents[0] < x2 and y1 < extents[4] and extents[1] < y2:
+                self._setSupport_(space, other)
+
+    def _insert_(self, space, placement):
+        self.spaceOf[id(placement)] = space
+        self.placed[id(placement)]  = placement
+        if placement.itemid is not None:
+            self._countItem_(placement.itemid, 1)
+            if placement.position != placement.UNPLACED:
+                self.placedItems += 1
+        if placement.palletid is not None or placement.boxid is not None:
+            if hasattr(placement, "loadingspace"):
+                self.holders[id(placement.loadingspace)] = placement
+        if space.container is not None and placement.orientations is not None and placement.orientation not in placement.orientations:
+            self.misoriented[id(placement)] = placement
+        if placement.boundingBox is None or placement.position == placement.UNPLACED:
+            return
+        if not hasattr(placement, "support"):
+            placement.support = None
+        extents = space.Insert(placement)
+        x1, y1, z1, x2, y2, z2 = extents
+        if x1 < x2 and y1 < y2 and z1 < z2:
+            for other in space.Neighbours(extents, id(placement)):
+                ox1, oy1, oz1, ox2, oy2, oz2 = space.extents[id(other)]
+                if ox1 < ox2 and oy1 < oy2 and oz1 < oz2 and ox1 < x2 and x1 < ox2 and oy1 < y2 and y1 < oy2 and oz1 < z2 and z1 < oz2:
+                    self.overlaps.setdefault(id(placement), set()).add(id(other))
+                    self.overlaps.setdefault(id(other), set()).add(id(placement))
+        if placement.support is not None:
+            L, W, H = space.loadingspace.boundingBox
+            if min(extents) < 0 or x1 > L or x2 > L or y1 > W or y2 > W or z1 > H or z2 > H:
+                self.outside[id(placement)] = placement
+            if space.supported:
+                self._setSupport_(space, placement)
+                self._updateSupported_(space, extents, id(placement))
+
+    def _delete_(self, space, placement):
+        del self.spaceOf[id(placement)]
+        del self.placed[id(placement)]
+        if placement.itemid is not None:
+            self._countItem_(placement.itemid, -1)
+            if placement.position != placement.UNPLACED:
+                self.placedItems -= 1
+        if placement.palletid is not None or placement.boxid is not None:
+            if hasattr(placement, "loadingspace") and self.holders.get(id(placement.loadingspace)) is placement:
+                del self.holders[id(placement.loadingspace)]
+        self.misoriented.pop(id(placement), None)
+        if id(placement) not in space.extents:
+            return
+        extents = space.Delete(placement)
+        for other in self.overlaps.pop(id(placement), ()):
+            self.overlaps[other].discard(id(placement))
+            if not self.overlaps[other]:
+                del self.overlaps[other]
+        self.outside.pop(id(placement), None)
+        self.support.pop(id(placement), None)
+        self.unsupported.pop(id(placement), None)
+        if placement.support is not None and space.supported:
+            self._updateSupported_(space, extents, None)
+
+    def _volume_(self, space, placement, sign):
+        if space.container is not None and placement.boundingBox is not None:
+            self.containerState[id(space.container)][2] += sign*prod(placement.boundingBox)
+
+    # Adds a new placement to a loadingspace (of a container, pallet, or box) of the solution
+    def Add(self, placement, loadingspace):
+        space = self.spaces.get(id(loadingspace))
+        if space is None:
+            raise Exception("Loadingspace with id " + str(loadingspace.id) + " is not part of the solution")
+        if id(placement) in self.spaceOf:
+            raise Exception(self._name_(placement).capitalize() + " is already placed")
+        self.solution.DecoratePlacement(placement)
+        space.AddPlacement(placement)
+        self._insert_(space, placement)
+        self._volume_(space, placement, 1)
+        self._applyContribution_(self._contribution_(placement), 1)
+
+    # Removes a placement from its loadingspace
+    def Remove(self, placement):
+        space = self.spaceOf.get(id(placement))
+        if space is None:
+            raise Exception(self._name_(placement).capitalize() + " is not placed")
+        self._applyContribution_(self._contribution_(placement), -1)
+        self._volume_(space, placement, -1)
+        self._delete_(space, placement)
+        space.RemovePlacement(placement)
+        self.solution.InvalidateAggregates()
+
+    # Moves a placement within its loadingspace, and optionally rotates it (items and boxes only)
+    def Move(self, placement, position, orientation=None):
+        space = self.spaceOf.get(id(placement))
+        if space is None:
+            raise Exception(self._name_(placement).capitalize() + " is not placed")
+        if orientation is not None and orientation != placement.orientation and placement.itemid is None and placement.boxid is None:
+            raise Exception("Only items and boxes can be rotated in a validation session")
+        self._applyContribution_(self._contribution_(placement), -1)
+        self._volume_(space, placement, -1)
+        self._delete_(space, placement)
+        placement.position = list(position)
+        if orientation is not None and orientation != placement.orientation:
+            placement.orientation = orientation
+            self.solution.DecoratePlacement(placement)
+        self._insert_(space, placement)
+        self._volume_(space, placement, 1)
+        self._applyContribution_(self._contribution_(placement), 1)
+
+    def AddUnplaced(self, unplaced):
+        self.solution.DecoratePlacement(unplaced)
+        self.solution.addUnplaced(unplaced)
+        self._countUnplaced_(unplaced, 1)
+
+    def RemoveUnplaced(self, unplaced):
+        self.solution.unplaced.remove(unplaced)
+        self._countUnplaced_(unplaced, -1)
+
+    # Stores the aggregates kept by the session in the containers, so the container-level constraints and objectives use them
+    def _syncContainers_(self):
+        for container in self.solution.containers:
+            state = self.containerState[id(container)]
+            container.aggregate = (self.solution.aggregateScope.generation, state[0], list(state[1]))
+
+    def FillRates(self):
+        return [self.containerState[id(container)][2]/self.containerState[id(container)][3] for container in self.solution.containers]
+
+    def CheckCounts(self):
+        warnings = [""]
+        for itemid in sorted(self.countErrors):
+            itemkind = self.solution.itemkindById.get(itemid)
+            if itemkind is None:
+                warnings.append("Item of kind " + str(itemid) + " not present in instance file <- VIOLATION")
+            else:
+                warnings.append("Item of kind " + str(itemid) + ": " + str(self.itemCounts[itemid]) + "/" + str(itemkind.quantity) + " <- VIOLATION")
+        if len(warnings) == 1:
+            return True, "All item counts were within bounds."
+        return False, "Not all item counts were within bounds:" + "\n\t- ".join(warnings)
+
+    def CheckAllowedOrientations(self):
+        warnings = [""]
+        for placement in sorted(self.misoriented.values(), key=lambda x: [x.type, x.id]):
+            warnings.append(placement.type.capitalize() + " with id " + str(placement.id) + " has orientation " + placement.orientation + " not in " + str(placement.orientations) + " <- VIOLATION")
+        if len(warnings) == 1:
+            return True, "All placements had valid orientations."
+        return False, "Not all placements had valid orientations:" + "\n\t- ".join(warnings)
+
+    def CheckOverlapInside(self):
+        outside = [""] + sorted([self._name_(placement).capitalize() + " lies outside its loadingspace <- VIOLATION" for placement in self.outside.values()])
+        overlap = [""]
+        for placement_id, others in self.overlaps.items():
+            for other_id in others:
+                if placement_id < other_id:
+                    names = tuple(sorted([self._name_(self.placed[placement_id]), self._name_(self.placed[other_id])]))
+                    overlap.append(names[0].capitalize() + " overlaps with " + names[1] + " <- VIOLATION")
+        overlap = [""] + sorted(overlap[1:])
+        if len(outside) == 1:
+            warnings = "All placements lie inside their loadingspace."
+        else:
+            warnings = "Not all placements lie inside their loadingspace:" + "\n\t- ".join(outside)
+        warnings += "\n"
+        if len(overlap) == 1:
+            warnings += "No overlapping placements."
+        else:
+            warnings += "Some placements overlap:" + "\n\t- ".join(overlap)
+        return len(outside) == 1 and len(overlap) == 1, warnings
+
+    def CheckSupport(self):
+        warnings = [""]
+        for key, placement in self.unsupported.items():
+            warnings.append(self._name_(placement).capitalize() + " is supported by " + str(self.support[key]) + " of required " + str(placement.support) + " <- VIOLATION")
+        if len(warnings) == 1:
+            return True, "All items are properly supported."
+        return False, "Not all items are properly supported:" + "\n\t- ".join(sorted(warnings))
+
+    def CheckMustPlace(self):
+        if not self.mustPlace:
+            return True, "All necessary placements were placed."
+        warnings = [""] + sorted([placement.type.capitalize() + " with id " + str(placement.id) + " should be placed <- VIOLATION" for placement in self.mustPlace.values()])
+        return False, "Not all necessary placements were placed:" + "\n\t- ".join(warnings)
+
+    # Same as ThreeDsolution.ValidateConstraints, only the violations are reported for the constraints checked by the session
+    def ValidateConstraints(self):
+        self._syncContainers_()
+        checks = {"support": self.CheckSupport, "must_place": self.CheckMustPlace}
+        result = []
+        orientation = {"name": "orientation"}
+        orientation["valid"], orientation["warnings"] = self.CheckAllowedOrientations()
+        result.append(orientation)
+        overlap = {"name": "overlap"}
+        overlap["valid"], overlap["warnings"] = self.CheckOverlapInside()
+        result.append(overlap)
+        for constraint in self.solution.threeDinstance.constraints:
+            new_constraint = {"name": constraint.constraint.name}
+            if constraint.constraint.name in checks:
+                new_constraint["valid"], new_constraint["warnings"] = checks[constraint.constraint.name]()
+            else:
+                new_constraint["valid"], new_constraint["warnings"] = constraint.constraint.Validate(self.solution)
+            result.append(new_constraint)
+        return result
+
+    # Same as ThreeDsolution.EvaluateObjectives
+    def EvaluateObjectives(self):
+        self._syncContainers_()
+        evaluations = {"item_count":        lambda: -self.placedItems,
+                       "average_fill_rate": lambda: -mean(self.FillRates()),
+                       "worst_fill_rate":   lambda: -min(self.FillRates())}
+        result = {"individual": []}
+        objective_values = {}
+        for objective in self.solution.threeDinstance.objectives:
+            new_objective = {"name": objective.objective.name}
+            if objective.objective.name in evaluations:
+                value = evaluations[objective.objective.name]()
+            else:
+                value = objective.objective.Evaluate(self.solution)
+            new_objective["value"] = value
+            result["individual"].append(new_objective)
+            weighted = objective.weight * value
+            if objective.priority in objective_values:
+                objective_values[objective.priority] += weighted
+            else:
+                objective_values[objective.priority] = weighted
+        lexicographic = list()
+        for _,v in sorted(objective_values.items()):
+            lexicographic.append(v)
+        result["total"] = lexicographic
+        return result
+
+    # Same as ThreeDsolution.GetResults, where the validity only covers the item counts
+    def GetResults(self):
+        result = {}
+        result["validity"] = {}
+        result["validity"]["value"], result["validity"]["warnings"] = self.CheckCounts()
+        if result["validity"]["value"]:
+            result["constraints"] = self.ValidateConstraints()
+            result["objectives"]  = self.EvaluateObjectives()
+        return result
+
+if __name__=="__main__":
+    exit("Don't run this file")
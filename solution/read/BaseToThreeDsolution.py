@@ -26,10 +26,11 @@ class BaseToThreeDsolution(object):
     def safeGetText(container, propertyname, cast):
         raise Exception("Derived classes of BaseToThreeDinstance need to override the safeGetText-method")
 
-    def __init__(self, filename="", text=""):
+    # An already parsed document can be passed as root, so that one parse serves both the instance and the solution reader
+    def __init__(self, filename="", text="", root=None):
         self.filename    = filename
         self.text        = text
-        self.base        = self.safeFindRoot(self.filename, self.text)
+        self.base        = self.safeFindRoot(self.filename, self.text) if root is None else root
         self.description = self.safeFindOne(self.base,   'description')
         self.layout      = self.safeFindOne(self.base,   'layout')
         self.containers  = self.safeFindOne(self.layout, 'containers')
@@ -41,6 +42,37 @@ class BaseToThreeDsolution(object):
         threeDsolution.description.setname = self.safeGetText(self.description, 'set',  str)
         threeDsolution.description.name    = self.safeGetText(self.description, 'name', str)
         
+    def _createPlacement_(self,basePlacement):
+        solPlacement             = ThreeDplacement()
+        solPlacement.id          = self.safeGetAttr(basePlacement, 'id',          int)
+        solPlacement.itemid      = self.safeGetAttr(basePlacement, 'itemid',      int)
+        solPlacement.boxid       = self.safeGetAttr(basePlacement, 'boxid',       int)
+        solPlacement.palletid    = self.safeGetAttr(basePlacement, 'palletid',    int)
+        solPlacement.position    = self.safeGetText(basePlacement, 'position',    str)
+        solPlacement.orientation = self.safeGetText(basePlacement, 'orientation', str)
+        solPlacement.color       = self.safeGetAttr(basePlacement, 'color',       str)
+        if solPlacement.position is not None and isinstance(solPlacement.position, str):
+            try:
+                solPlacement.position = solPlacement.position.split(',')
+                solPlacement.position = list(map(int, solPlacement.position))
+            except Exception:
+                pass
+        return solPlacement
+
+    def _createUnplaced_(self,baseUnplaced):
+        solUnplaced             = ThreeDplacement()
+        solUnplaced.id          = self.safeGetAttr(baseUnplaced, 'id',       int)
+        solUnplaced.itemid      = self.safeGetAttr(baseUnplaced, 'itemid',   int)
+        solUnplaced.boxid       = self.safeGetAttr(baseUnplaced, 'boxid',    int)
+        solUnplaced.palletid    = self.safeGetAttr(baseUnplaced, 'palletid', int)
+        solUnplaced.type        = self.safeGetAttr(baseUnplaced, 'type',     str)
+        solUnplaced.quantity    = self.safeGetAttr(baseUnplaced, 'quantity', int)
+        if solUnplaced.quantity is None:
+            solUnplaced.quantity = 1
+        solUnplaced.position    = solUnplaced.UNPLACED
+        solUnplaced.orientation = solUnplaced.UNPLACED
+        return solUnplaced
+
     def _fillContainers_(self,threeDsolution):
         for baseContainer in self.safeFindAll(self.containers, 'container'):
             solContainer        = ThreeDcontainer()
@@ -52,20 +84,7 @@ class BaseToThreeDsolution(object):
                 solLoadingspace.id = self.safeGetAttr(baseLoadingspace, 'id', int)
                 placements = self.safeFindOne(baseLoadingspace, 'placements')
                 for basePlacement in self.safeFindAll(placements, 'placement'):
-                    solPlacement             = ThreeDplacement()
-                    solPlacement.id          = self.safeGetAttr(basePlacement, 'id',          int)
-                    solPlacement.itemid      = self.safeGetAttr(basePlacement, 'itemid',      int)
-                    solPlacement.boxid       = self.safeGetAttr(basePlacement, 'boxid',       int)
-                    solPlacement.palletid    = self.safeGetAttr(basePlacement, 'palletid',    int)
-                    solPlacement.position    = self.safeGetText(basePlacement, 'position',    str)
-                    solPlacement.orientation = self.safeGetText(basePlacement, 'orientation', str)
-                    solPlacement.color       = self.safeGetAttr(basePlacement, 'color',       str)
-                    if solPlacement.position is not None and isinstance(solPlacement.position, str):
-                        try:
-                            solPlacement.position = solPlacement.position.split(',')
-                            solPlacement.position = list(map(int, solPlacement.position))
-                        except Exception:
-                            pass
+                    solPlacement = self._createPlacement_(basePlacement)
                     solLoadingspace.addPlacement(solPlacement)
                 solContainer.addLoadingspace(solLoadingspace)
             threeDsolution.addContainer(solContainer)
@@ -80,20 +99,7 @@ class BaseToThreeDsolution(object):
             solPallet.loadingspace.id = self.safeGetAttr(baseLoadingspace, 'id', int)
             placements = self.safeFindOne(baseLoadingspace, 'placements')
             for basePlacement in self.safeFindAll(placements, 'placement'):
-                solPlacement             = ThreeDplacement()
-                solPlacement.id          = self.safeGetAttr(basePlacement, 'id',          int)
-                solPlacement.itemid      = self.safeGetAttr(basePlacement, 'itemid',      int)
-                solPlacement.boxid       = self.safeGetAttr(basePlacement, 'boxid',       int)
-                solPlacement.palletid    = self.safeGetAttr(basePlacement, 'palletid',    int)
-                solPlacement.position    = self.safeGetText(basePlacement, 'position',    str)
-                solPlacement.orientation = self.safeGetText(basePlacement, 'orientation', str)
-                solPlacement.color       = self.safeGetAttr(basePlacement, 'color',       str)
-                if solPlacement.position is not None and isinstance(solPlacement.position, str):
-                    try:
-                        solPlacement.position = solPlacement.position.split(',')
-                        solPlacement.position = list(map(int, solPlacement.position))
-                    except Exception:
-                        pass
+                solPlacement = self._createPlacement_(basePlacement)
                 solPallet.loadingspace.addPlacement(solPlacement)
             threeDsolution.addPallet(solPallet)
     
@@ -107,37 +113,13 @@ class BaseToThreeDsolution(object):
             solBox.loadingspace.id = self.safeGetAttr(baseLoadingspace, 'id', int)
             placements = self.safeFindOne(baseLoadingspace, 'placements')
             for basePlacement in self.safeFindAll(placements, 'placement'):
-                solPlacement             = ThreeDplacement()
-                solPlacement.id          = self.safeGetAttr(basePlacement, 'id',          int)
-                solPlacement.itemid      = self.safeGetAttr(basePlacement, 'itemid',      int)
-                solPlacement.boxid       = self.safeGetAttr(basePlacement, 'boxid',       int)
-                solPlacement.palletid    = self.safeGetAttr(basePlacement, 'palletid',    int)
-                solPlacement.position    = self.safeGetText(basePlacement, 'position',    str)
-                solPlacement.orientation = self.safeGetText(basePlacement, 'orientation', str)
-                solPlacement.color       = self.safeGetAttr(basePlacement, 'color',       str)
-                if solPlacement.position is not None and isinstance(solPlacement.position, str):
-                    try:
-                        solPlacement.position = solPlacement.position.split(',')
-                        solPlacement.position = list(map(int, solPlacement.position))
-                    except Exception:
-                        pass
+                solPlacement = self._createPlacement_(basePlacement)
                 solBox.loadingspace.addPlacement(solPlacement)
             threeDsolution.addBox(solBox)
     
     def _fillUnplaced_(self,threeDsolution):
         for baseUnplaced in self.safeFindAll(self.unplaced, 'placement'):
-            solUnplaced             = ThreeDplacement()
-            solUnplaced.id          = self.safeGetAttr(baseUnplaced, 'id',       int)
-            solUnplaced.itemid      = self.safeGetAttr(baseUnplaced, 'itemid',   int)
-            solUnplaced.boxid       = self.safeGetAttr(baseUnplaced, 'boxid',    int)
-            solUnplaced.palletid    = self.safeGetAttr(baseUnplaced, 'palletid', int)
-            solUnplaced.type        = self.safeGetAttr(baseUnplaced, 'type',     str)
-            solUnplaced.quantity    = self.safeGetAttr(baseUnplaced, 'quantity', int)
-            if solUnplaced.quantity is None:
-                solUnplaced.quantity = 1
-            solUnplaced.position    = solUnplaced.UNPLACED
-            solUnplaced.orientation = solUnplaced.UNPLACED
-            threeDsolution.unplaced.append(solUnplaced)
+            threeDsolution.unplaced.append(self._createUnplaced_(baseUnplaced))
     
     def CreateThreeDsolution(self, threeDinstance):
         threeDsolution = ThreeDsolution(threeDinstance)
@@ -0,0 +1,105 @@
+import json
+import mmap
+from common.BinaryFormat import MAGIC, VERSION, HEADER, RECORD, TYPES
+from solution.ThreeDsolution     import ThreeDsolution
+from solution.ThreeDcontainer    import ThreeDcontainer
+from solution.ThreeDpallet       import ThreeDpallet
+from solution.ThreeDbox          import ThreeDbox
+from solution.ThreeDplacement    import ThreeDplacement
+from solution.ThreeDloadingspace import ThreeDloadingspace
+
+# Reads the binary solution format of common.BinaryFormat. The file is memory-mapped and the placement records are unpacked
+# straight from the mapping, only the small JSON document in the header is parsed. Binary files do not contain an instance.
+class BinarytoThreeDsolution(object):
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            try:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise Exception("Empty binary solution file: " + filename)
+        if len(self.map) < HEADER.size:
+            raise Exception("Not a binary solution file: " + filename)
+        magic, version, length, self.count, self.offset = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise Exception("Not a binary solution file: " + filename)
+        if version != VERSION:
+            raise Exception("Unsupported version " + str(version) + " of binary solution file: " + filename)
+        if len(self.map) < self.offset + self.count*RECORD.size:
+            raise Exception("Truncated binary solution file: " + filename)
+        self.view    = memoryview(self.map)
+        self.base    = json.loads(bytes(self.view[HEADER.size:HEADER.size + length]).decode("utf-8"))
+        self.strings = self.base.get("strings", [])
+
+    # Releases the mapping of the file, after which no records can be read
+    def Close(self):
+        self.view.release()
+        self.map.close()
+
+    # The raw records with indices [first, first + count), unpacked lazily from the mapping
+    def Records(self, first=0, count=None):
+        if count is None:
+            count = self.count - first
+        if first < 0 or count < 0 or first + count > self.count:
+            raise Exception("Records " + str(first) + " to " + str(first + count) + " are not in the file")
+        start = self.offset + first*RECORD.size
+        return RECORD.iter_unpack(self.view[start:start + count*RECORD.size])
+
+    def _createPlacement_(self, record):
+        placementid, refid, x, y, z, color, orientation, kind = record
+        solPlacement             = ThreeDplacement()
+        solPlacement.id          = placementid
+        setattr(solPlacement, TYPES[kind] + "id", refid)
+        solPlacement.position    = [x, y, z]
+        solPlacement.orientation = self.strings[orientation] if orientation >= 0 else None
+        solPlacement.color       = self.strings[color]       if color >= 0       else None
+        return solPlacement
+
+    def _createLoadingspace_(self, baseLoadingspace):
+        solLoadingspace = ThreeDloadingspace()
+        solLoadingspace.id = baseLoadingspace["id"]
+        solLoadingspace.placements = [self._createPlacement_(record) for record in self.Records(*baseLoadingspace["placements"])]
+        return solLoadingspace
+
+    def _createUnplaced_(self, baseUnplaced):
+        solUnplaced             = ThreeDplacement()
+        solUnplaced.id          = baseUnplaced.get("id")
+        solUnplaced.itemid      = baseUnplaced.get("itemid")
+        solUnplaced.boxid       = baseUnplaced.get("boxid")
+        solUnplaced.palletid    = baseUnplaced.get("palletid")
+        solUnplaced.quantity    = baseUnplaced.get("quantity")
+        if solUnplaced.quantity is None:
+            solUnplaced.quantity = 1
+        solUnplaced.position    = solUnplaced.UNPLACED
+        solUnplaced.orientation = solUnplaced.UNPLACED
+        return solUnplaced
+
+    def CreateThreeDsolution(self, threeDinstance):
+        threeDsolution = ThreeDsolution(threeDinstance)
+        threeDsolution.description.setname = self.base["description"].get("set")
+        threeDsolution.description.name    = self.base["description"].get("name")
+        for baseBox in self.base.get("boxes", []):
+            solBox              = ThreeDbox()
+            solBox.id           = baseBox["id"]
+            solBox.kindid       = baseBox["kindid"]
+            solBox.loadingspace = self._createLoadingspace_(baseBox["loadingspace"])
+            threeDsolution.addBox(solBox)
+        for basePallet in self.base.get("pallets", []):
+            solPallet              = ThreeDpallet()
+            solPallet.id           = basePallet["id"]
+            solPallet.kindid       = basePallet["kindid"]
+            solPallet.loadingspace = self._createLoadingspace_(basePallet["loadingspace"])
+            threeDsolution.addPallet(solPallet)
+        for baseContainer in self.base.get("containers", []):
+            solContainer        = ThreeDcontainer()
+            solContainer.id     = baseContainer["id"]
+            solContainer.kindid = baseContainer["kindid"]
+            for baseLoadingspace in baseContainer["loadingspaces"]:
+                solContainer.addLoadingspace(self._createLoadingspace_(baseLoadingspace))
+            threeDsolution.addContainer(solContainer)
+        for baseUnplaced in self.base.get("unplaced", []):
+            threeDsolution.unplaced.append(self._createUnplaced_(baseUnplaced))
+        return threeDsolution
+
+if __name__=="__main__":
+    exit("Don't run this file")
@@ -1,5 +1,12 @@
 
 from solution.read.BaseToThreeDsolution import BaseToThreeDsolution
+from solution.ThreeDsolution     import ThreeDsolution
+from solution.ThreeDcontainer    import ThreeDcontainer
+from solution.ThreeDpallet       import ThreeDpallet
+from solution.ThreeDbox          import ThreeDbox
+from solution.ThreeDplacement    import ThreeDplacement
+from solution.ThreeDloadingspace import ThreeDloadingspace
+from common.FastJSON import MalformedJSON, CASTS, GetField, GetOne, GetAll, GetPosition
 import json
 
 class JSONtoThreeDsolution(BaseToThreeDsolution):
@@ -47,8 +54,89 @@ class JSONtoThreeDsolution(BaseToThreeDsolution):
             except:
                 return None
         
-    def __init__(self, filename="", text=""):
-        super(JSONtoThreeDsolution, self).__init__(filename, text)
-        
+    def __init__(self, filename="", text="", root=None):
+        super(JSONtoThreeDsolution, self).__init__(filename, text, root)
+        self.fastPath = None # whether the last solution was created by the fast path
+
+    # Maps the document straight onto the solution (see common.FastJSON), the tolerant path only reads malformed documents
+    def CreateThreeDsolution(self, threeDinstance):
+        try:
+            threeDsolution = self._fastCreateThreeDsolution_(threeDinstance)
+            self.fastPath  = True
+        except MalformedJSON:
+            threeDsolution = super(JSONtoThreeDsolution, self).CreateThreeDsolution(threeDinstance)
+            self.fastPath  = False
+        return threeDsolution
+
+    # The cast table of every field of a placement, only the fields that are present are read (the others stay None)
+    PLACEMENT_FIELDS = {'id': CASTS[int], 'itemid': CASTS[int], 'boxid': CASTS[int], 'palletid': CASTS[int], 'orientation': CASTS[str], 'color': CASTS[str]}
+
+    @staticmethod
+    def _fastPlacement_(json):
+        solPlacement = ThreeDplacement()
+        for tag, value in json.items():
+            casts = JSONtoThreeDsolution.PLACEMENT_FIELDS.get(tag)
+            if casts is not None and value is not None:
+                try:
+                    setattr(solPlacement, tag, casts[type(value)](value))
+                except (KeyError, ValueError, TypeError, OverflowError):
+                    raise MalformedJSON(tag)
+        solPlacement.position = GetPosition(json, 'position')
+        return solPlacement
+
+    # The placements are set at once, the aggregates are invalidated when the whole solution is read
+    @staticmethod
+    def _fastLoadingspace_(json):
+        solLoadingspace            = ThreeDloadingspace()
+        solLoadingspace.id         = GetField(json, 'id', CASTS[int])
+        solLoadingspace.placements = [JSONtoThreeDsolution._fastPlacement_(basePlacement) for basePlacement in GetAll(json, 'placements')]
+        return solLoadingspace
+
+    @staticmethod
+    def _fastUnplaced_(json):
+        solUnplaced             = ThreeDplacement()
+        solUnplaced.id          = GetField(json, 'id',       CASTS[int])
+        solUnplaced.itemid      = GetField(json, 'itemid',   CASTS[int])
+        solUnplaced.boxid       = GetField(json, 'boxid',    CASTS[int])
+        solUnplaced.palletid    = GetField(json, 'palletid', CASTS[int])
+        solUnplaced.type        = GetField(json, 'type',     CASTS[str])
+        solUnplaced.quantity    = GetField(json, 'quantity', CASTS[int])
+        if solUnplaced.quantity is None:
+            solUnplaced.quantity = 1
+        solUnplaced.position    = solUnplaced.UNPLACED
+        solUnplaced.orientation = solUnplaced.UNPLACED
+        return solUnplaced
+
+    def _fastCreateThreeDsolution_(self, threeDinstance):
+        if type(self.base) is not dict:
+            raise MalformedJSON('root')
+        threeDsolution = ThreeDsolution(threeDinstance)
+        description = GetOne(self.base, 'description')
+        threeDsolution.description.setname = GetField(description, 'set',  CASTS[str])
+        threeDsolution.description.name    = GetField(description, 'name', CASTS[str])
+        layout = GetOne(self.base, 'layout')
+        for baseBox in GetAll(layout, 'boxes'):
+            solBox              = ThreeDbox()
+            solBox.id           = GetField(baseBox, 'id',     CASTS[int])
+            solBox.kindid       = GetField(baseBox, 'kindid', CASTS[int])
+            solBox.loadingspace = self._fastLoadingspace_(GetOne(baseBox, 'loadingspace'))
+            threeDsolution.addBox(solBox)
+        for basePallet in GetAll(layout, 'pallets'):
+            solPallet              = ThreeDpallet()
+            solPallet.id           = GetField(basePallet, 'id',     CASTS[int])
+            solPallet.kindid       = GetField(basePallet, 'kindid', CASTS[int])
+            solPallet.loadingspace = self._fastLoadingspace_(GetOne(basePallet, 'loadingspace'))
+            threeDsolution.addPallet(solPallet)
+        for baseContainer in GetAll(layout, 'containers'):
+            solContainer        = ThreeDcontainer()
+            solContainer.id     = GetField(baseContainer, 'id',     CASTS[int])
+            solContainer.kindid = GetField(baseContainer, 'kindid', CASTS[int])
+            for baseLoadingspace in GetAll(baseContainer, 'loadingspaces'):
+                solContainer.addLoadingspace(self._fastLoadingspace_(baseLoadingspace))
+            threeDsolution.addContainer(solContainer)
+        for baseUnplaced in GetAll(layout, 'unplaced'):
+            threeDsolution.unplaced.append(self._fastUnplaced_(baseUnplaced))
+        return threeDsolution
+
 if __name__=="__main__":
     exit("Don't run this file")
\ No newline at end of file
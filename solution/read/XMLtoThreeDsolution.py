@@ -1,6 +1,11 @@
 
 from solution.read.BaseToThreeDsolution import BaseToThreeDsolution
+from solution.ThreeDcontainer    import ThreeDcontainer
+from solution.ThreeDpallet       import ThreeDpallet
+from solution.ThreeDbox          import ThreeDbox
+from solution.ThreeDloadingspace import ThreeDloadingspace
 import xml.etree.ElementTree as ET
+import io
 
 class XMLtoThreeDsolution(BaseToThreeDsolution):
     @staticmethod
@@ -39,17 +44,89 @@ class XMLtoThreeDsolution(BaseToThreeDsolution):
     @staticmethod
     def safeGetText(xml, tag, cast):
         try:
-            if xml.find(tag).text is None:
-                return None
-            return cast(xml.find(tag).text)
+            text = xml.find(tag).text
         except:
-            try:
-                return xml.find(tag).text
-            except:
-                return None
+            return None
+        if text is None:
+            return None
+        try:
+            return cast(text)
+        except:
+            return text
     
-    def __init__(self, filename="", text=""):
-        super(XMLtoThreeDsolution, self).__init__(filename, text)
+    # Reads the document with iterparse, the layout objects are built as soon as their elements are closed, after which
+    # these elements are removed from the tree. The returned root only keeps the description and the embedded instance.
+    def _streamRoot_(self, source):
+        self.streamed = {'container': list(), 'pallet': list(), 'box': list(), 'unplaced': list()}
+        layoutObjects = {('containers', 'container'): ThreeDcontainer, ('pallets', 'pallet'): ThreeDpallet, ('boxes', 'box'): ThreeDbox}
+        elements = list()
+        solObject, solLoadingspace = None, None
+        for event, element in ET.iterparse(source, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                elements.append(element)
+                if len(elements) == 4 and elements[1].tag == 'layout' and (elements[2].tag, tag) in layoutObjects:
+                    solObject        = layoutObjects[elements[2].tag, tag]()
+                    solObject.id     = self.safeGetAttr(element, 'id',     int)
+                    solObject.kindid = self.safeGetAttr(element, 'kindid', int)
+                elif tag == 'loadingspace' and solObject is not None:
+                    solLoadingspace    = ThreeDloadingspace()
+                    solLoadingspace.id = self.safeGetAttr(element, 'id', int)
+                    if isinstance(solObject, ThreeDcontainer):
+                        solObject.addLoadingspace(solLoadingspace)
+                    else:
+                        solObject.loadingspace = solLoadingspace
+                continue
+            elements.pop()
+            if tag == 'placement':
+                if solLoadingspace is not None and elements[-1].tag == 'placements':
+                    solLoadingspace.addPlacement(self._createPlacement_(element))
+                elif len(elements) == 3 and elements[2].tag == 'unplaced' and elements[1].tag == 'layout':
+                    self.streamed['unplaced'].append(self._createUnplaced_(element))
+                else:
+                    continue
+            elif solObject is not None and len(elements) == 3 and (elements[2].tag, tag) in layoutObjects:
+                self.streamed[tag].append(solObject)
+                solObject, solLoadingspace = None, None
+            elif tag == 'loadingspace' and solLoadingspace is not None:
+                solLoadingspace = None
+            else:
+                continue
+            # The parser may already have added later siblings, but the earlier ones were removed before
+            if elements[-1][0] is element:
+                del elements[-1][0]
+            else:
+                elements[-1].remove(element)
+        return element
+
+    def _fillContainers_(self, threeDsolution):
+        if self.streamed is None:
+            return super(XMLtoThreeDsolution, self)._fillContainers_(threeDsolution)
+        for solContainer in self.streamed['container']:
+            threeDsolution.addContainer(solContainer)
+
+    def _fillPallets_(self, threeDsolution):
+        if self.streamed is None:
+            return super(XMLtoThreeDsolution, self)._fillPallets_(threeDsolution)
+        for solPallet in self.streamed['pallet']:
+            threeDsolution.addPallet(solPallet)
+
+    def _fillBoxes_(self, threeDsolution):
+        if self.streamed is None:
+            return super(XMLtoThreeDsolution, self)._fillBoxes_(threeDsolution)
+        for solBox in self.streamed['box']:
+            threeDsolution.addBox(solBox)
+
+    def _fillUnplaced_(self, threeDsolution):
+        if self.streamed is None:
+            return super(XMLtoThreeDsolution, self)._fillUnplaced_(threeDsolution)
+        threeDsolution.unplaced.extend(self.streamed['unplaced'])
+
+    def __init__(self, filename="", text="", root=None):
+        self.streamed = None
+        if root is None and (filename or text):
+            root = self._streamRoot_(filename if filename else io.StringIO(text))
+        super(XMLtoThreeDsolution, self).__init__(filename, text, root)
         
 if __name__=="__main__":
     exit("Don't run this file")
\ No newline at end of file
@@ -1,14 +1,13 @@
 
-from solution.read.BaseToThreeDsolution import BaseToThreeDsolution
-import yaml
+from solution.read.JSONtoThreeDsolution import JSONtoThreeDsolution
+from common.YAMLEvents import LoadYAML
 
-class YAMLtoThreeDsolution(BaseToThreeDsolution):
+# YAML documents are loaded from the events of the parser into the same dicts and lists as JSON documents, which are then
+# read by the fast path of the JSON reader (see common.YAMLEvents and common.FastJSON)
+class YAMLtoThreeDsolution(JSONtoThreeDsolution):
     @staticmethod
     def safeFindRoot(filename="", text=""):
-        if filename:
-            return yaml.load(open(filename))
-        if text:
-            return yaml.load(text)
+        return LoadYAML(filename, text)
     
     @staticmethod
     def safeFindOne(yaml, tag):
@@ -42,8 +41,8 @@ class YAMLtoThreeDsolution(BaseToThreeDsolution):
     def safeGetText(yaml, tag, cast):
         return YAMLtoThreeDsolution.safeGetAttr(yaml, tag, cast)
     
-    def __init__(self, filename="", text=""):
-        super(YAMLtoThreeDsolution, self).__init__(filename, text)
+    def __init__(self, filename="", text="", root=None):
+        super(YAMLtoThreeDsolution, self).__init__(filename, text, root)
         
 if __name__=="__main__":
     exit("Don't run this file")
\ No newline at end of file
@@ -25,15 +25,6 @@ class ThreeDsolutionToBase(object):
     def __init__(self,solution):
         self.solution = solution
     
-    def _createFrame_(self):
-        self.base        = self.createBase()
-        self.description = self.newObject(self.base, "description")
-        self.layout      = self.newObject(self.base, "layout")
-        self.containers  = self.newObjectList(self.layout, "containers")
-        self.pallets     = self.newObjectList(self.layout, "pallets")
-        self.boxes       = self.newObjectList(self.layout, "boxes")
-        self.unplaced    = self.newObjectList(self.layout, "unplaced")
-
     def _fillInfo_(self):
         self.setText(self.description, "set",  self.solution.description.setname, str)
         self.setText(self.description, "name", self.solution.description.name,    str)
@@ -82,7 +73,7 @@ class ThreeDsolutionToBase(object):
     
     def _fillBoxes_(self):
         for solBox in self.solution.boxes:
-            baseBox = self.newObject(self.pallets, "pallet")
+            baseBox = self.newObject(self.boxes, "box")
             self.addAttrib(baseBox, "id", solBox.id, int)
             self.addAttrib(baseBox, "kindid", solBox.kindid, int)
             baseLoadingspace = self.newObject(baseBox, "loadingspace")
@@ -112,12 +103,19 @@ class ThreeDsolutionToBase(object):
             elif solPlacement.palletid is not None:
                 self.addAttrib(basePlacement, "palletid", solPlacement.palletid, int)
         
+    # The sections are created in document order, each right before it is filled, so that writers can stream the document
     def _createBase_(self):
-        self._createFrame_()
+        self.base        = self.createBase()
+        self.description = self.newObject(self.base, "description")
         self._fillInfo_()
+        self.layout      = self.newObject(self.base, "layout")
+        self.containers  = self.newObjectList(self.layout, "containers")
         self._fillContainers_()
+        self.pallets     = self.newObjectList(self.layout, "pallets")
         self._fillPallets_()
+        self.boxes       = self.newObjectList(self.layout, "boxes")
         self._fillBoxes_()
+        self.unplaced    = self.newObjectList(self.layout, "unplaced")
         self._fillUnplaced_()
         
 if __name__=="__main__":
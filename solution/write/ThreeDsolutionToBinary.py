@@ -0,0 +1,72 @@
+import json
+from common.BinaryFormat import MAGIC, VERSION, HEADER, RECORD, TYPES, RecordsOffset
+
+# Writes the binary solution format of common.BinaryFormat: the placements of the containers, pallets, and boxes become
+# fixed-width records, everything else goes into the JSON document in the header
+class ThreeDsolutionToBinary(object):
+    def __init__(self,solution):
+        self.solution = solution
+
+    def _string_(self, value):
+        if value is None:
+            return -1
+        if value not in self.stringIndex:
+            self.stringIndex[value] = len(self.strings)
+            self.strings.append(value)
+        return self.stringIndex[value]
+
+    def _record_(self, solPlacement):
+        if solPlacement.itemid is not None:
+            kind, refid = TYPES.index("item"), solPlacement.itemid
+        elif solPlacement.boxid is not None:
+            kind, refid = TYPES.index("box"), solPlacement.boxid
+        elif solPlacement.palletid is not None:
+            kind, refid = TYPES.index("pallet"), solPlacement.palletid
+        else:
+            raise Exception("Placement with id " + str(solPlacement.id) + " has no item, box, or pallet id")
+        if not isinstance(solPlacement.position, list) or len(solPlacement.position) != 3 or not all([isinstance(x, int) for x in solPlacement.position]):
+            raise Exception("Placement with id " + str(solPlacement.id) + " should have an integer position to be written in the binary format")
+        return RECORD.pack(int(solPlacement.id), int(refid), *solPlacement.position, self._string_(solPlacement.color), self._string_(solPlacement.orientation), kind)
+
+    # Appends the records of the placements of a loadingspace, and returns the loadingspace as it is stored in the document
+    def _loadingspace_(self, solLoadingspace):
+        first = len(self.records)
+        self.records.extend([self._record_(solPlacement) for solPlacement in solLoadingspace.placements])
+        return {"id": solLoadingspace.id, "placements": [first, len(self.records) - first]}
+
+    def _unplaced_(self, solPlacement):
+        unplaced = {"id": solPlacement.id}
+        if solPlacement.itemid is not None:
+            unplaced["itemid"]   = solPlacement.itemid
+            unplaced["quantity"] = solPlacement.quantity
+        elif solPlacement.boxid is not None:
+            unplaced["boxid"]    = solPlacement.boxid
+        elif solPlacement.palletid is not None:
+            unplaced["palletid"] = solPlacement.palletid
+        return unplaced
+
+    def _createBase_(self):
+        self.strings, self.stringIndex, self.records = list(), dict(), list()
+        self.base = {"description": {"set": self.solution.description.setname, "name": self.solution.description.name}}
+        self.base["containers"] = [{"id": solContainer.id, "kindid": solContainer.kindid,
+                                    "loadingspaces": [self._loadingspace_(solLoadingspace) for solLoadingspace in solContainer.loadingspaces]}
+                                   for solContainer in self.solution.containers]
+        self.base["pallets"]    = [{"id": solPallet.id, "kindid": solPallet.kindid, "loadingspace": self._loadingspace_(solPallet.loadingspace)}
+                                   for solPallet in self.solution.pallets]
+        self.base["boxes"]      = [{"id": solBox.id, "kindid": solBox.kindid, "loadingspace": self._loadingspace_(solBox.loadingspace)}
+                                   for solBox in self.solution.boxes]
+        self.base["unplaced"]   = [self._unplaced_(solPlacement) for solPlacement in self.solution.unplaced]
+        self.base["strings"]    = self.strings
+
+    def WriteSolution(self,filename):
+        self._createBase_()
+        document = json.dumps(self.base).encode("utf-8")
+        offset   = RecordsOffset(len(document))
+        with open(filename, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(document), len(self.records), offset))
+            f.write(document)
+            f.write(b"\0"*(offset - HEADER.size - len(document)))
+            f.write(b"".join(self.records))
+
+if __name__=="__main__":
+    exit("Don't run this file")
@@ -1,39 +1,32 @@
-import json
-from collections import OrderedDict
+from common.StreamEmitter import JSONEmitter
 from solution.write.ThreeDsolutionToBase import ThreeDsolutionToBase
 
+# The document is emitted while the solution is walked, see common.StreamEmitter
 class ThreeDsolutionToJSON(ThreeDsolutionToBase):
     @staticmethod
     def newObject(container, new_obj):
-        if isinstance(container, list):
-            obj = OrderedDict()
-            container.append(obj)
-            return obj
-        else:
-            container[new_obj] = OrderedDict()
-            return container[new_obj]
+        return container.Object(new_obj)
     
     @staticmethod
     def newObjectList(container, new_obj):
-        container[new_obj] = list()
-        return container[new_obj]
+        return container.List(new_obj)
     
     @staticmethod
     def addAttrib(container, attr, val, cast):
-        container[attr] = cast(val)
+        container.Value(attr, cast(val))
     
     @staticmethod
     def setText(container, tag, text, cast):
-        container[tag] = cast(text)
+        container.Value(tag, cast(text))
         
-    @staticmethod 
-    def createBase():
-        return OrderedDict()
+    def createBase(self):
+        return self.emitter.Root()
                 
     def WriteSolution(self,filename):
-        self._createBase_()
         with open(filename, 'w') as f:
-            json.dump(self.base, f)
+            self.emitter = JSONEmitter(f)
+            self._createBase_()
+            self.emitter.Close()
 
 
 if __name__=="__main__":
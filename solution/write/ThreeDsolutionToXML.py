@@ -1,49 +1,33 @@
 from solution.write.ThreeDsolutionToBase import ThreeDsolutionToBase
-import xml.etree.ElementTree as ET
+from common.XMLStream import XMLStream
 
+# The document is streamed to the file while the model is walked, see common.XMLStream
 class ThreeDsolutionToXML(ThreeDsolutionToBase):
-    @staticmethod
-    #http://effbot.org/zone/element-lib.htm#prettyprint
-    def indent(elem, level=0):
-        i = '\n' + level*'\t'
-        if len(elem):
-            if not elem.text or not elem.text.strip():
-                elem.text = i + '\t'
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-            for elem in elem:
-                ThreeDsolutionToXML.indent(elem, level+1)
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-        else:
-            if level and (not elem.tail or not elem.tail.strip()):
-                elem.tail = i
-                
     @staticmethod
     def newObject(container, new_obj):
-        return ET.SubElement(container, new_obj)
+        return container.SubElement(new_obj)
 
     @staticmethod
     def newObjectList(container, new_obj):
-        return ET.SubElement(container, new_obj)
+        return container.SubElement(new_obj)
     
     @staticmethod
     def addAttrib(container, attr, val, cast):
-        container.attrib.update({attr: str(val)})
+        container.Set(attr, str(val))
     
     @staticmethod
     def setText(container, tag, text, cast):
-        ET.SubElement(container, tag).text = str(text)
+        container.TextElement(tag, str(text))
 
-    @staticmethod 
-    def createBase():
-        return ET.Element("solution")
+    def createBase(self):
+        return self.stream.Root("solution")
                 
     def WriteSolution(self,filename):
-        self._createBase_()
-        self.indent(self.base)
-        lbXML = ET.ElementTree(self.base)
-        lbXML.write(filename)
+        self.stream = XMLStream(filename)
+        try:
+            self._createBase_()
+        finally:
+            self.stream.Close()
         
 if __name__=="__main__":
     exit("Don't run this file")
\ No newline at end of file
@@ -0,0 +1,77 @@
+import unittest
+from benchmark.Generator import BenchmarkGenerator
+
+# A decorated generated solution, with the weight aggregates of its containers cached
+def decoratedSolution(depth=0):
+    generator = BenchmarkGenerator(items=60, kinds=3, depth=depth, stack=3)
+    threeDsolution = generator.CreateThreeDsolution(generator.CreateThreeDinstance())
+    threeDsolution.DecorateSolution()
+    threeDsolution.containers[0].GetCOG()
+    return threeDsolution
+
+# The weight and first moments of a container, computed without any cached aggregates
+def uncachedAggregate(container):
+    weight, moment = 0, [0,0,0]
+    for loadingspace in container.loadingspaces:
+        for placement in loadingspace.placements:
+            p_weight = placement.weight
+            moment   = [m + p_weight*(x + l/2 + o) for m,x,l,o in zip(moment, placement.position, placement.boundingBox, loadingspace.position)]
+            weight  += p_weight
+    return weight, moment
+
+class TestAggregates(unittest.TestCase):
+    def test_position(self):
+        threeDsolution = decoratedSolution()
+        container = threeDsolution.containers[0]
+        placement = container.loadingspaces[0].placements[0]
+        placement.position = [placement.position[0] + 7, placement.position[1], placement.position[2]]
+        self.assertEqual(container.GetAggregate(), uncachedAggregate(container))
+
+    def test_weight(self):
+        threeDsolution = decoratedSolution()
+        container = threeDsolution.containers[0]
+        placement = container.loadingspaces[0].placements[0]
+        placement.weight = placement.weight + 5
+        self.assertEqual(container.GetTotalWeight(), uncachedAggregate(container)[0])
+        threeDsolution.AggregateContainers()
+        self.assertEqual(container.GetAggregate(), uncachedAggregate(container))
+
+    def test_bounding_box(self):
+        threeDsolution = decoratedSolution()
+        container = threeDsolution.containers[0]
+        placement = container.loadingspaces[0].placements[0]
+        placement.boundingBox = [length + 2 for length in placement.boundingBox]
+        self.assertEqual(container.GetAggregate(), uncachedAggregate(container))
+
+    def test_add_placement(self):
+        threeDsolution = decoratedSolution()
+        container = threeDsolution.containers[0]
+        loadingspace = container.loadingspaces[0]
+        placement = loadingspace.placements.pop()
+        threeDsolution.InvalidateAggregates()
+        self.assertEqual(container.GetAggregate(), uncachedAggregate(container))
+        loadingspace.addPlacement(placement)
+        self.assertEqual(container.GetAggregate(), uncachedAggregate(container))
+
+    # Boxes are loaded in the container, so the aggregates of the container depend on the placements in the boxes
+    def test_nested(self):
+        threeDsolution = decoratedSolution(depth=1)
+        container = threeDsolution.containers[0]
+        before = container.GetTotalWeight()
+        item = threeDsolution.boxes[0].loadingspace.placements[0]
+        item.weight = item.weight + 5
+        self.assertEqual(container.GetTotalWeight(), before + 5)
+
+    # Changing one solution leaves the cached aggregates of another one valid
+    def test_scope(self):
+        first, second = decoratedSolution(), decoratedSolution()
+        aggregate = second.containers[0].aggregate
+        placement = first.containers[0].loadingspaces[0].placements[0]
+        placement.position = list(placement.position)
+        self.assertIs(second.containers[0].aggregate, aggregate)
+        self.assertEqual(aggregate[0], second.aggregateScope.generation)
+
+TestCase = unittest.TestLoader().loadTestsFromTestCase(TestAggregates)
+
+if __name__=="__main__":
+    unittest.main()
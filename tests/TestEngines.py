@@ -0,0 +1,67 @@
+import re
+import unittest
+import itertools
+from benchmark.Generator import BenchmarkGenerator
+
+# A generated solution, decorated with the given engines
+def decoratedSolution(depth, invalid, backend, overlap):
+    generator = BenchmarkGenerator(items=300, kinds=4, depth=depth, stack=3, invalid=invalid, seed=depth)
+    threeDinstance = generator.CreateThreeDinstance()
+    threeDsolution = generator.CreateThreeDsolution(threeDinstance)
+    threeDsolution.DecorateSolution(backend, overlap)
+    return threeDinstance, threeDsolution
+
+# The validity of the overlap check, the reported pairs of overlapping placements, and the results of the constraints
+def checkedSolution(depth, invalid, backend, overlap):
+    threeDinstance, threeDsolution = decoratedSolution(depth, invalid, backend, overlap)
+    valid, report = threeDsolution.CheckOverlapInside()
+    pairs = set(tuple(sorted(map(int, pair))) for pair in re.findall(r"id (\d+) overlaps with placement with id (\d+)", report))
+    constraints = [(constraint.constraint.name, constraint.constraint.Validate(threeDsolution)) for constraint in threeDinstance.constraints]
+    return valid, pairs, constraints, report
+
+# Every pair of overlapping placements that share a loadingspace, by comparing all pairs
+def bruteForcePairs(depth, invalid):
+    threeDsolution = decoratedSolution(depth, invalid, "python", "ngoi")[1]
+    loadingspaces = [loadingspace for container in threeDsolution.containers for loadingspace in container.loadingspaces]
+    loadingspaces += [box.loadingspace for box in threeDsolution.boxes]
+    pairs = set()
+    for loadingspace in loadingspaces:
+        for a, b in itertools.combinations(loadingspace.placements, 2):
+            if all(pa < pb + lb and pb < pa + la for pa, la, pb, lb in zip(a.position, a.boundingBox, b.position, b.boundingBox)):
+                pairs.add(tuple(sorted([int(a.id), int(b.id)])))
+    return pairs
+
+class TestEngines(unittest.TestCase):
+    def assertEngines(self, depth, invalid):
+        ngoi  = checkedSolution(depth, invalid, "python", "ngoi")
+        sweep = checkedSolution(depth, invalid, "python", "sweep")
+        # The sweep reports every overlapping pair, the ngoi matrix reports at least one pair of every overlap
+        self.assertEqual(sweep[0], ngoi[0])
+        self.assertEqual(sweep[1], bruteForcePairs(depth, invalid))
+        self.assertTrue(ngoi[1] <= sweep[1])
+        self.assertEqual(sweep[2], ngoi[2])
+        try:
+            import numpy
+        except ImportError:
+            return
+        self.assertEqual(checkedSolution(depth, invalid, "numpy", "ngoi"), ngoi)
+        self.assertEqual(checkedSolution(depth, invalid, "numpy", "sweep"), sweep)
+
+    def test_valid(self):
+        self.assertEngines(0, 0.0)
+
+    def test_invalid(self):
+        self.assertEngines(0, 0.3)
+
+    def test_boxes(self):
+        self.assertEngines(1, 0.3)
+
+    def test_reports_overlap(self):
+        self.assertTrue(checkedSolution(0, 0.0, "python", "sweep")[0])
+        self.assertFalse(checkedSolution(0, 0.3, "python", "sweep")[0])
+        self.assertTrue(bruteForcePairs(0, 0.3))
+
+TestCase = unittest.TestLoader().loadTestsFromTestCase(TestEngines)
+
+if __name__=="__main__":
+    unittest.main()
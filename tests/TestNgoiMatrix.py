@@ -0,0 +1,132 @@
+import random
+import unittest
+import itertools
+from common.NgoiMatrix import NgoiMatrix
+from solution.ThreeDplacement import ThreeDplacement
+try:
+    from common.NumpyNgoiMatrix import NumpyNgoiMatrix
+except ImportError:
+    NumpyNgoiMatrix = None
+
+# Random stacks of cuboids in a 10x10x10 loadingspace, sorted by z, with integer or decimal coordinates
+def randomPlacements(rng, count, decimal):
+    coordinate = (lambda a, b: round(rng.uniform(a, b), 1)) if decimal else rng.randint
+    placements = list()
+    for i in range(count):
+        placement             = ThreeDplacement()
+        placement.id          = i
+        placement.itemid      = i
+        placement.position    = [coordinate(0, 8), coordinate(0, 8), coordinate(0, 4)]
+        placement.boundingBox = [coordinate(1, 4), coordinate(1, 4), coordinate(1, 3)]
+        placement.support     = 1.0
+        placement.correct     = True
+        placements.append(placement)
+    placements.sort(key=lambda placement: placement.position[2])
+    return placements
+
+# Random cuboids in a 10x10x6 loadingspace that do not overlap each other, standing on the floor or on the top of an
+# earlier cuboid, sorted by z. Some stick out of the top of the loadingspace, and most are only partially supported
+def stackedPlacements(rng, count):
+    placements = list()
+    for i in range(count*5):
+        placement             = ThreeDplacement()
+        placement.id          = i
+        placement.itemid      = i
+        placement.boundingBox = [rng.randint(1, 4), rng.randint(1, 4), rng.randint(1, 3)]
+        placement.position    = [rng.randint(0, 10 - placement.boundingBox[0]), rng.randint(0, 10 - placement.boundingBox[1]),
+                                 rng.choice([0] + [p.position[2] + p.boundingBox[2] for p in placements])]
+        placement.support     = rng.choice([0.5, 1.0])
+        placement.correct     = True
+        if not any(overlap(placement, other) for other in placements):
+            placements.append(placement)
+        if len(placements) == count:
+            break
+    placements.sort(key=lambda placement: placement.position[2])
+    return placements
+
+def reports(matrix, placements):
+    matrix.addCuboids(placements)
+    return matrix.outside_report, matrix.overlap_report, matrix.support_report, matrix.overlap_valid, matrix.support_valid
+
+def overlap(a, b):
+    return all(pa < pb + lb and pb < pa + la for pa, la, pb, lb in zip(a.position, a.boundingBox, b.position, b.boundingBox))
+
+def name(placement):
+    return placement.TypeString() + " with id " + str(placement.id)
+
+# The outside reports and the pairs of overlapping placements, by comparing every placement with every other one
+def bruteForceOverlap(placements, L, W, H):
+    outside = list()
+    for placement in placements:
+        inside = all(0 <= p and p + l <= size for p, l, size in zip(placement.position, placement.boundingBox, (L, W, H)))
+        outside.append(name(placement).capitalize() + (" lies inside its loadingspace" if inside else " lies outside its loadingspace <- VIOLATION"))
+    pairs = set(tuple(sorted([name(a), name(b)])) for a, b in itertools.combinations(placements, 2) if overlap(a, b))
+    return outside, pairs
+
+# The support reports of placements that do not overlap, by intersecting every placement with the ones ending at its bottom
+def bruteForceSupport(placements):
+    support = list()
+    for i, placement in enumerate(placements):
+        (x1, y1, z1), (l, w, h) = placement.position, placement.boundingBox
+        if z1 == 0:
+            supported_area = l*w
+        else:
+            supported_area = sum(max(0, min(x1 + l, x + bl) - max(x1, x))*max(0, min(y1 + w, y + bw) - max(y1, y))
+                                 for (x, y, z), (bl, bw, bh) in ((p.position, p.boundingBox) for p in placements[:i]) if z + bh == z1)
+        violation = " <- VIOLATION" if supported_area < placement.support*l*w else ""
+        support.append(name(placement).capitalize() + " is supported by " + str(supported_area/(l*w)) + " of required " + str(placement.support) + violation)
+    return support
+
+# The reports of the python NgoiMatrix compared with a brute force reference, which does not need numpy
+class TestNgoiMatrixBruteForce(unittest.TestCase):
+    # The matrix reports every overlap, with at least one of the pairs it is part of
+    def compareOverlap(self, decimal, trials=500):
+        for trial in range(trials):
+            rng = random.Random(trial)
+            placements = randomPlacements(rng, rng.randint(2, 12), decimal)
+            matrix = NgoiMatrix(10, 10, 10)
+            matrix.addCuboids(placements)
+            outside, pairs = bruteForceOverlap(placements, 10, 10, 10)
+            reported = set(tuple(sorted(names)) for names in matrix.overlaps)
+            self.assertEqual(matrix.outside_report, outside, "trial " + str(trial))
+            self.assertEqual(matrix.overlap_valid, not pairs, "trial " + str(trial))
+            self.assertTrue(reported <= pairs, "trial " + str(trial))
+            self.assertEqual(len(matrix.overlap_report), len(reported), "trial " + str(trial))
+            for a, b in pairs:
+                self.assertTrue(any(a in names or b in names for names in reported), "trial " + str(trial))
+
+    def test_overlap_integer_coordinates(self):
+        self.compareOverlap(False)
+
+    def test_overlap_decimal_coordinates(self):
+        self.compareOverlap(True)
+
+    def test_stacked(self):
+        for trial in range(300):
+            rng = random.Random(trial)
+            placements = stackedPlacements(rng, rng.randint(2, 20))
+            outside, pairs = bruteForceOverlap(placements, 10, 10, 6)
+            support = bruteForceSupport(placements)
+            self.assertEqual(reports(NgoiMatrix(10, 10, 6), placements), (outside, [], support, True, not any(report.endswith("VIOLATION") for report in support)), "trial " + str(trial))
+            self.assertEqual([p.correct for p in placements], [not (o.endswith("VIOLATION") or s.endswith("VIOLATION")) for o, s in zip(outside, support)], "trial " + str(trial))
+
+@unittest.skipIf(NumpyNgoiMatrix is None, "numpy is not installed")
+class TestNgoiMatrix(unittest.TestCase):
+    def compareBackends(self, decimal, trials=500):
+        for trial in range(trials):
+            rng = random.Random(trial)
+            placements = randomPlacements(rng, rng.randint(2, 12), decimal)
+            self.assertEqual(reports(NgoiMatrix(10, 10, 10), placements), reports(NumpyNgoiMatrix(10, 10, 10), placements), "trial " + str(trial))
+
+    def test_integer_coordinates(self):
+        self.compareBackends(False)
+
+    # The support areas should be summed exactly as by the python engine, or the support ratios round differently
+    def test_decimal_coordinates(self):
+        self.compareBackends(True)
+
+TestCase = unittest.TestSuite([unittest.TestLoader().loadTestsFromTestCase(TestNgoiMatrixBruteForce),
+                               unittest.TestLoader().loadTestsFromTestCase(TestNgoiMatrix)])
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import random
+import unittest
+from common.OverlapSweep import OverlapSweep
+from solution.ThreeDplacement import ThreeDplacement
+
+def cuboid(i, position, boundingBox):
+    placement             = ThreeDplacement()
+    placement.id          = i
+    placement.itemid      = i
+    placement.position    = position
+    placement.boundingBox = boundingBox
+    placement.correct     = True
+    return placement
+
+# All overlapping pairs by comparing every pair of cuboids, as (earlier id, later id)
+def bruteForce(placements):
+    pairs = set()
+    for i, a in enumerate(placements):
+        for b in placements[i+1:]:
+            if all([a.position[d] < b.position[d] + b.boundingBox[d] and b.position[d] < a.position[d] + a.boundingBox[d] and
+                    a.boundingBox[d] > 0 and b.boundingBox[d] > 0 for d in range(3)]):
+                pairs.add(tuple(sorted([a.id, b.id])))
+    return pairs
+
+def sweepPairs(placements):
+    return set([tuple(sorted([a.id, b.id])) for a, b in OverlapSweep(placements).overlaps])
+
+class TestOverlapSweep(unittest.TestCase):
+    def test_random(self):
+        for trial in range(300):
+            rng = random.Random(trial)
+            placements = [cuboid(i, [rng.randint(0, 10) for _ in range(3)], [rng.randint(0, 5) for _ in range(3)]) for i in range(rng.randint(1, 40))]
+            self.assertEqual(sweepPairs(placements), bruteForce(placements), "trial " + str(trial))
+
+    # Cuboids with the same x-extent that are disjoint in y make the sweep switch to a RectangleTree
+    def test_shared_x(self):
+        rng = random.Random(0)
+        placements = [cuboid(i, [0, 2*i, 0], [10, 1, 10]) for i in range(200)]
+        placements += [cuboid(200 + i, [rng.randint(0, 9), rng.randint(0, 400), rng.randint(0, 9)], [1, 3, 1]) for i in range(100)]
+        rng.shuffle(placements)
+        self.assertEqual(sweepPairs(placements), bruteForce(placements))
+
+TestCase = unittest.TestLoader().loadTestsFromTestCase(TestOverlapSweep)
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import unittest
+from operator import eq
+from benchmark.Generator import BenchmarkGenerator
+from solution.ThreeDsolution import ThreeDsolution
+from solution.ThreeDplacement import ThreeDplacement
+
+# A decorated generated solution, and a validation session on it
+def session(depth, seed):
+    generator = BenchmarkGenerator(items=60, kinds=3, depth=depth, stack=3, seed=seed)
+    threeDinstance = generator.CreateThreeDinstance()
+    threeDsolution = generator.CreateThreeDsolution(threeDinstance)
+    threeDsolution.DecorateSolution()
+    return threeDsolution, threeDsolution.CreateValidationSession()
+
+# The loadingspaces of the containers and boxes of a solution, with the placements in them
+def loadingspaces(threeDsolution):
+    return [loadingspace for container in threeDsolution.containers for loadingspace in container.loadingspaces] +\
+           [box.loadingspace for box in threeDsolution.boxes]
+
+def itemPlacement(placementid, itemid, position, orientation="LWH"):
+    placement = ThreeDplacement()
+    placement.id          = placementid
+    placement.itemid      = itemid
+    placement.position    = position
+    placement.orientation = orientation
+    return placement
+
+# Applies one random operation to the session: adding an item, removing or moving a placement (items may be rotated),
+# or adding an unplaced item, in the loadingspaces of the container and of the boxes alike. Returns the name of the
+# operation, and a function that undoes an add or a move
+def randomOperation(rng, threeDsolution, validationSession, placementid):
+    operation = rng.choice(["add", "remove", "move", "move", "move", "unplaced"])
+    itemids   = [itemkind.id for itemkind in threeDsolution.threeDinstance.itemkinds]
+    placed    = [placement for loadingspace in loadingspaces(threeDsolution) for placement in loadingspace.placements]
+    if operation == "add" or not placed:
+        loadingspace = rng.choice(loadingspaces(threeDsolution))
+        L, W, H = loadingspace.boundingBox
+        position = [rng.randint(0, L), rng.randint(0, W), rng.choice([0, rng.randint(0, H)])]
+        placement = itemPlacement(placementid, rng.choice(itemids), position)
+        validationSession.Add(placement, loadingspace)
+        return "add", lambda: validationSession.Remove(placement)
+    elif operation == "remove":
+        validationSession.Remove(rng.choice(placed))
+    elif operation == "move":
+        placement = rng.choice(placed)
+        x, y, z = placement.position
+        previous  = list(placement.position), placement.orientation
+        position = [x + rng.choice([0, rng.randint(-20, 20)]), y + rng.choice([0, rng.randint(-20, 20)]),
+                    max(0, z + rng.choice([0, 1, -1, placement.boundingBox[2], -placement.boundingBox[2]]))]
+        orientation = rng.choice([None, "LWH", "WLH", "HWL"]) if placement.itemid is not None else None
+        validationSession.Move(placement, position, orientation)
+        return "move", lambda: validationSession.Move(placement, *previous)
+    else:
+        unplaced = itemPlacement(placementid, rng.choice(itemids), ThreeDplacement.UNPLACED, ThreeDplacement.UNPLACED)
+        unplaced.quantity = rng.randint(1, 2)
+        validationSession.AddUnplaced(unplaced)
+    return operation, None
+
+# The validity of the item counts and constraints, and the objective values, of the session
+def sessionResults(validationSession):
+    constraints = {constraint["name"]: constraint["valid"] for constraint in validationSession.ValidateConstraints()}
+    objectives  = [objective["value"] for objective in validationSession.EvaluateObjectives()["individual"]]
+    return validationSession.CheckCounts()[0], constraints, objectives
+
+# The same results, from a full decoration and validation of the solution
+def fullResults(threeDsolution):
+    threeDsolution.DecorateSolution()
+    items  = threeDsolution.ClassifyPlacements()[1] # the unplaced items included
+    counts = ThreeDsolution.CountOccurrences(threeDsolution.threeDinstance.itemkinds, items, "itemid", "item", eq)[0]
+    constraints = {constraint["name"]: constraint["valid"] for constraint in threeDsolution.ValidateConstraints()}
+    objectives  = [objective["value"] for objective in threeDsolution.EvaluateObjectives()["individual"]]
+    return counts, constraints, objectives
+
+class TestValidationSession(unittest.TestCase):
+    # The support found by the session equals the one of the NgoiMatrix as long as no placements overlap
+    def assertSameResults(self, threeDsolution, validationSession, message):
+        counts, constraints, objectives = sessionResults(validationSession)
+        full_counts, full_constraints, full_objectives = fullResults(threeDsolution)
+        if not full_constraints["overlap"]:
+            constraints.pop("support")
+            full_constraints.pop("support")
+        self.assertEqual(counts, full_counts, message)
+        self.assertEqual(constraints, full_constraints, message)
+        self.assertEqual(len(objectives), len(full_objectives), message)
+        for value, full_value in zip(objectives, full_objectives):
+            self.assertAlmostEqual(value, full_value, 6, message)
+
+    # Operations that make placements overlap or stick out are undone after the comparison, so that the support is compared
+    # in most steps
+    def compareOperations(self, depth, trials=20, steps=40):
+        for trial in range(trials):
+            rng = random.Random(trial)
+            threeDsolution, validationSession = session(depth, trial)
+            self.assertSameResults(threeDsolution, validationSession, "trial " + str(trial))
+            for step in range(steps):
+                message = "trial " + str(trial) + ", step " + str(step) + ": "
+                operation, undo = randomOperation(rng, threeDsolution, validationSession, 1000 + step)
+                self.assertSameResults(threeDsolution, validationSession, message + operation)
+                if undo is not None and (validationSession.overlaps or validationSession.outside):
+                    undo()
+                    self.assertSameResults(threeDsolution, validationSession, message + "undo " + operation)
+
+    def test_items(self):
+        self.compareOperations(0)
+
+    def test_boxes(self):
+        self.compareOperations(1)
+
+    # An item raised inside its box is not a support violation, as the support constraint does not cover boxes
+    def test_raised_in_box(self):
+        for seed in range(20):
+            threeDsolution, validationSession = session(1, seed)
+            placement = random.Random(seed).choice(threeDsolution.boxes).loadingspace.placements[0]
+            validationSession.Move(placement, [placement.position[0], placement.position[1], placement.position[2] + 1])
+            self.assertTrue(sessionResults(validationSession)[1]["support"], "seed " + str(seed))
+            self.assertSameResults(threeDsolution, validationSession, "seed " + str(seed))
+
+TestCase = unittest.TestLoader().loadTestsFromTestCase(TestValidationSession)
+
+if __name__=="__main__":
+    unittest.main()